@@ -6,6 +6,8 @@ from datetime import datetime
 from bs4 import BeautifulSoup
 from playwright.async_api import async_playwright
 import aiohttp
+from crawler_engine.resource_cache import ResourceStatusCache
+from crawler_engine.render_profile import LoadWatcher, profile_for
 
 class AdvancedCrawler:
     def __init__(self, base_url):
@@ -24,6 +26,10 @@ class AdvancedCrawler:
             {"name": "Tablet", "viewport": {"width": 768, "height": 1024}},
             {"name": "Desktop", "viewport": {"width": 1366, "height": 768}}
         ]
+        self.image_cache = ResourceStatusCache()
+        # Responsiveness checks need stylesheets and images, the JS error column live scripts;
+        # fonts and media are stubbed
+        self.render_profile = profile_for(layout=True, scripts=True)
 
     def _init_csv(self):
         if not os.path.exists(self.csv_file):
@@ -46,15 +52,18 @@ class AdvancedCrawler:
         await self.playwright.stop()
         await self.session.close()
 
+    async def _head_image(self, url):
+        async with self.session.head(url) as response:
+            if response.status >= 400:
+                return 'Broken', response.status
+            content_type = response.headers.get('Content-Type', '')
+            if 'avif' not in content_type:
+                return 'Invalid format', content_type
+            return None, None
+
     async def check_image(self, url):
         try:
-            async with self.session.head(url) as response:
-                if response.status >= 400:
-                    return 'Broken', response.status
-                content_type = response.headers.get('Content-Type', '')
-                if 'avif' not in content_type:
-                    return 'Invalid format', content_type
-                return None, None
+            return tuple(await self.image_cache.get(url, self._head_image))
         except Exception as e:
             return 'Error', str(e)
 
@@ -104,6 +113,7 @@ class AdvancedCrawler:
 
             try:
                 page = await context.new_page()
+                watcher = LoadWatcher(page)
                 js_errors = []
                 mixed_content = []
                 responsiveness_issues = []
@@ -116,8 +126,8 @@ class AdvancedCrawler:
                 response = await page.goto(url, timeout=60000)
                 entry['status code'] = response.status if response else 'N/A'
 
-                # Wait for network idle
-                await page.wait_for_load_state('networkidle')
+                # Wait for network and DOM to settle (bounded, unlike networkidle)
+                await watcher.settled(timeout=15)
 
                 # Collect data
                 content = await page.content()
@@ -201,6 +211,7 @@ class AdvancedCrawler:
     async def start_crawl(self):
         await self.setup()
         context = await self.browser.new_context(ignore_https_errors=True)
+        await self.render_profile.apply(context)
         self.queue.append(self.base_url)
         self.visited.add(self.base_url)
 
@@ -1,18 +1,32 @@
+import argparse
 import asyncio
 import csv
+import hashlib
 import os
+import time
 from urllib.parse import urljoin, urlparse
 from datetime import datetime
 from bs4 import BeautifulSoup
 from playwright.async_api import async_playwright, Browser, Error as PlaywrightError
+from url_canonicalizer import UrlCanonicalizer, TrapDetector
+from crawler_engine.render_profile import LoadWatcher, PROFILES, profile_for
+from crawler_engine import perf_capture
 
 class WebCrawler:
-    def __init__(self, base_url: str, output_file: str = "crawl_report_Adv.csv"):
+    def __init__(self, base_url: str, output_file: str = "crawl_report_Adv.csv", perf: bool = False,
+                 har_dir: str = "har", har_threshold_ms: int = 5000):
+        self.perf = perf  # Performance audit columns (and HARs of slow pages) from the same page load
+        self.har_dir = har_dir
+        self.har_threshold_ms = har_threshold_ms
+        self.canonicalizer = UrlCanonicalizer()
+        self.trap_detector = TrapDetector()
         self.base_url = self._normalize_url(base_url)
         self.visited = set()  # Track visited URLs
         self.queue = []  # URL queue
         self.output_file = output_file
         self.results = []  # Store results before batch writing
+        # Performance audits measure the real page; otherwise stub fonts and media
+        self.render_profile = PROFILES['full']() if perf else profile_for(layout=True, scripts=True)
         self._init_csv()
         
         # Device configurations for responsive testing
@@ -24,8 +38,12 @@ class WebCrawler:
 
     def _normalize_url(self, url: str) -> str:
         """Normalize URL to prevent duplicates"""
-        parsed = urlparse(url)
-        return f"{parsed.scheme}://{parsed.netloc.lower()}"
+        return self.canonicalizer.canonicalize(url)
+
+    def _is_internal(self, url: str) -> bool:
+        """Same host as the start URL and not a crawler trap"""
+        return (urlparse(url).netloc == urlparse(self.base_url).netloc
+                and not self.trap_detector.is_trap(url))
 
     def _init_csv(self):
         """Initialize CSV file with headers"""
@@ -39,12 +57,12 @@ class WebCrawler:
                     'Has CTA', 'H1 Count', 'H2 Count', 'H3 Count',
                     'Mobile Issues', 'Tablet Issues', 'Desktop Issues',
                     'Crawl Date', 'Crawl Time'
-                ])
+                ] + (['Page Time (ms)', 'HAR File'] + perf_capture.PERF_COLUMNS if self.perf else []))
 
     async def _check_image(self, page, img_url: str) -> bool:
         """Check if image is broken"""
         try:
-            response = await page.goto(img_url, wait_until='networkidle', timeout=5000)
+            response = await page.goto(img_url, wait_until='commit', timeout=5000)
             return response.status >= 400
         except PlaywrightError:
             return True
@@ -103,8 +121,19 @@ class WebCrawler:
 
     async def _process_url(self, browser: Browser, url: str) -> tuple[dict, list]:
         """Process a single URL and return its data and found links"""
-        context = await browser.new_context()
+        har_path = None
+        if self.perf:
+            # HARs are written when the context closes; only slow pages keep theirs
+            os.makedirs(self.har_dir, exist_ok=True)
+            slug = hashlib.sha1(url.encode('utf-8')).hexdigest()[:12]
+            har_path = os.path.join(self.har_dir, f"{urlparse(url).netloc}_{slug}.har")
+            context = await browser.new_context(record_har_path=har_path, record_har_content='omit')
+            await perf_capture.install(context)
+        else:
+            context = await browser.new_context()
+        await self.render_profile.apply(context)
         page = await context.new_page()
+        watcher = LoadWatcher(page)
         
         result = {
             'URL': url,
@@ -127,8 +156,12 @@ class WebCrawler:
             'Crawl Date': datetime.now().strftime('%Y-%m-%d'),
             'Crawl Time': datetime.now().strftime('%H:%M:%S')
         }
+        if self.perf:
+            result.update({'Page Time (ms)': None, 'HAR File': ''})
+            result.update(perf_capture.empty_row())
         
         new_urls = []
+        keep_har = False
         
         try:
             # Collect JS errors
@@ -136,14 +169,20 @@ class WebCrawler:
             page.on('pageerror', lambda err: js_errors.append(err.message))
             
             # Load page with timeout
+            started = time.perf_counter()
             response = await page.goto(url, wait_until='domcontentloaded', timeout=30000)
             result['Status Code'] = response.status if response else 500
             
-            # Wait for network idle with shorter timeout
-            try:
-                await page.wait_for_load_state('networkidle', timeout=10000)
-            except PlaywrightError:
+            # Wait for network and DOM to settle
+            if not await watcher.settled(timeout=10):
                 result['Load Time Issues'] = 'Slow loading'
+
+            # Performance capture - before image checks navigate away and viewports change
+            if self.perf:
+                page_time = round((time.perf_counter() - started) * 1000)
+                result['Page Time (ms)'] = page_time
+                result.update(await perf_capture.collect(page))
+                keep_har = page_time >= self.har_threshold_ms
             
             # Get page content
             content = await page.content()
@@ -194,13 +233,24 @@ class WebCrawler:
                     .filter(href => href && !href.startsWith('#') && !href.includes('mailto:'));
             }''')
             
-            new_urls = [link for link in links if self._normalize_url(link) == self.base_url]
+            # A duplicate page's canonical URL gets crawled (and reported) in its own right
+            canonical_url = self.canonicalizer.canonical_from_soup(soup, url)
+            if canonical_url and canonical_url != url:
+                links.append(canonical_url)
+
+            new_urls = [link for link in map(self._normalize_url, links) if self._is_internal(link)]
             
         except Exception as e:
             print(f"Error processing {url}: {str(e)}")
             result['Load Time Issues'] = 'Failed to load'
+            keep_har = self.perf
         finally:
             await context.close()
+            if har_path and os.path.exists(har_path):
+                if keep_har:
+                    result['HAR File'] = har_path
+                else:
+                    os.remove(har_path)
         
         return result, list(set(new_urls))
 
@@ -255,14 +305,20 @@ class WebCrawler:
 
 def main():
     """Entry point for the crawler"""
-    if len(sys.argv) != 2:
-        print("Usage: python crawler.py <base_url>")
-        sys.exit(1)
-    
-    base_url = sys.argv[1]
-    crawler = WebCrawler(base_url)
+    parser = argparse.ArgumentParser(description='Rendered site crawler')
+    parser.add_argument('base_url')
+    parser.add_argument('--output', help='CSV report (default: crawl_report_Adv.csv, crawl_report_Adv_perf.csv with --perf)')
+    parser.add_argument('--perf', action='store_true',
+                        help='Add Navigation Timing / LCP / CLS / long task / resource columns')
+    parser.add_argument('--har-threshold-ms', type=int, default=5000,
+                        help='With --perf, keep a HAR for pages slower than this')
+    parser.add_argument('--har-dir', default='har')
+    args = parser.parse_args()
+
+    output = args.output or ("crawl_report_Adv_perf.csv" if args.perf else "crawl_report_Adv.csv")
+    crawler = WebCrawler(args.base_url, output_file=output, perf=args.perf,
+                         har_dir=args.har_dir, har_threshold_ms=args.har_threshold_ms)
     asyncio.run(crawler.crawl())
 
 if __name__ == "__main__":
-    import sys
     main()
@@ -25,10 +25,15 @@ import time
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
 import re
-import sys
+import argparse
 import logging
 import psutil
 from typing import Set, List, Dict, Tuple
+from url_canonicalizer import UrlCanonicalizer, TrapDetector
+from robots import RobotsCache
+from memory_governor import MemoryGovernor, CompactUrlSet
+from crawl_metrics import CrawlMetrics
+from crawl_profiler import profiling, profile_path_for
 
 # Configure logging
 logging.basicConfig(
@@ -38,11 +43,18 @@ logging.basicConfig(
 )
 
 class WebCrawler:
-    def __init__(self, base_url: str, timeout_minutes: int = 60, batch_size: int = 100, max_concurrent: int = 30):
+    def __init__(self, base_url: str, timeout_minutes: int = 60, batch_size: int = 100, max_concurrent: int = 30,
+                 memory_budget_mb: float = None, metrics_json: str = None, metrics_port: int = None):
+        self.canonicalizer = UrlCanonicalizer()
+        self.trap_detector = TrapDetector()
+        self.robots = RobotsCache()
         self.base_url = self._normalize_url(base_url)
-        self.visited: Set[str] = set()
+        self.governor = MemoryGovernor(memory_budget_mb)
+        # Memory-bounded mode keeps 64-bit hashes instead of URL strings
+        self.visited: Set[str] = CompactUrlSet() if self.governor.enabled else set()
         self.queue: List[str] = []
-        self.all_urls: Set[str] = set()  # Track all unique URLs found
+        self._enqueued_at: Dict[str, float] = {}  # For queue wait time
+        self.all_urls: Set[str] = CompactUrlSet() if self.governor.enabled else set()  # Track all unique URLs found
         self.results: List[Dict] = []
         self.csv_file = "Crawl_Report_Alpha.csv"
         self.start_time = None
@@ -54,15 +66,15 @@ class WebCrawler:
         self.last_progress_time = time.time()
         self.last_processed_count = 0
         self.process = psutil.Process()
+        self.metrics = CrawlMetrics()
+        self.metrics_json = metrics_json
+        self.metrics_port = metrics_port
         self._init_csv()
         logging.info(f"Initialized crawler for {self.base_url}")
 
     def _normalize_url(self, url: str) -> str:
         """Normalize URL to prevent duplicates"""
-        parsed = urlparse(url)
-        # Remove query parameters and fragments
-        clean_path = re.sub(r'/+', '/', parsed.path.rstrip('/'))
-        return f"{parsed.scheme}://{parsed.netloc.lower()}{clean_path}"
+        return self.canonicalizer.canonicalize(url)
 
     def _should_crawl_url(self, url: str) -> bool:
         """More aggressive URL filtering"""
@@ -79,6 +91,14 @@ class WebCrawler:
         if parsed.query or parsed.fragment:
             return False
 
+        # Skip calendar/pagination traps and repetitive paths
+        if self.trap_detector.is_trap(url):
+            return False
+
+        # Respect robots.txt Disallow rules (prefetched per host in crawl)
+        if not self.robots.allowed(url):
+            return False
+
         # Skip potential duplicate content
         if any(pattern in parsed.path.lower() for pattern in [
             '/page/', '/tag/', '/category/', '/author/',
@@ -126,7 +146,7 @@ class WebCrawler:
 
         if time_diff >= 1:  # Update stats every second
             process_rate = processed_diff / time_diff
-            total_remaining = len(self.queue)
+            total_remaining = len(self.queue) + self.governor.spilled
             eta_seconds = total_remaining / process_rate if process_rate > 0 else 0
             memory_usage = self._get_memory_usage()
 
@@ -134,7 +154,7 @@ class WebCrawler:
             urls_per_minute = len(self.visited) / elapsed_minutes if elapsed_minutes > 0 else 0
 
             logging.info(
-                f"Progress: {len(self.visited):,} processed, {len(self.queue):,} queued | "
+                f"Progress: {len(self.visited):,} processed, {total_remaining:,} queued | "
                 f"Rate: {process_rate:.1f} URLs/s ({urls_per_minute:.1f} URLs/min) | "
                 f"Memory: {memory_usage} | "
                 f"ETA: {eta_seconds/60:.1f} minutes"
@@ -143,6 +163,58 @@ class WebCrawler:
             self.last_progress_time = current_time
             self.last_processed_count = len(self.visited)
 
+    def _analyze_seo(self, soup: BeautifulSoup, result: Dict):
+        """Title, meta description/keywords and heading checks"""
+        seo_issues = []
+        title = soup.find('title')
+        if not title or not title.text.strip():
+            seo_issues.append("Missing title")
+
+        meta_desc = soup.find('meta', attrs={'name': 'description'})
+        meta_desc_content = meta_desc.get('content', '').strip() if meta_desc else ''
+        if not meta_desc_content:
+            seo_issues.append("Missing meta description")
+        result['Meta Description'] = meta_desc_content[:200] if meta_desc_content else ''
+
+        meta_keywords = soup.find('meta', attrs={'name': 'keywords'})
+        meta_keywords_content = meta_keywords.get('content', '').strip() if meta_keywords else ''
+        if not meta_keywords_content:
+            seo_issues.append("Missing meta keywords")
+        result['Meta Keywords'] = meta_keywords_content[:200] if meta_keywords_content else ''
+
+        # Heading counts
+        result['H1 Count'] = len(soup.find_all('h1'))
+        result['H2 Count'] = len(soup.find_all('h2'))
+        result['H3 Count'] = len(soup.find_all('h3'))
+        if result['H1 Count'] == 0:
+            seo_issues.append("Missing H1")
+        elif result['H1 Count'] > 1:
+            seo_issues.append("Multiple H1 tags")
+
+        result['SEO Issues'] = '; '.join(seo_issues) if seo_issues else 'No SEO issues'
+
+    def _analyze_cta(self, soup: BeautifulSoup, result: Dict):
+        """Look for a call-to-action link or button"""
+        cta_patterns = ['sign up', 'get started', 'learn more', 'contact us', 'buy now']
+        for link in soup.find_all(['a', 'button']):
+            text = link.text.lower()
+            classes = ' '.join(link.get('class', [])).lower()
+            if any(pattern in text for pattern in cta_patterns) or 'cta' in classes:
+                result['CTA Available'] = 'Yes'
+                break
+
+    def _analyze_responsiveness(self, soup: BeautifulSoup, result: Dict):
+        """Static viewport/media query/responsive class checks"""
+        viewport = soup.find('meta', attrs={'name': 'viewport'})
+        responsive_classes = bool(re.search(r'class=["\'](.*?)(mobile|tablet|desktop|sm\-|md\-|lg\-)', str(soup)))
+        media_queries = bool(soup.find_all('style', string=re.compile('@media')))
+
+        result.update({
+            'Mobile Responsive': 'Responsive' if viewport else 'Not responsive',
+            'Tablet Responsive': 'Responsive' if media_queries else 'Not responsive',
+            'Desktop Responsive': 'Responsive' if responsive_classes else 'Not responsive'
+        })
+
     async def process_url(self, session: aiohttp.ClientSession, url: str) -> Tuple[Dict, List[str]]:
         """Process a single URL and return its data and found links"""
         async with self.rate_limiter:  # Rate limit requests
@@ -173,6 +245,8 @@ class WebCrawler:
             self.total_requests += 1
 
             try:
+                await self.robots.fetch(session, url)  # Refetched once the rules expire
+                await self.robots.wait(url)  # Crawl-delay
                 timeout = aiohttp.ClientTimeout(total=30)
                 async with session.get(url, timeout=timeout, allow_redirects=True) as response:
                     result['Status Code'] = response.status
@@ -183,55 +257,37 @@ class WebCrawler:
                         return result, []
 
                     try:
-                        html = await response.text()
+                        with self.metrics.stage('download'):
+                            html = await response.text()
                     except UnicodeDecodeError:
                         logging.warning(f"Unicode decode error for {url}")
                         return result, []
 
-                    soup = BeautifulSoup(html, 'html.parser')
+                    with self.metrics.stage('parse'):
+                        soup = BeautifulSoup(html, 'html.parser')
+                    analysis_start = time.perf_counter()
+
+                    # A page declaring another canonical URL is a duplicate; make sure the canonical one is crawled
+                    canonical_url = self.canonicalizer.canonical_from_soup(soup, url)
+                    if (canonical_url and canonical_url != url and canonical_url.startswith(self.base_url)
+                            and canonical_url not in self.all_urls and self._should_crawl_url(canonical_url)):
+                        new_urls.append(canonical_url)
+                        self.all_urls.add(canonical_url)
 
                     # Extract and normalize links first (most important)
                     for link in soup.find_all('a', href=True):
                         href = link['href']
                         try:
-                            full_url = urljoin(url, href)
-                            normalized_url = self._normalize_url(full_url)
+                            normalized_url = self.canonicalizer.canonicalize(href, base=url)
                             if (normalized_url.startswith(self.base_url) and
-                                self._should_crawl_url(full_url) and
-                                normalized_url not in self.all_urls):
+                                normalized_url not in self.all_urls and
+                                self._should_crawl_url(normalized_url)):
                                 new_urls.append(normalized_url)
                                 self.all_urls.add(normalized_url)
                         except Exception as e:
                             logging.warning(f"Error processing link {href}: {str(e)}")
 
-                    # SEO Analysis
-                    seo_issues = []
-                    title = soup.find('title')
-                    if not title or not title.text.strip():
-                        seo_issues.append("Missing title")
-
-                    meta_desc = soup.find('meta', attrs={'name': 'description'})
-                    meta_desc_content = meta_desc.get('content', '').strip() if meta_desc else ''
-                    if not meta_desc_content:
-                        seo_issues.append("Missing meta description")
-                    result['Meta Description'] = meta_desc_content[:200] if meta_desc_content else ''
-
-                    meta_keywords = soup.find('meta', attrs={'name': 'keywords'})
-                    meta_keywords_content = meta_keywords.get('content', '').strip() if meta_keywords else ''
-                    if not meta_keywords_content:
-                        seo_issues.append("Missing meta keywords")
-                    result['Meta Keywords'] = meta_keywords_content[:200] if meta_keywords_content else ''
-
-                    # Heading counts
-                    result['H1 Count'] = len(soup.find_all('h1'))
-                    result['H2 Count'] = len(soup.find_all('h2'))
-                    result['H3 Count'] = len(soup.find_all('h3'))
-                    if result['H1 Count'] == 0:
-                        seo_issues.append("Missing H1")
-                    elif result['H1 Count'] > 1:
-                        seo_issues.append("Multiple H1 tags")
-
-                    result['SEO Issues'] = '; '.join(seo_issues) if seo_issues else 'No SEO issues'
+                    self._analyze_seo(soup, result)
 
                     # Image Analysis
                     images = soup.find_all('img')
@@ -240,46 +296,39 @@ class WebCrawler:
                     # Check first 5 images only
                     img_urls = [urljoin(url, img.get('src', '')) for img in images[:5] if img.get('src')]
                     broken_count = 0
+                    image_start = time.perf_counter()
                     for img_url in img_urls:
                         if await self._check_image(session, img_url):
                             broken_count += 1
+                    image_time = time.perf_counter() - image_start
+                    self.metrics.record('image_check', image_time)
                     result['Broken Images'] = broken_count
 
-                    # CTA Analysis
-                    cta_patterns = ['sign up', 'get started', 'learn more', 'contact us', 'buy now']
-                    for link in soup.find_all(['a', 'button']):
-                        text = link.text.lower()
-                        classes = ' '.join(link.get('class', [])).lower()
-                        if any(pattern in text for pattern in cta_patterns) or 'cta' in classes:
-                            result['CTA Available'] = 'Yes'
-                            break
-
-                    # Responsive Analysis
-                    viewport = soup.find('meta', attrs={'name': 'viewport'})
-                    responsive_classes = bool(re.search(r'class=["\'](.*?)(mobile|tablet|desktop|sm\-|md\-|lg\-)', str(soup)))
-                    media_queries = bool(soup.find_all('style', string=re.compile('@media')))
-
-                    result.update({
-                        'Mobile Responsive': 'Responsive' if viewport else 'Not responsive',
-                        'Tablet Responsive': 'Responsive' if media_queries else 'Not responsive',
-                        'Desktop Responsive': 'Responsive' if responsive_classes else 'Not responsive'
-                    })
+                    self._analyze_cta(soup, result)
+                    self._analyze_responsiveness(soup, result)
+                    self.metrics.record('analysis', time.perf_counter() - analysis_start - image_time)
+
+                    # Break the tree's reference cycles now instead of waiting for the cyclic GC
+                    soup.decompose()
 
             except asyncio.TimeoutError:
                 result['Load Time Issues'] = 'Timeout'
                 self.failed_requests += 1
+                self.metrics.increment('failures')
                 logging.error(f"Timeout error for {url}")
             except Exception as e:
                 result['Load Time Issues'] = f'Error: {str(e)[:100]}'
                 self.failed_requests += 1
+                self.metrics.increment('failures')
                 logging.error(f"Failed to process {url}: {str(e)}")
 
             result['Processing Duration (s)'] = round(time.time() - start_time, 2)
+            self.metrics.increment('pages')
             return result, list(set(new_urls))
 
     def _save_results(self, batch: List[Dict]):
         """Save a batch of results to CSV"""
-        with open(self.csv_file, 'a', newline='', encoding='utf-8') as f:
+        with self.metrics.stage('sink_write'), open(self.csv_file, 'a', newline='', encoding='utf-8') as f:
             writer = csv.DictWriter(f, fieldnames=list(batch[0].keys()))
             writer.writerows(batch)
         logging.info(f"Saved batch of {len(batch)} results")
@@ -289,21 +338,36 @@ class WebCrawler:
         self.start_time = time.time()
         logging.info(f"Starting crawl of {self.base_url}")
 
-        async with aiohttp.ClientSession() as session:
+        metrics_runner = await self.metrics.serve(self.metrics_port) if self.metrics_port else None
+        snapshot_task = (asyncio.create_task(self.metrics.run_snapshots(self.metrics_json))
+                         if self.metrics_json else None)
+
+        async with aiohttp.ClientSession(trace_configs=[self.metrics.trace_config()]) as session:
+            await self.robots.fetch(session, self.base_url)
             self.queue = [self.base_url]
             self.visited.add(self.base_url)
             self.all_urls.add(self.base_url)
             batch = []
 
-            while self.queue:
+            while self.queue or self.governor.spilled:
                 # Check timeout
                 if (time.time() - self.start_time) > (self.timeout_minutes * 60):
                     logging.warning(f"Crawl timeout after {self.timeout_minutes} minutes")
                     break
 
-                # Process URLs in larger batches
-                current_batch = self.queue[:self.batch_size]
-                self.queue = self.queue[self.batch_size:]
+                # Refill from the on-disk frontier once the in-memory queue drains
+                if not self.queue:
+                    self.queue = self.governor.refill(self.governor.max_queue_in_memory)
+
+                # Process URLs in larger batches (smaller while memory is tight)
+                batch_size = self.governor.limit_batch(self.batch_size)
+                current_batch = self.queue[:batch_size]
+                self.queue = self.queue[batch_size:]
+                dequeued_at = time.perf_counter()
+                for url in current_batch:
+                    enqueued_at = self._enqueued_at.pop(url, None)
+                    if enqueued_at is not None:
+                        self.metrics.record('queue_wait', dequeued_at - enqueued_at)
 
                 # Process batch concurrently
                 tasks = [self.process_url(session, url) for url in current_batch]
@@ -312,15 +376,21 @@ class WebCrawler:
                 for result, new_urls in results:
                     batch.append(result)
                     # Add new URLs to queue if not visited
+                    enqueued_at = time.perf_counter()
                     for url in new_urls:
                         if url not in self.visited:
                             self.queue.append(url)
                             self.visited.add(url)
+                            self._enqueued_at[url] = enqueued_at
 
-                # Save batch when it reaches batch_size
-                if len(batch) >= self.batch_size:
+                # Save batch when it reaches batch_size, or right away under memory pressure
+                memory_state = self.governor.check(self.batch_size)
+                if batch and (len(batch) >= self.batch_size or memory_state != 'ok'):
                     self._save_results(batch)
                     batch = []
+                if self.governor.should_spill(self.queue):
+                    self.queue = self.governor.spill(self.queue, keep=self.batch_size)
+                    self._enqueued_at = {url: self._enqueued_at[url] for url in self.queue if url in self._enqueued_at}
 
                 # Log progress with metrics
                 self._log_progress()
@@ -328,6 +398,13 @@ class WebCrawler:
             # Save any remaining results
             if batch:
                 self._save_results(batch)
+            self.governor.close()
+
+            if snapshot_task:
+                snapshot_task.cancel()
+                await asyncio.gather(snapshot_task, return_exceptions=True)
+            if metrics_runner:
+                await metrics_runner.cleanup()
 
             duration = time.time() - self.start_time
             success_rate = ((self.total_requests - self.failed_requests) / self.total_requests) * 100 if self.total_requests > 0 else 0
@@ -340,17 +417,30 @@ class WebCrawler:
             - Successful requests: {self.total_requests - self.failed_requests:,}
             - Failed requests: {self.failed_requests:,}
             - Success rate: {success_rate:.1f}%
+            - Trap URLs skipped: {self.trap_detector.trapped:,}
+            - Blocked by robots.txt: {self.robots.blocked:,}
+            - Frontier spills to disk: {self.governor.spill_events:,}
+            - Time mostly spent on: {self.metrics.bottleneck() or 'n/a'}
             - Final memory usage: {self._get_memory_usage()}""")
 
 def main():
     """Entry point for the crawler"""
-    if len(sys.argv) != 2:
-        print("Usage: python crawler.py <base_url>")
-        sys.exit(1)
-
-    base_url = sys.argv[1]
-    crawler = WebCrawler(base_url, timeout_minutes=60)
-    asyncio.run(crawler.crawl())
+    parser = argparse.ArgumentParser(description="Crawl a site and write Crawl_Report_Alpha.csv")
+    parser.add_argument("base_url")
+    parser.add_argument("--memory-budget", type=float, default=None, metavar="MB",
+                        help="RSS budget; enables memory-bounded mode (e.g. 1500 on 2 GB workers)")
+    parser.add_argument("--metrics-json", default=None, metavar="PATH",
+                        help="Write a per-stage latency snapshot to PATH every 10 seconds")
+    parser.add_argument("--metrics-port", type=int, default=None, metavar="PORT",
+                        help="Serve Prometheus metrics on :PORT/metrics")
+    parser.add_argument("--profile", action="store_true",
+                        help="Sample the crawl and write a collapsed-stack flamegraph file next to the CSV")
+    args = parser.parse_args()
+
+    crawler = WebCrawler(args.base_url, timeout_minutes=60, memory_budget_mb=args.memory_budget,
+                         metrics_json=args.metrics_json, metrics_port=args.metrics_port)
+    with profiling(profile_path_for(crawler.csv_file), enabled=args.profile):
+        asyncio.run(crawler.crawl())
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,69 +1,118 @@
 import asyncio
 import csv
 import os
+import argparse
 from urllib.parse import urljoin, urlparse
 from datetime import datetime
 from bs4 import BeautifulSoup
-from playwright.async_api import async_playwright
 import aiohttp
+from crawl_profiler import profiling, profile_path_for
+from crawler_engine.resource_cache import ResourceStatusCache
+from crawler_engine.single_flight import SingleFlight
+from crawler_engine.render_profile import LoadWatcher, PROFILES, profile_for
+from crawler_engine.browser_farm import BrowserFarm, BrowserCrashed, default_size
+
+COLUMNS = [
+    'Url', 'status code', 'Js error', 'warnings', 'notices',
+    'Seo issues', 'alt tags', 'meta tags', 'Broken images',
+    'CTA Internal links', 'heading tags', 'responsiveness issues',
+    'device type', 'date', 'time'
+]
+# Columns filled from the parsed HTML; if none is requested the page is never parsed
+SOUP_COLUMNS = {'Seo issues', 'alt tags', 'meta tags', 'Broken images', 'CTA Internal links', 'heading tags'}
+RESPONSIVE_COLUMNS = {'responsiveness issues', 'device type'}
+
+
+def parse_columns(value):
+    """--columns value: comma separated names, or a file with one column per line"""
+    if os.path.isfile(value):
+        with open(value, encoding='utf-8') as f:
+            names = [line.strip() for line in f]
+    else:
+        names = [name.strip() for name in value.split(',')]
+    return [name for name in names if name]
+
 
 class UnlimitedCrawler:
-    def __init__(self, base_url):
+    def __init__(self, base_url, columns=None, image_cache_file=None, render_profile=None, browsers=None):
         self.base_url = base_url
+        unknown = set(columns or []) - set(COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown columns: {', '.join(sorted(unknown))}")
+        # Requested columns; the CSV keeps the full schema and the rest stay 'null'
+        self.columns = set(columns) if columns else set(COLUMNS)
         self.visited = set()
         self.queue = []
         self.results = []
         self.csv_file = 'crawl_report2.csv'
         self._init_csv()
         self.session = None
-        self.playwright = None
-        self.browser = None
-        self.context = None
         self.semaphore = asyncio.Semaphore(20)  # Increased concurrency
+        self.browsers = browsers or default_size()
+        self.farm = None
         self.devices = [
             {"name": "Mobile", "viewport": {"width": 375, "height": 667}},
             {"name": "Tablet", "viewport": {"width": 768, "height": 1024}},
             {"name": "Desktop", "viewport": {"width": 1366, "height": 768}}
         ]
         self.crawl_count = 0
+        # Image statuses shared by every page of the crawl (and across runs if image_cache_file is set)
+        self.image_cache = ResourceStatusCache(path=image_cache_file)
+        # Shares link fetches between concurrent workers and with pages process_url already rendered
+        self.flights = SingleFlight()
+        # Stub fonts and media; keep stylesheets/images only when layout columns are requested,
+        # and trackers/third-party scripts only when JS errors or warnings are
+        self.render_profile = (PROFILES[render_profile]() if render_profile
+                               else profile_for(layout=self.wants(*RESPONSIVE_COLUMNS),
+                                                scripts=self.wants('Js error', 'warnings')))
 
     def _init_csv(self):
         if not os.path.exists(self.csv_file):
             with open(self.csv_file, 'w', newline='', encoding='utf-8') as f:
                 writer = csv.writer(f)
-                writer.writerow([
-                    'Url', 'status code', 'Js error', 'warnings', 'notices',
-                    'Seo issues', 'alt tags', 'meta tags', 'Broken images',
-                    'CTA Internal links', 'heading tags', 'responsiveness issues',
-                    'device type', 'date', 'time'
-                ])
+                writer.writerow(COLUMNS)
+
+    def wants(self, *columns):
+        """True if any of the columns was requested"""
+        return not self.columns.isdisjoint(columns)
 
     async def setup(self):
-        self.playwright = await async_playwright().start()
-        self.browser = await self.playwright.chromium.launch(headless=True)
-        self.context = await self.browser.new_context(
-            ignore_https_errors=True,
-            java_script_enabled=True,
-            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+        # The 20 concurrent pages are spread over several browsers instead of one context
+        self.farm = BrowserFarm(
+            size=self.browsers,
+            pages_per_browser=-(-20 // self.browsers),
+            context_options={
+                'ignore_https_errors': True,
+                'java_script_enabled': True,
+                'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+            },
+            on_context=self.render_profile.apply
         )
+        await self.farm.start()
         self.session = aiohttp.ClientSession()
 
     async def close(self):
-        await self.context.close()
-        await self.browser.close()
-        await self.playwright.stop()
+        await self.farm.close()
         await self.session.close()
+        print(f"Browser farm: {self.farm.stats()}")
+        self.image_cache.save()
+        print(f"Image status cache: {self.image_cache.stats()}")
+        print(f"Link fetches: {self.flights.calls} made, {self.flights.saved} saved by single-flight")
+        print(f"Render profile {self.render_profile.name}: stubbed {self.render_profile.stubbed}")
+
+    async def _head_image(self, url):
+        async with self.session.head(url) as response:
+            status = response.status
+            if status >= 400:
+                return 'Broken', status
+            content_type = response.headers.get('Content-Type', '')
+            if 'avif' not in content_type:
+                return 'Invalid format', content_type
+            return None, None
 
     async def check_image(self, url):
         try:
-            async with self.session.head(url) as response:
-                status = response.status
-                if status >= 400:
-                    return 'Broken', status
-                content_type = response.headers.get('Content-Type', '')
-                if 'avif' not in content_type:
-                    return 'Invalid format', content_type
-                return None, None
+            return tuple(await self.image_cache.get(url, self._head_image))
         except Exception as e:
             return 'Error', str(e)
 
@@ -124,86 +173,103 @@ class UnlimitedCrawler:
                 'time': datetime.now().strftime('%H:%M:%S')
             }
 
-            page = None
             try:
-                page = await self.context.new_page()
-                js_errors = []
-                mixed_content = []
-                responsiveness_issues = {}
-
-                # Setup listeners first
-                page.on('console', lambda msg: js_errors.append(msg.text) if msg.type == 'error' else None)
-                page.on('response', lambda response: mixed_content.append(response.url) 
-                    if urlparse(url).scheme == 'https' and urlparse(response.url).scheme == 'http' else None)
-
-                # Navigate with timeout handling
-                try:
-                    response = await page.goto(url, wait_until='domcontentloaded', timeout=30000)
-                    entry['status code'] = response.status if response else 0
-                except Exception as e:
-                    entry['notices'] = str(e)[:200]
-                    entry['status code'] = 500  # Default error code
-
-                # Collect content if page loaded
-                if entry['status code'] < 400:
-                    await page.wait_for_load_state('networkidle', timeout=15000)
-                    content = await page.content()
-                    soup = BeautifulSoup(content, 'html.parser')
-
-                    # SEO analysis
-                    seo_issues = await self.analyze_seo(soup)
-                    if seo_issues:
-                        entry['Seo issues'] = '; '.join(seo_issues)
-
-                    # Image analysis (parallel processing)
-                    images = [urljoin(url, img['src']) for img in soup.find_all('img', src=True)]
-                    image_tasks = [self.check_image(img_url) for img_url in images]  # Check ALL images
-                    image_results = await asyncio.gather(*image_tasks)
-                    broken_images = [f"{res[0]}: {res[1]}" for res in image_results if res[0]]
-                    if broken_images:
-                        entry['Broken images'] = '; '.join(broken_images)
-
-                    # Alt tags
-                    missing_alt = [urljoin(url, img['src']) for img in soup.find_all('img') if not img.get('alt')]
-                    if missing_alt:
-                        entry['alt tags'] = f"Missing alt: {len(missing_alt)} images"
-
-                    # Meta tags
-                    meta_tags = {meta.get('name', meta.get('property', 'unknown')): meta.get('content', '')
-                                for meta in soup.find_all('meta')}
-                    entry['meta tags'] = str(meta_tags)[:500]
+                async with self.farm.page(url) as page:
+                    watcher = LoadWatcher(page)
+                    js_errors = []
+                    mixed_content = []
+                    responsiveness_issues = {}
+
+                    # Setup listeners first (only for requested columns)
+                    if self.wants('Js error'):
+                        page.on('console', lambda msg: js_errors.append(msg.text) if msg.type == 'error' else None)
+                    if self.wants('warnings'):
+                        page.on('response', lambda response: mixed_content.append(response.url)
+                            if urlparse(url).scheme == 'https' and urlparse(response.url).scheme == 'http' else None)
+
+                    # Navigate with timeout handling
+                    try:
+                        response = await page.goto(url, wait_until='domcontentloaded', timeout=30000)
+                        entry['status code'] = response.status if response else 0
+                    except Exception as e:
+                        entry['notices'] = str(e)[:200]
+                        entry['status code'] = 500  # Default error code
+
+                    # Collect content if page loaded and something needs it
+                    needs_soup = self.wants(*SOUP_COLUMNS)
+                    if entry['status code'] < 400 and (needs_soup or self.wants(*RESPONSIVE_COLUMNS)):
+                        await watcher.settled(timeout=15)
+
+                    if entry['status code'] < 400 and needs_soup:
+                        content = await page.content()
+                        soup = BeautifulSoup(content, 'html.parser')
+                        # get_links runs right after the batch; hand it this page instead of a re-fetch
+                        self.flights.remember(('links', url), self._extract_links(url, soup))
+
+                        # SEO analysis
+                        if self.wants('Seo issues'):
+                            seo_issues = await self.analyze_seo(soup)
+                            if seo_issues:
+                                entry['Seo issues'] = '; '.join(seo_issues)
+
+                        # Image analysis (parallel processing) - one HEAD per image, the costliest column
+                        if self.wants('Broken images'):
+                            images = [urljoin(url, img['src']) for img in soup.find_all('img', src=True)]
+                            image_tasks = [self.check_image(img_url) for img_url in images]  # Check ALL images
+                            image_results = await asyncio.gather(*image_tasks)
+                            broken_images = [f"{res[0]}: {res[1]}" for res in image_results if res[0]]
+                            if broken_images:
+                                entry['Broken images'] = '; '.join(broken_images)
+
+                        # Alt tags
+                        if self.wants('alt tags'):
+                            missing_alt = sum(1 for img in soup.find_all('img') if not img.get('alt'))
+                            if missing_alt:
+                                entry['alt tags'] = f"Missing alt: {missing_alt} images"
+
+                        # Meta tags
+                        if self.wants('meta tags'):
+                            meta_tags = {meta.get('name', meta.get('property', 'unknown')): meta.get('content', '')
+                                        for meta in soup.find_all('meta')}
+                            entry['meta tags'] = str(meta_tags)[:500]
+
+                        # CTA links
+                        if self.wants('CTA Internal links'):
+                            cta_links = [urljoin(url, a['href']) for a in soup.find_all('a', href=True)
+                                        if any(cls in ['cta', 'button'] for cls in a.get('class', []))]
+                            if cta_links:
+                                entry['CTA Internal links'] = '; '.join(cta_links)
+
+                        # Heading structure
+                        if self.wants('heading tags'):
+                            headings = {f'h{i}': len(soup.find_all(f'h{i}')) for i in range(1,7)}
+                            entry['heading tags'] = str(headings)
 
                     # Responsiveness checks (parallel across devices)
-                    device_tasks = [self.check_responsiveness(page, device) for device in self.devices]
-                    device_results = await asyncio.gather(*device_tasks)
-                    for device, issues in zip(self.devices, device_results):
-                        if issues:
-                            responsiveness_issues[device["name"]] = issues  # No limit on issues
-                    if responsiveness_issues:
-                        entry['responsiveness issues'] = str(responsiveness_issues)
-                        entry['device type'] = ', '.join(responsiveness_issues.keys())
-
-                    # CTA links
-                    cta_links = [urljoin(url, a['href']) for a in soup.find_all('a', href=True)
-                                if any(cls in ['cta', 'button'] for cls in a.get('class', []))]
-                    if cta_links:
-                        entry['CTA Internal links'] = '; '.join(cta_links)
-
-                    # Heading structure
-                    headings = {f'h{i}': len(soup.find_all(f'h{i}')) for i in range(1,7)}
-                    entry['heading tags'] = str(headings)
-
-                # Finalize entries
-                if js_errors:
-                    entry['Js error'] = '; '.join(js_errors)
-                if mixed_content:
-                    entry['warnings'] = f"Mixed content: {len(mixed_content)} items"
+                    if entry['status code'] < 400 and self.wants(*RESPONSIVE_COLUMNS):
+                        device_tasks = [self.check_responsiveness(page, device) for device in self.devices]
+                        device_results = await asyncio.gather(*device_tasks)
+                        for device, issues in zip(self.devices, device_results):
+                            if issues:
+                                responsiveness_issues[device["name"]] = issues  # No limit on issues
+                        if responsiveness_issues:
+                            entry['responsiveness issues'] = str(responsiveness_issues)
+                            entry['device type'] = ', '.join(responsiveness_issues.keys())
 
+                    # Finalize entries
+                    if js_errors:
+                        entry['Js error'] = '; '.join(js_errors)
+                    if mixed_content:
+                        entry['warnings'] = f"Mixed content: {len(mixed_content)} items"
+
+            except BrowserCrashed:
+                if self.farm.should_retry(url):
+                    print(f"Browser crashed while rendering {url}, requeued")
+                    self.queue.append(url)
+                    return
+                entry['notices'] = 'Browser crashed while rendering'
             except Exception as e:
                 entry['notices'] = str(e)[:200]
-            finally:
-                if page:
-                    await page.close()
             
             self.results.append(entry)
             if len(self.results) >= 20:
@@ -211,12 +277,7 @@ class UnlimitedCrawler:
 
     async def save_results(self):
         with open(self.csv_file, 'a', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=[
-                'Url', 'status code', 'Js error', 'warnings', 'notices',
-                'Seo issues', 'alt tags', 'meta tags', 'Broken images',
-                'CTA Internal links', 'heading tags', 'responsiveness issues',
-                'device type', 'date', 'time'
-            ])
+            writer = csv.DictWriter(f, fieldnames=COLUMNS)
             writer.writerows(self.results)
             self.results = []
 
@@ -244,18 +305,42 @@ class UnlimitedCrawler:
         await self.save_results()
         await self.close()
 
+    def _extract_links(self, url, soup):
+        return [urljoin(url, a['href']) for a in soup.find_all('a', href=True)
+               if urlparse(urljoin(url, a['href'])).netloc == urlparse(self.base_url).netloc]
+
+    async def _fetch_links(self, url):
+        async with self.session.get(url, timeout=10) as response:
+            if response.status == 200:
+                text = await response.text()
+                return self._extract_links(url, BeautifulSoup(text, 'lxml'))
+            return []
+
     async def get_links(self, url):
         try:
-            async with self.session.get(url, timeout=10) as response:
-                if response.status == 200:
-                    text = await response.text()
-                    soup = BeautifulSoup(text, 'lxml')
-                    return [urljoin(url, a['href']) for a in soup.find_all('a', href=True)
-                           if urlparse(urljoin(url, a['href'])).netloc == urlparse(self.base_url).netloc]
-                return []
+            return await self.flights.do(('links', url), lambda: self._fetch_links(url))
         except:
             return []
 
 if __name__ == '__main__':
-    crawler = UnlimitedCrawler('https://softwarefinder.com')
-    asyncio.run(crawler.start_crawl())
\ No newline at end of file
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--columns', type=parse_columns,
+                        help='Columns to compute (comma separated, or a file with one per line); '
+                             'unrequested analyzers never run. Default: all')
+    parser.add_argument('--image-cache', help='JSON file keeping image check results between runs')
+    parser.add_argument('--browsers', type=int, help='Chromium instances to render with (default: one per two cores)')
+    parser.add_argument('--render-profile', choices=list(PROFILES),
+                        help='Resources to load when rendering (default: cheapest for the requested columns)')
+    parser.add_argument('--profile', action='store_true',
+                        help='Sample the crawl and write a collapsed-stack flamegraph file next to the CSV')
+    args = parser.parse_args()
+
+    try:
+        crawler = UnlimitedCrawler('https://softwarefinder.com', columns=args.columns, image_cache_file=args.image_cache,
+                                   render_profile=args.render_profile, browsers=args.browsers)
+    except ValueError as e:
+        parser.error(f"{str(e)} (available: {', '.join(COLUMNS)})")
+    with profiling(profile_path_for(crawler.csv_file), enabled=args.profile):
+        asyncio.run(crawler.start_crawl())
+    if args.profile:
+        print(f"Profile written to {profile_path_for(crawler.csv_file)}")
\ No newline at end of file
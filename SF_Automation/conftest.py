@@ -0,0 +1,5 @@
+def pytest_addoption(parser):
+    parser.addoption(
+        "--stub-submissions", action="store_true",
+        help="intercept form submissions, validate their payload and answer with a canned success"
+    )
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+driver_cache.py - Driver binaries resolved once, and an optional shared chromedriver
+ChromeDriverManager().install() (and Selenium's own lookup when no service is
+given) resolves and checks the driver on every run. Here the driver and browser
+paths are resolved once with Selenium Manager into a local cache and recorded in
+manifest.json; later runs start the driver straight from the recorded path.
+Versions can be pinned per browser:
+
+    SF_DRIVER_CACHE         cache directory (default ~/.cache/sf_drivers)
+    SF_CHROMEDRIVER_VERSION pin chromedriver (e.g. 133 or 133.0.6943.53)
+    SF_GECKODRIVER_VERSION  pin geckodriver (e.g. 0.36.0)
+
+Without a pin the driver matching the installed browser is cached. When the
+browser is upgraded and the cached driver no longer matches, new_driver
+resolves again and retries once.
+
+    driver = new_driver("chrome", options)
+
+A standing chromedriver saves its start on every session (the parallel runner
+and xdist workers all attach to the same one):
+
+    python driver_cache.py serve --port 9515
+    python driver_cache.py install chrome firefox
+    python driver_cache.py status
+
+geckodriver only runs one session per process, so Firefox always gets its own.
+"""
+import argparse
+import json
+import logging
+import os
+import socket
+import subprocess
+import threading
+
+from selenium import webdriver
+from selenium.common.exceptions import SessionNotCreatedException, WebDriverException
+from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.webdriver.common.selenium_manager import SeleniumManager
+from selenium.webdriver.firefox.service import Service as FirefoxService
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = os.environ.get("SF_DRIVER_CACHE") or os.path.join(os.path.expanduser("~"), ".cache", "sf_drivers")
+MANIFEST = os.path.join(CACHE_DIR, "manifest.json")
+SERVICE_STATE = os.path.join(CACHE_DIR, "chromedriver-service.json")
+PIN_VARIABLES = {"chrome": "SF_CHROMEDRIVER_VERSION", "firefox": "SF_GECKODRIVER_VERSION"}
+BROWSERS = {
+    "chrome": (webdriver.Chrome, ChromeService),
+    "firefox": (webdriver.Firefox, FirefoxService),
+}
+
+_lock = threading.Lock()
+
+
+def _read_json(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def pinned_version(browser):
+    return os.environ.get(PIN_VARIABLES[browser]) or None
+
+
+def resolve(browser, refresh=False):
+    """{"driver_path", "browser_path", "pin"} for browser, from the manifest unless refresh or the pin changed"""
+    pin = pinned_version(browser)
+    with _lock:
+        manifest = _read_json(MANIFEST)
+        entry = manifest.get(browser)
+        if not refresh and entry and entry.get("pin") == pin and os.path.isfile(entry["driver_path"]):
+            return entry
+        args = ["--browser", browser, "--cache-path", CACHE_DIR]
+        if pin:
+            args += ["--driver-version", pin]
+        paths = SeleniumManager().binary_paths(args)
+        entry = {"driver_path": paths["driver_path"], "browser_path": paths.get("browser_path") or "", "pin": pin}
+        # Re-read: another process may have resolved a different browser meanwhile
+        manifest = _read_json(MANIFEST)
+        manifest[browser] = entry
+        _write_json(MANIFEST, manifest)
+    logger.info(f"Cached {browser} driver: {entry['driver_path']}")
+    return entry
+
+
+def install(browsers, refresh=False):
+    """Resolve every browser up front (before starting parallel workers)"""
+    return {browser: resolve(browser, refresh) for browser in browsers}
+
+
+def _listening(port):
+    try:
+        with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+            return True
+    except OSError:
+        return False
+
+
+class _SharedChromeService(ChromeService):
+    """A chromedriver started by `serve`; sessions attach to it and leave it running"""
+
+    def start(self):
+        if not _listening(self.port):
+            raise WebDriverException(f"Shared chromedriver on port {self.port} is not running")
+
+    def stop(self):
+        pass
+
+
+def shared_service_port():
+    """Port of a running `serve` chromedriver, or None"""
+    state = _read_json(SERVICE_STATE)
+    port = state.get("port")
+    return port if port and _listening(port) else None
+
+
+def make_service(browser, refresh=False):
+    """Driver service for browser: the shared chromedriver when one is up, else the cached binary"""
+    entry = resolve(browser, refresh)
+    if browser == "chrome":
+        port = shared_service_port()
+        if port:
+            return _SharedChromeService(executable_path=entry["driver_path"], port=port), entry
+    return BROWSERS[browser][1](executable_path=entry["driver_path"]), entry
+
+
+def new_driver(browser, options):
+    """Start a browser from the cached driver; re-resolves once if the browser outgrew it"""
+    browser = browser.lower()
+    if browser not in BROWSERS:
+        raise ValueError(f"Unsupported browser: {browser}")
+    driver_class = BROWSERS[browser][0]
+    for refresh in (False, True):
+        service, entry = make_service(browser, refresh)
+        if entry["browser_path"] and not options.binary_location:
+            options.binary_location = entry["browser_path"]
+        try:
+            return driver_class(service=service, options=options)
+        except SessionNotCreatedException as e:
+            if refresh or entry["pin"]:
+                raise
+            logger.warning(f"Cached {browser} driver rejected the browser, resolving again: {str(e).splitlines()[0]}")
+
+
+def serve(port):
+    """Run chromedriver in the foreground for sessions to attach to"""
+    entry = resolve("chrome")
+    process = subprocess.Popen([entry["driver_path"], f"--port={port}"])
+    _write_json(SERVICE_STATE, {"port": port, "pid": process.pid, "driver_path": entry["driver_path"]})
+    print(f"chromedriver {entry['driver_path']} serving on port {port} (Ctrl+C to stop)")
+    try:
+        process.wait()
+    except KeyboardInterrupt:
+        process.terminate()
+        process.wait()
+    finally:
+        if _read_json(SERVICE_STATE).get("pid") == process.pid:
+            os.remove(SERVICE_STATE)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cached WebDriver binaries and a shared chromedriver")
+    commands = parser.add_subparsers(dest="command", required=True)
+    install_parser = commands.add_parser("install", help="resolve and cache drivers")
+    install_parser.add_argument("browsers", nargs="*", help=f"{', '.join(sorted(BROWSERS))} (default: chrome)")
+    install_parser.add_argument("--refresh", action="store_true", help="ignore the manifest")
+    serve_parser = commands.add_parser("serve", help="run a shared chromedriver")
+    serve_parser.add_argument("--port", type=int, default=9515)
+    commands.add_parser("status", help="show cached drivers and the shared chromedriver")
+    args = parser.parse_args()
+    if args.command == "install":
+        # Checked here: argparse rejects an empty list against choices
+        unknown = [browser for browser in args.browsers if browser not in BROWSERS]
+        if unknown:
+            parser.error(f"unknown browsers: {', '.join(unknown)} (choose from {', '.join(sorted(BROWSERS))})")
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if args.command == "install":
+        print(json.dumps(install(args.browsers or ["chrome"], args.refresh), indent=2))
+    elif args.command == "serve":
+        serve(args.port)
+    else:
+        print(json.dumps({"cache": CACHE_DIR, "drivers": _read_json(MANIFEST),
+                          "shared_chromedriver_port": shared_service_port()}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+form_runtime.py - Selenium runtime for compiled form specs (see form_spec.py)
+Executes the plans load_specs produces: locators are already compiled, so a
+step's fields are found with one batched lookup (polled until the required
+ones are visible) and nothing is parsed or guessed per form. Results and the
+report use FormTester.generate_report's format.
+
+    python form_runtime.py form_specs --browser chrome
+    python form_runtime.py form_specs/forms.yaml --forms "Get Pricing CTA Form" --stub-submissions
+
+The same plans run on Playwright with: playwright_backend.py --spec form_specs
+"""
+import argparse
+import json
+import logging
+import time
+from datetime import datetime
+
+from selenium import webdriver
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import Select, WebDriverWait
+
+import waits
+from driver_cache import new_driver
+from form_spec import load_specs, plan
+from replay_archive import apply_to_options
+from selector_resolver import resolve_fields
+from submission_stub import SeleniumSubmissionStub
+
+logger = logging.getLogger(__name__)
+
+SUCCESS_URL_HINTS = ("thank-you", "success")
+SUCCESS_PHRASES = ("thank you", "submitted successfully", "we'll be in touch", "submission received", "review submitted")
+SET_SLIDER_JS = "arguments[0].value = arguments[1]; arguments[0].dispatchEvent(new Event('change', {bubbles: true}));"
+
+
+def _by(locator):
+    return (By.CSS_SELECTOR, locator["css"]) if locator["css"] else (By.XPATH, locator["xpath"])
+
+
+class SpecRunner:
+    def __init__(self, driver, browser="chrome", timeout=30, stub_submissions=False):
+        self.driver = driver
+        self.browser = browser
+        self.timeout = timeout
+        self.wait = WebDriverWait(driver, timeout)
+        self.stub = SeleniumSubmissionStub(driver) if stub_submissions else None
+
+    def _scope(self, form, locator):
+        return self.driver if locator["document"] else form
+
+    def find(self, form, locator):
+        """First visible element of a compiled locator, waiting for it"""
+        def visible(_):
+            for element in self._scope(form, locator).find_elements(*_by(locator)):
+                if element.is_displayed():
+                    return element
+            return False
+        return self.wait.until(visible, f"Nothing visible for {locator['source']}")
+
+    def _xpath_fallback(self, form, field):
+        for locator in field["locators"]:
+            if locator["css"]:
+                continue
+            for element in form.find_elements(By.XPATH, locator["xpath"]):
+                if element.is_displayed():
+                    return element
+        return None
+
+    def resolve_step(self, form, step, timeout=10):
+        """{name: element or None} for a step's fields: one batched lookup per poll until the required ones show"""
+        candidates = {field["name"]: {"selectors": [locator["css"] for locator in field["locators"] if locator["css"]]}
+                      for field in step["fields"]}
+        required = [field["name"] for field in step["fields"] if not field["optional"]]
+        deadline = time.monotonic() + timeout
+        while True:
+            matches = resolve_fields(self.driver, form, candidates)
+            elements = {name: (match or {}).get("element") for name, match in matches.items()}
+            for field in step["fields"]:
+                if elements.get(field["name"]) is None:
+                    elements[field["name"]] = self._xpath_fallback(form, field)
+            if all(elements.get(name) is not None for name in required) or time.monotonic() >= deadline:
+                return elements
+            time.sleep(0.2)
+
+    def fill_step(self, form, step):
+        elements = self.resolve_step(form, step)
+        for field in step["fields"]:
+            element = elements.get(field["name"])
+            if element is None:
+                if field["optional"]:
+                    logger.warning(f"Optional field '{field['name']}' not found, skipping")
+                    continue
+                raise Exception(f"Field '{field['name']}' not found: "
+                                + ", ".join(locator["source"] for locator in field["locators"]))
+            waits.scroll_into_view(self.driver, element)
+            if field["type"] == "select":
+                Select(element).select_by_visible_text(field["value"])
+            else:
+                element.clear()
+                element.send_keys(field["value"])
+        for slider in step["sliders"]:
+            element = self.driver.find_element(
+                By.XPATH, f"//label[contains(text(), '{slider['label']}')]/following-sibling::input[@type='range']")
+            self.driver.execute_script(SET_SLIDER_JS, element, slider["value"])
+        rating = step["rating"]
+        if rating:
+            stars = self._scope(form, rating["locator"]).find_elements(*_by(rating["locator"]))
+            if len(stars) < (rating["value"] if rating["nth"] else 1):
+                raise Exception(f"Not enough stars for rating {rating['value']}")
+            stars[rating["value"] - 1 if rating["nth"] else 0].click()
+        if step["next"]:
+            self.find(form, step["next"]).click()
+            if step["wait_for"]:
+                self.wait.until(EC.visibility_of_element_located(_by(step["wait_for"])))
+            waits.wait_for_animations(self.driver, form)
+
+    def _gone_or_thanked(self, form):
+        try:
+            if not form.is_displayed():
+                return True
+        except WebDriverException:
+            return True
+        if any(hint in self.driver.current_url for hint in SUCCESS_URL_HINTS):
+            return True
+        text = self.driver.execute_script("return document.body.innerText").lower()
+        return any(phrase in text for phrase in SUCCESS_PHRASES)
+
+    def check_success(self, form, success):
+        if success and success["type"] == "redirect":
+            self.wait.until(EC.url_contains(success["url_contains"]))
+        elif success and success["type"] == "selector":
+            self.wait.until(EC.visibility_of_element_located(_by(success["locator"])))
+        elif success and success["type"] == "form_cleared":
+            waits.wait_for_network_quiet(self.driver, timeout=10)
+            WebDriverWait(self.driver, 5, poll_frequency=0.1).until(
+                lambda d: self._gone_or_thanked(form) or not any(
+                    field.get_attribute("value") for field in form.find_elements(By.TAG_NAME, "input")),
+                "Form was not cleared")
+        else:
+            WebDriverWait(self.driver, 15, poll_frequency=0.25).until(
+                self._gone_or_thanked, "No sign of a successful submission")
+
+    def run_form(self, form_plan, checks=None):
+        """Result in FormTester.generate_report's format; checks collects the (id, description) milestones passed"""
+        checks = [] if checks is None else checks
+        started = datetime.now()
+        result = {
+            "form_type": form_plan["name"],
+            "status": "failure",
+            "duration": None,
+            "error": None,
+            "browser": self.browser,
+            "timestamp": started.isoformat()
+        }
+        try:
+            self.driver.get(form_plan["url"])
+            waits.wait_for_page_settled(self.driver, timeout=self.timeout)
+            if form_plan["open"]:
+                button = self.find(None, {**form_plan["open"], "document": True})
+                waits.scroll_into_view(self.driver, button)
+                button.click()
+            checks.append(("SF-26", "Button visibility"))
+            form = self.wait.until(EC.visibility_of_element_located(_by(form_plan["form"])))
+            waits.wait_for_animations(self.driver, form)
+            checks.append(("SF-27", "Form opens"))
+            for step in form_plan["steps"]:
+                self.fill_step(form, step)
+            checks.append(("SF-28-31", "Field verification"))
+            filled = {field["name"]: field["value"] for step in form_plan["steps"] for field in step["fields"]
+                      if field["type"] != "select"}
+            if self.stub:
+                self.stub.expect(filled)
+            self.find(form, form_plan["submit"]).click()
+            self.check_success(form, form_plan["success"])
+            if self.stub:
+                optional = [field["name"] for step in form_plan["steps"] for field in step["fields"] if field["optional"]]
+                problems = self.stub.problems(filled, optional)
+                if problems:
+                    raise Exception("Submitted payload invalid: " + "; ".join(problems))
+            checks.append(("SF-34", "Form submission"))
+            result["status"] = "success"
+            logger.info(f"Form {form_plan['name']} passed")
+        except TimeoutException as e:
+            result["error"] = e.msg or "Timed out"
+            logger.error(f"{form_plan['name']} failed: {result['error']}")
+        except Exception as e:
+            result["error"] = str(e)
+            logger.error(f"{form_plan['name']} failed: {str(e)}")
+        result["duration"] = str(datetime.now() - started)
+        return result
+
+
+def make_driver(browser="chrome", headless=True):
+    if browser == "chrome":
+        options = webdriver.ChromeOptions()
+        if headless:
+            options.add_argument("--headless=new")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--window-size=1920,1080")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--disable-dev-shm-usage")
+    else:
+        options = webdriver.FirefoxOptions()
+        if headless:
+            options.add_argument("--headless")
+        options.add_argument("--width=1920")
+        options.add_argument("--height=1080")
+    apply_to_options(options)
+    return new_driver(browser, options)
+
+
+def run_specs(paths, browser="chrome", headless=True, forms=None, stub_submissions=False):
+    compiled = [form for form in load_specs(*paths) if not forms or form["name"] in forms]
+    driver = make_driver(browser, headless)
+    try:
+        runner = SpecRunner(driver, browser, stub_submissions=stub_submissions)
+        return [runner.run_form(plan(form)) for form in compiled]
+    finally:
+        driver.quit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run declarative form specs on Selenium")
+    parser.add_argument("paths", nargs="+", help="spec files or directories")
+    parser.add_argument("--browser", choices=["chrome", "firefox"], default="chrome")
+    parser.add_argument("--headed", action="store_true", help="Run in headed mode")
+    parser.add_argument("--forms", nargs="+", help="only these form names")
+    parser.add_argument("--stub-submissions", action="store_true",
+                        help="validate the submit payload and answer it with a canned success (Chrome)")
+    parser.add_argument("--output", help="report file (default test_report_<browser>.json)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    started = time.perf_counter()
+    results = run_specs(args.paths, args.browser, not args.headed, args.forms, args.stub_submissions)
+    report = args.output or f"test_report_{args.browser}.json"
+    with open(report, "w") as f:
+        json.dump(results, f, indent=2)
+    passed = sum(1 for result in results if result["status"] == "success")
+    print(f"\n{passed}/{len(results)} forms passed in {time.perf_counter() - started:.1f}s, report: {report}")
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
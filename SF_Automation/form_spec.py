@@ -0,0 +1,475 @@
+#!/usr/bin/env python3
+"""
+form_spec.py - Declarative form specs, validated and compiled once
+A form spec describes forms in one format, YAML or JSON. form_specs/forms.yaml
+holds every form once and is what all the suites run: test_forms.py,
+modal_form_tester.py, parallel_form_runner.py, forms_testing-Prototype.py and
+playwright_backend.py.
+
+    forms:
+      - name: Write a Review
+        url: https://softwarefinder.com/...
+        open: "#write-review"              # optional: clicked to open a modal form
+        form: "form#review-form"
+        steps:
+          - fields:
+              email: {value: "test_{unique}@mail.com", locators: ["#email", "input[type=email]"]}
+              Industry: {value: Analytics, type: select}
+              organization: {value: Test Org, optional: true}
+            sliders: [{label: Ease of Use, value: 4}]
+            rating: {value: 5, locator: ".stars span", nth: true}
+            next: "xpath://button[contains(text(), 'Next')]"
+            wait_for: "name:title"
+        submit: "button[type=submit]"
+        success: {type: redirect, url_contains: thank-you}
+
+Locators are CSS unless prefixed "xpath:", "id:" or "name:" (a leading "//" is
+XPath too). Field locators are looked up inside the form; the others behave as
+in Selenium: CSS inside the form, "//" XPath anywhere in the document. A field
+without locators is found by its name attribute, a single-step form can give
+"fields" instead of "steps", and "{unique}" in a value becomes a fresh token
+each time plans are built. Without "success" the runtimes look for the form
+going away, a thank-you URL or a success message.
+
+load_specs validates the whole file up front, reporting every problem with its
+path (forms[3].steps[0].fields.email), and compiles each locator once:
+
+    - id:/name: lookups and XPath attribute tests become CSS, so all fields of
+      a step resolve in one batched call (selector_resolver)
+    - a CSS chain through an #id is cut to start at the id, and a field
+      chain ending in [name=...] to that element
+    - field candidates are ordered id, name, other attributes, classes, XPath
+    - long class chains (utility classes that change with every restyle) are
+      reported as brittle
+
+    python form_spec.py check form_specs
+"""
+import argparse
+import json
+import logging
+import os
+import re
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# Every form once; what the suites run by default
+SPEC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "form_specs", "forms.yaml")
+FIELD_TYPES = ("text", "email", "phone", "tel", "textarea", "select")
+SUCCESS_TYPES = ("redirect", "selector", "form_cleared")
+FORM_KEYS = {"name", "url", "open", "form", "steps", "fields", "submit", "success"}
+STEP_KEYS = {"fields", "sliders", "rating", "next", "wait_for"}
+FIELD_KEYS = {"value", "locators", "type", "optional"}
+DEFAULT_SUBMIT = "button[type=submit]"
+BRITTLE_CLASS_COUNT = 4
+# Candidate order: id, name, other attribute, class/tag, XPath
+RANK_ID, RANK_NAME, RANK_ATTRIBUTE, RANK_CLASS, RANK_XPATH = range(5)
+
+IDENT = r"-?[_a-zA-Z][\w-]*"
+ID_TOKEN = r"#(?:[\w-]|\\.)+"
+ID_ATTRIBUTE = re.compile(r"\[\s*id\s*=\s*(?:\"([^\"]*)\"|'([^']*)')\s*\]")
+XPATH_ATTRIBUTES = re.compile(r"^//(\*|[a-zA-Z][\w-]*)((?:\[@[\w-]+=(?:'[^']*'|\"[^\"]*\")\])+)$")
+XPATH_PREDICATE = re.compile(r"\[@([\w-]+)=(?:'([^']*)'|\"([^\"]*)\")\]")
+
+
+class FormSpecError(ValueError):
+    def __init__(self, problems):
+        self.problems = problems
+        super().__init__("Invalid form spec:\n  " + "\n  ".join(problems))
+
+
+def _css_parts(selector):
+    """[compound, combinator, compound, ...] of a CSS selector, None for a selector list; ValueError if malformed"""
+    parts, current, pending = [], "", None
+    depth, quote, escaped, is_list = 0, None, False, False
+    for char in selector.strip():
+        if escaped:
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif quote:
+            quote = None if char == quote else quote
+        elif char in "\"'":
+            quote = char
+        elif char in "[(":
+            depth += 1
+        elif char in "])":
+            depth -= 1
+            if depth < 0:
+                raise ValueError(f"unbalanced '{char}'")
+        elif depth == 0 and char == ",":
+            is_list = True
+        elif depth == 0 and (char.isspace() or char in ">+~"):
+            if current:
+                parts.append(current)
+                current = ""
+                pending = " "
+            if char in ">+~":
+                if pending not in (None, " ") or not parts:
+                    raise ValueError(f"misplaced combinator '{char}'")
+                pending = char
+            continue
+        if pending is not None:
+            parts.append(pending)
+            pending = None
+        current += char
+    if quote or escaped:
+        raise ValueError("unterminated string or escape")
+    if depth:
+        raise ValueError("unbalanced brackets")
+    if pending not in (None, " "):
+        raise ValueError("dangling combinator")
+    if not current and not parts:
+        raise ValueError("empty selector")
+    if current:
+        parts.append(current)
+    return None if is_list else parts
+
+
+def _outer(compound):
+    """A compound without its [attribute] and (:not/:has ...) contents, where # and . do not count"""
+    compound = re.sub(r"\[(?:[^\]\"']|\"[^\"]*\"|'[^']*')*\]", "[]", compound)
+    while re.search(r"\([^()]*\)", compound):
+        compound = re.sub(r"\([^()]*\)", "", compound)
+    return compound
+
+
+def _rank(compound):
+    outer = _outer(compound)
+    if re.search(ID_TOKEN, outer):
+        return RANK_ID
+    if re.search(r"\[\s*name\s*[~|^$*]?=", compound):
+        return RANK_NAME
+    if "[" in outer:
+        return RANK_ATTRIBUTE
+    return RANK_CLASS
+
+
+def _attribute(name, value):
+    if name == "id" and value:
+        # #id form (escaped as needed) rather than [id=...]: the browser's fast path
+        escaped = re.sub(r"([^\w-])", r"\\\1", value)
+        return f"#\\3{value[0]} {escaped[1:]}" if value[0].isdigit() else f"#{escaped}"
+    return f"[{name}={json.dumps(value)}]"
+
+
+def _xpath_to_css(xpath):
+    """CSS for a plain //tag[@attr='value']... XPath, else None"""
+    match = XPATH_ATTRIBUTES.match(xpath)
+    if not match:
+        return None
+    tag = "" if match.group(1) == "*" else match.group(1)
+    predicates = "".join(_attribute(name, single if double == "" else double)
+                         for name, single, double in XPATH_PREDICATE.findall(match.group(2)))
+    return tag + predicates
+
+
+def compile_locator(text, field=False):
+    """A spec locator -> {"css", "xpath", "document", "rank", "source"}; ValueError if malformed
+
+    document: searched from the document rather than the form (Selenium's rule for "//" XPath)."""
+    if not isinstance(text, str) or not text.strip():
+        raise ValueError("locator must be a non-empty string")
+    source = text.strip()
+    strategy, _, value = source.partition(":")
+    if strategy in ("id", "name", "xpath", "css") and value:
+        value = value.strip()
+    else:
+        strategy, value = ("xpath" if source.startswith(("//", "(/")) else "css"), source
+    if strategy == "id":
+        css = _attribute("id", value)
+    elif strategy == "name":
+        css = _attribute("name", value)
+    elif strategy == "xpath":
+        if value.count("[") != value.count("]") or value.count("(") != value.count(")"):
+            raise ValueError("unbalanced brackets")
+        css = _xpath_to_css(value)
+        if css is None:
+            return {"css": None, "xpath": value, "document": value.startswith(("/", "(/")) and not field,
+                    "rank": RANK_XPATH, "source": source}
+        return {"css": css, "xpath": value, "document": not field, "rank": _rank(css), "source": source}
+    else:
+        css = ID_ATTRIBUTE.sub(lambda match: _attribute("id", match.group(1) or match.group(2) or ""), value)
+    parts = _css_parts(css)
+    if parts:
+        compounds = parts[::2]
+        anchored = [index for index, compound in enumerate(compounds) if _rank(compound) == RANK_ID]
+        if anchored:
+            # Ids are unique: whatever led up to one only costs matching time
+            parts = parts[anchored[-1] * 2:]
+        elif field and _rank(compounds[-1]) == RANK_NAME:
+            # Already scoped to the form; the name picks the control
+            parts = parts[-1:]
+        css = "".join(part if index % 2 == 0 else (" " if part == " " else f" {part} ")
+                      for index, part in enumerate(parts))
+        rank = _rank(parts[-1]) if not anchored else RANK_ID
+    else:
+        rank = min(_rank(compound) for compound in re.split(r"\s*,\s*", css))
+    return {"css": css, "xpath": None, "document": False, "rank": rank, "source": source}
+
+
+def brittle(locator):
+    """True for a CSS locator with a long class chain in some compound"""
+    if not locator["css"] or locator["rank"] <= RANK_NAME:
+        return False
+    return any(len(re.findall(r"\.(?:[\w-]|\\.)+", _outer(compound))) >= BRITTLE_CLASS_COUNT
+               for compound in re.split(r"[\s>+~]+", locator["css"]))
+
+
+class _Compiler:
+    def __init__(self, source):
+        self.source = source
+        self.problems = []
+        self.warnings = []
+
+    def problem(self, path, message):
+        self.problems.append(f"{self.source}: {path}: {message}")
+
+    def _keys(self, path, data, allowed, required=()):
+        if not isinstance(data, dict):
+            self.problem(path, f"expected a mapping, got {type(data).__name__}")
+            return False
+        for key in sorted(set(data) - allowed):
+            self.problem(path, f"unknown key '{key}'")
+        for key in required:
+            if key not in data:
+                self.problem(path, f"'{key}' is required")
+        return True
+
+    def locator(self, path, text, field=False):
+        try:
+            locator = compile_locator(text, field)
+        except ValueError as e:
+            self.problem(path, f"bad locator {text!r}: {str(e)}")
+            return None
+        if brittle(locator):
+            self.warnings.append(f"{self.source}: {path}: brittle class-chain locator {locator['source']!r}")
+        return locator
+
+    def field(self, path, name, spec):
+        if not isinstance(spec, dict):
+            spec = {"value": spec}
+        if not self._keys(path, spec, FIELD_KEYS, ("value",)):
+            return None
+        if not isinstance(spec.get("value"), (str, int, float)):
+            self.problem(f"{path}.value", "must be a string or number")
+        field_type = spec.get("type", "text")
+        if field_type not in FIELD_TYPES:
+            self.problem(f"{path}.type", f"must be one of {', '.join(FIELD_TYPES)}")
+        sources = spec.get("locators") or [f"name:{name}"]
+        if isinstance(sources, str):
+            sources = [sources]
+        locators = [self.locator(f"{path}.locators[{index}]", text, field=True) for index, text in enumerate(sources)]
+        locators = [locator for locator in locators if locator]
+        unique = {}
+        for locator in sorted(locators, key=lambda locator: locator["rank"]):
+            unique.setdefault((locator["css"], locator["xpath"]), locator)
+        return {"name": name, "value": spec.get("value"), "type": field_type,
+                "optional": bool(spec.get("optional", False)), "locators": list(unique.values())}
+
+    def step(self, path, step):
+        if not self._keys(path, step, STEP_KEYS):
+            return None
+        fields = step.get("fields") or {}
+        if not isinstance(fields, dict):
+            self.problem(f"{path}.fields", "expected a mapping of field name to value or field spec")
+            fields = {}
+        sliders = step.get("sliders") or []
+        for index, slider in enumerate(sliders):
+            if self._keys(f"{path}.sliders[{index}]", slider, {"label", "value"}, ("label", "value")) \
+                    and "'" in str(slider.get("label", "")):
+                self.problem(f"{path}.sliders[{index}].label", "may not contain a single quote")
+        rating = step.get("rating")
+        if rating is not None and self._keys(f"{path}.rating", rating, {"value", "locator", "nth"}, ("value",)):
+            if not isinstance(rating.get("value"), int) or rating["value"] < 1:
+                self.problem(f"{path}.rating.value", "must be a positive integer")
+            rating = {"value": rating.get("value"), "nth": bool(rating.get("nth", False)),
+                      "locator": self.locator(f"{path}.rating.locator",
+                                              rating.get("locator", f"xpath://span[@data-rating='{rating.get('value')}']"))}
+        return {
+            "fields": [field for field in (self.field(f"{path}.fields.{name}", name, spec)
+                                           for name, spec in fields.items()) if field],
+            "sliders": [slider for slider in sliders if isinstance(slider, dict)],
+            "rating": rating,
+            "next": self.locator(f"{path}.next", step["next"]) if step.get("next") else None,
+            "wait_for": self.locator(f"{path}.wait_for", step["wait_for"]) if step.get("wait_for") else None,
+        }
+
+    def success(self, path, success):
+        if success is None:
+            return None
+        if not self._keys(path, success, {"type", "url_contains", "locator"}, ("type",)):
+            return None
+        kind = success.get("type")
+        if kind not in SUCCESS_TYPES:
+            self.problem(f"{path}.type", f"must be one of {', '.join(SUCCESS_TYPES)}")
+        elif kind == "redirect" and not success.get("url_contains"):
+            self.problem(path, "redirect needs 'url_contains'")
+        elif kind == "selector" and not success.get("locator"):
+            self.problem(path, "selector needs 'locator'")
+        compiled = {"type": kind, "url_contains": success.get("url_contains")}
+        if success.get("locator"):
+            compiled["locator"] = self.locator(f"{path}.locator", success["locator"])
+        return compiled
+
+    def form(self, path, form):
+        if not self._keys(path, form, FORM_KEYS, ("name", "url", "form")):
+            return None
+        if "steps" in form and "fields" in form:
+            self.problem(path, "give either 'steps' or 'fields', not both")
+        if not str(form.get("url", "")).startswith(("http://", "https://")):
+            self.problem(f"{path}.url", "must be an http(s) URL")
+        steps = form.get("steps")
+        if steps is None:
+            steps = [{"fields": form.get("fields") or {}}]
+        if not isinstance(steps, list) or not steps:
+            self.problem(f"{path}.steps", "expected a non-empty list")
+            steps = []
+        return {
+            "name": form.get("name"),
+            "url": form.get("url"),
+            "open": self.locator(f"{path}.open", form["open"]) if form.get("open") else None,
+            "form": self.locator(f"{path}.form", form.get("form")),
+            "steps": [step for step in (self.step(f"{path}.steps[{index}]", step)
+                                        for index, step in enumerate(steps)) if step],
+            "submit": self.locator(f"{path}.submit", form.get("submit") or DEFAULT_SUBMIT),
+            "success": self.success(f"{path}.success", form.get("success")),
+        }
+
+
+def read_spec(path):
+    """Raw spec data from a .yaml/.yml or .json file"""
+    with open(path) as f:
+        if path.endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError:
+                raise RuntimeError("PyYAML is needed for YAML form specs (pip install PyYAML)")
+            return yaml.safe_load(f)
+        return json.load(f)
+
+
+def spec_files(path):
+    if os.path.isdir(path):
+        return sorted(os.path.join(path, name) for name in os.listdir(path)
+                      if name.endswith((".yaml", ".yml", ".json")))
+    return [path]
+
+
+def compile_spec(data, source="<spec>"):
+    """(compiled forms, warnings) of spec data; FormSpecError listing every problem"""
+    compiler = _Compiler(source)
+    forms = data.get("forms") if isinstance(data, dict) else None
+    if not isinstance(forms, list):
+        raise FormSpecError([f"{source}: top level must be a mapping with a 'forms' list"])
+    compiled = [compiler.form(f"forms[{index}]", form) for index, form in enumerate(forms)]
+    names = [form["name"] for form in compiled if form]
+    for name in sorted({name for name in names if names.count(name) > 1}):
+        compiler.problem("forms", f"duplicate form name {name!r}")
+    if compiler.problems:
+        raise FormSpecError(compiler.problems)
+    return compiled, compiler.warnings
+
+
+def load_specs(*paths):
+    """Compiled forms of every spec file (directories are expanded); all files are validated before raising"""
+    forms, problems = [], []
+    for path in paths:
+        for filename in spec_files(path):
+            try:
+                compiled, warnings = compile_spec(read_spec(filename), filename)
+            except FormSpecError as e:
+                problems.extend(e.problems)
+                continue
+            except (OSError, ValueError) as e:
+                problems.append(f"{filename}: {str(e)}")
+                continue
+            for warning in warnings:
+                logger.warning(warning)
+            forms.extend(compiled)
+    if problems:
+        raise FormSpecError(problems)
+    return forms
+
+
+def _values(step):
+    token = uuid.uuid4().hex[:8]
+    return {field["name"]: str(field["value"]).replace("{unique}", token) for field in step["fields"]}
+
+
+def plan(form):
+    """A compiled form with {unique} values filled in, ready for a runtime"""
+    steps = []
+    for step in form["steps"]:
+        values = _values(step)
+        steps.append({**step, "fields": [{**field, "value": values[field["name"]]} for field in step["fields"]]})
+    return {**form, "steps": steps}
+
+
+def playwright_selector(locator):
+    """Playwright selector of a compiled locator; document-wide ones stay XPath so runners can tell"""
+    if locator is None:
+        return None
+    if locator["xpath"] and (locator["document"] or not locator["css"]):
+        return f"xpath={locator['xpath']}"
+    return f"css={locator['css']}"
+
+
+def to_playwright(form):
+    """A planned form in the shape PlaywrightFormRunner runs"""
+    def overall(rating):
+        if not rating:
+            return None
+        return {"value": rating["value"], "selector": playwright_selector(rating["locator"]), "nth": rating["nth"]}
+
+    success = form["success"]
+    if success and success.get("locator"):
+        success = {"type": "selector", "selector": playwright_selector(success["locator"])}
+    return {
+        "form_type": form["name"],
+        "page_url": form["url"],
+        "button": playwright_selector(form["open"]),
+        "form": playwright_selector(form["form"]),
+        "steps": [{
+            "fields": [{"name": field["name"], "value": field["value"], "type": field["type"],
+                        "optional": field["optional"],
+                        "selectors": [playwright_selector(locator) for locator in field["locators"]]}
+                       for field in step["fields"]],
+            "ratings": step["sliders"],
+            "overall_rating": overall(step["rating"]),
+            "next_button": playwright_selector(step["next"]),
+            "wait_for": playwright_selector(step["wait_for"]),
+        } for step in form["steps"]],
+        "submit": playwright_selector(form["submit"]),
+        "success": success,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate and compile declarative form specs")
+    commands = parser.add_subparsers(dest="command", required=True)
+    check = commands.add_parser("check", help="validate spec files and show the compiled locators")
+    check.add_argument("paths", nargs="+")
+    check.add_argument("--verbose", action="store_true", help="print every compiled locator")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
+    try:
+        forms = load_specs(*args.paths)
+    except FormSpecError as e:
+        print(str(e))
+        return 1
+    for form in forms:
+        print(f"{form['name']}: {len(form['steps'])} step(s), "
+              f"{sum(len(step['fields']) for step in form['steps'])} field(s)")
+        if args.verbose:
+            for step in form["steps"]:
+                for field in step["fields"]:
+                    print(f"    {field['name']}: " + " | ".join(
+                        locator["css"] or f"xpath:{locator['xpath']}" for locator in field["locators"]))
+    print(f"{len(forms)} form(s) OK")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
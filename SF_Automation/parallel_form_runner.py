@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+parallel_form_runner.py - Runs the form spec's forms across worker processes
+Each worker process owns one FormTester (one Chrome or Firefox driver) and pulls
+forms from its browser's queue until it is empty, so slow forms do not hold up
+a fixed shard. Per-worker results are merged into one report, plus one
+test_report_<browser>.json per browser in the format FormTester.generate_report
+writes (what the CI pipeline uploads).
+
+    python parallel_form_runner.py --browsers chrome firefox --workers 4
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import time
+from datetime import datetime
+
+from driver_cache import install
+from form_spec import SPEC, load_specs
+from replay_archive import share_proxy
+
+logger = logging.getLogger(__name__)
+
+
+def _worker(browser, headless, worker_id, jobs, results):
+    """Worker process: one driver, forms from jobs until the None sentinel"""
+    from modal_form_tester import FormTester
+
+    forms = load_specs(SPEC)
+    try:
+        tester = FormTester(browser=browser, headless=headless)
+    except Exception as e:
+        logger.error(f"{worker_id} could not start {browser}: {str(e)}")
+        results.put((worker_id, None))
+        return
+    try:
+        while True:
+            index = jobs.get()
+            if index is None:
+                break
+            seen = len(tester.results)
+            tester.test_form(forms[index])
+            for result in tester.results[seen:]:
+                result["worker"] = worker_id
+                results.put((worker_id, (index, result)))
+    finally:
+        try:
+            tester.driver.quit()
+        except Exception:
+            pass
+        results.put((worker_id, None))
+
+
+def job_order(forms):
+    """Multi-step forms first: they take longest, so they should not start last"""
+    return sorted(range(len(forms)), key=lambda index: -len(forms[index]["steps"]))
+
+
+def run_matrix(browsers, workers=4, headless=True, forms=None):
+    """Run every form on every browser with workers processes per browser; results in form order"""
+    specs = load_specs(SPEC)
+    indexes = [index for index in job_order(specs) if not forms or specs[index]["name"] in forms]
+    # Resolve drivers once up front so workers do not race on the driver cache
+    install(browsers)
+    # One archive proxy for all workers (SF_ARCHIVE); spawned workers inherit SF_ARCHIVE_PROXY
+    share_proxy()
+
+    # spawn: same behaviour on Linux and Windows, no forked driver state
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    # Held until the end: a collected Queue can drop items its feeder thread has not flushed
+    queues = {browser: context.Queue() for browser in browsers}
+    processes = []
+    for browser in browsers:
+        jobs = queues[browser]
+        count = max(1, min(workers, len(indexes)))
+        for index in indexes:
+            jobs.put(index)
+        for _ in range(count):
+            jobs.put(None)
+        for number in range(count):
+            worker_id = f"{browser}-{number + 1}"
+            process = context.Process(target=_worker, args=(browser, headless, worker_id, jobs, results))
+            process.start()
+            processes.append((worker_id, browser, process))
+    logger.info(f"Started {len(processes)} workers for {len(indexes)} forms on {', '.join(browsers)}")
+
+    collected = {}
+    running = len(processes)
+    while running:
+        try:
+            worker_id, item = results.get(timeout=5)
+        except queue.Empty:
+            # A worker killed outside Python never sends its sentinel
+            if not any(process.is_alive() for _, _, process in processes):
+                break
+            continue
+        if item is None:
+            running -= 1
+            continue
+        index, result = item
+        collected[(result["browser"], index)] = result
+    for _, _, process in processes:
+        process.join()
+
+    # Forms no worker got to (every driver of a browser failed to start)
+    merged = []
+    for browser in browsers:
+        for index in sorted(indexes):
+            result = collected.get((browser, index))
+            if result is None:
+                result = {
+                    "form_type": specs[index]["name"],
+                    "status": "failure",
+                    "duration": None,
+                    "error": "No worker could run this form",
+                    "browser": browser,
+                    "timestamp": datetime.now().isoformat()
+                }
+            merged.append(result)
+    return merged
+
+
+def write_reports(results, browsers, output):
+    for browser in browsers:
+        with open(f"test_report_{browser}.json", "w") as f:
+            json.dump([result for result in results if result["browser"] == browser], f, indent=2)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+
+
+def print_summary(results, browsers, elapsed):
+    print(f"\nForm matrix finished in {elapsed:.1f}s")
+    for browser in browsers:
+        rows = [result for result in results if result["browser"] == browser]
+        passed = sum(1 for result in rows if result["status"] == "success")
+        print(f"  {browser}: {passed}/{len(rows)} passed")
+        for result in rows:
+            if result["status"] != "success":
+                error = (result.get("error") or "").strip().split("\n")[0]
+                print(f"    ❌ {result['form_type']}: {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the form spec's forms in parallel worker processes")
+    parser.add_argument("--browsers", nargs="+", choices=["chrome", "firefox"], default=["chrome"])
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help="worker processes (drivers) per browser")
+    parser.add_argument("--headed", action="store_true", help="Run in headed mode")
+    parser.add_argument("--forms", nargs="+", help="only these form names")
+    parser.add_argument("--output", default="test_report_matrix.json", help="merged report")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    started = time.perf_counter()
+    results = run_matrix(args.browsers, args.workers, not args.headed, args.forms)
+    write_reports(results, args.browsers, args.output)
+    print_summary(results, args.browsers, time.perf_counter() - started)
+    return 0 if all(result["status"] == "success" for result in results) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
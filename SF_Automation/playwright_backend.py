@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+playwright_backend.py - Async Playwright backend for the form suites
+Runs the forms of the shared spec (form_specs/forms.yaml, see form_spec.py) on
+one Chromium (or Firefox/WebKit) process, with every form in its own isolated
+browser context and up to --concurrency forms in flight at once. Commands go
+over Playwright's pipe instead of one HTTP round trip each to a driver, and
+locators auto-wait instead of polling.
+
+--suite picks which Selenium suite's report format the results come out in:
+
+    test_forms   test_report.csv (Form Type,Status,Message)
+    modal        test_report_<browser>.json (FormTester.generate_report)
+    prototype    form_testing_report_<timestamp>.json (summary + details)
+
+    python playwright_backend.py --suite modal --concurrency 6
+
+--stub-submissions answers the submit request with a canned success after
+validating its payload (see submission_stub.py). With --snapshots DIR, record
+saves each form's page load as a HAR, and replay serves it back with no
+network at all:
+
+    python playwright_backend.py --suite test_forms --snapshots snapshots --snapshot-mode record
+    python playwright_backend.py --suite test_forms --stub-submissions --snapshots snapshots --snapshot-mode replay
+
+--spec runs other spec files or directories instead of form_specs/forms.yaml:
+
+    python playwright_backend.py --spec form_specs --suite modal
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+from datetime import datetime
+
+from form_spec import SPEC, load_specs, plan, to_playwright
+from replay_archive import playwright_options
+from submission_stub import PlaywrightSubmissionStub
+
+logger = logging.getLogger(__name__)
+
+SUITES = ("test_forms", "modal", "prototype")
+SUCCESS_URL_HINTS = ("thank-you", "success")
+SUCCESS_PHRASES = ("thank you", "submitted successfully", "we'll be in touch", "submission received", "review submitted")
+
+
+def _scoped(page, form, selector):
+    # Selenium evaluates "//" XPath against the whole document even from an element
+    return page.locator(selector) if selector.startswith("xpath=") else form.locator(selector)
+
+
+class PlaywrightFormRunner:
+    def __init__(self, browser="chromium", headless=True, concurrency=5, timeout=30,
+                 stub_submissions=False, snapshot_dir=None, snapshot_mode="replay"):
+        self.browser_name = browser
+        self.stub_submissions = stub_submissions
+        self.snapshot_dir = snapshot_dir
+        self.snapshot_mode = snapshot_mode
+        self.headless = headless
+        self.concurrency = concurrency
+        self.timeout = timeout * 1000
+        self.playwright = None
+        self.browser = None
+        self.archive_options = {}
+
+    async def start(self):
+        from playwright.async_api import async_playwright
+
+        launch_options, self.archive_options = playwright_options()
+        self.playwright = await async_playwright().start()
+        self.browser = await getattr(self.playwright, self.browser_name).launch(headless=self.headless, **launch_options)
+
+    async def close(self):
+        if self.browser:
+            await self.browser.close()
+        if self.playwright:
+            await self.playwright.stop()
+        self.browser = self.playwright = None
+
+    def snapshot_path(self, config):
+        slug = re.sub(r"[^a-z0-9]+", "-", config["form_type"].lower()).strip("-")
+        return os.path.join(self.snapshot_dir, f"{slug}.har")
+
+    async def new_context(self, config=None):
+        """Isolated context per form: own cookies, storage and cache"""
+        options = {"viewport": {"width": 1920, "height": 1080}, **self.archive_options}
+        if self.snapshot_dir and self.snapshot_mode == "record" and config:
+            os.makedirs(self.snapshot_dir, exist_ok=True)
+            options.update(record_har_path=self.snapshot_path(config), record_har_content="embed")
+        context = await self.browser.new_context(**options)
+        context.set_default_timeout(self.timeout)
+        if self.snapshot_dir and self.snapshot_mode == "replay" and config:
+            path = self.snapshot_path(config)
+            if not os.path.exists(path):
+                await context.close()
+                raise FileNotFoundError(f"No snapshot for {config['form_type']}: {path}")
+            await context.route_from_har(path, not_found="abort")
+        return context
+
+    def submission_stub(self, config):
+        """Stub expecting every text field the form fills (select values are submitted as option values)"""
+        fields = [field for step in config["steps"] for field in step["fields"] if field["type"] != "select"]
+        return PlaywrightSubmissionStub({field["name"]: field["value"] for field in fields},
+                                        optional=[field["name"] for field in fields if field["optional"]])
+
+    async def _first_visible(self, form, field):
+        """First visible match in the field's selector priority order, auto-waiting for any"""
+        candidates = [form.locator(f"{selector} >> visible=true") for selector in field["selectors"]]
+        combined = candidates[0]
+        for candidate in candidates[1:]:
+            combined = combined.or_(candidate)
+        try:
+            await combined.first.wait_for(timeout=10000)
+        except Exception:
+            return None
+        for candidate in candidates:
+            if await candidate.count():
+                return candidate.first
+        return None
+
+    async def _fill_step(self, page, form, step):
+        for field in step["fields"]:
+            element = await self._first_visible(form, field)
+            if element is None:
+                if field["optional"]:
+                    logger.warning(f"Optional field '{field['name']}' not found, skipping")
+                    continue
+                raise Exception(f"Field '{field['name']}' not found")
+            if field["type"] == "select":
+                await element.select_option(label=field["value"])
+            else:
+                await element.fill(str(field["value"]))
+        for rating in step["ratings"]:
+            slider = page.locator(f"xpath=//label[contains(text(), '{rating['label']}')]"
+                                  "/following-sibling::input[@type='range']").first
+            await slider.evaluate(
+                "(element, value) => { element.value = value; element.dispatchEvent(new Event('change', {bubbles: true})); }",
+                rating["value"])
+        overall = step["overall_rating"]
+        if overall:
+            stars = _scoped(page, form, overall["selector"])
+            await (stars.nth(overall["value"] - 1) if overall["nth"] else stars.first).click()
+        if step["next_button"]:
+            await _scoped(page, form, step["next_button"]).first.click()
+            if step["wait_for"]:
+                await page.locator(step["wait_for"]).first.wait_for()
+
+    async def _succeeded(self, page, form, success):
+        if success and success["type"] == "redirect":
+            await page.wait_for_url(lambda url: success["url_contains"] in url)
+            return True
+        if success and success["type"] == "form_cleared":
+            await page.wait_for_function(
+                """element => !element.isConnected || getComputedStyle(element).display === 'none'
+                    || Array.from(element.querySelectorAll('input')).every(input => !input.value)""",
+                arg=await form.element_handle())
+            return True
+        if success and success["type"] == "selector":
+            await page.locator(success["selector"]).first.wait_for()
+            return True
+        # No success condition in the spec: form gone, success URL or success text
+        deadline = time.monotonic() + 15
+        while time.monotonic() < deadline:
+            if not await form.is_visible() or any(hint in page.url for hint in SUCCESS_URL_HINTS):
+                return True
+            text = (await page.content()).lower()
+            if any(phrase in text for phrase in SUCCESS_PHRASES):
+                return True
+            await page.wait_for_timeout(250)
+        return False
+
+    async def run_form(self, config):
+        """Result for one planned form: status, error, duration and the checks passed"""
+        started = datetime.now()
+        result = {"form_type": config["form_type"], "passed": False, "error": None,
+                  "checks": [], "started": started}
+        try:
+            context = await self.new_context(config)
+        except Exception as e:
+            result.update(error=str(e), duration=str(datetime.now() - started))
+            return result
+        stub = None
+        if self.stub_submissions:
+            stub = self.submission_stub(config)
+            await stub.install(context)
+        page = await context.new_page()
+        try:
+            await page.goto(config["page_url"], wait_until="domcontentloaded")
+            if config["button"]:
+                await page.locator(config["button"]).first.click()
+            result["checks"].append(("SF-26", "Button visibility"))
+            form = page.locator(config["form"]).first
+            await form.wait_for(state="visible")
+            result["checks"].append(("SF-27", "Form opens"))
+            for step in config["steps"]:
+                await self._fill_step(page, form, step)
+            result["checks"].append(("SF-28-31", "Field verification"))
+            await _scoped(page, form, config["submit"]).first.click()
+            if not await self._succeeded(page, form, config["success"]):
+                raise Exception("Success condition not met")
+            problems = stub.problems() if stub else []
+            if problems:
+                raise Exception("Submitted payload invalid: " + "; ".join(problems))
+            result["checks"].append(("SF-34", "Form submission"))
+            result["passed"] = True
+            logger.info(f"Form {config['form_type']} passed")
+        except Exception as e:
+            result["error"] = str(e)
+            logger.error(f"{config['form_type']} failed: {str(e)}")
+        finally:
+            result["duration"] = str(datetime.now() - started)
+            await context.close()
+        return result
+
+    async def run(self, configs):
+        """Run planned forms concurrently; results in spec order"""
+        limit = asyncio.Semaphore(self.concurrency)
+
+        async def bounded(config):
+            async with limit:
+                return await self.run_form(config)
+
+        return await asyncio.gather(*(bounded(config) for config in configs))
+
+
+def write_report(suite, results, browser, output=None):
+    """Write results in the format the suite's own runner produces; returns the file name"""
+    if suite == "test_forms":
+        filename = output or "test_report.csv"
+        with open(filename, "w") as f:
+            f.write("Form Type,Status,Message\n")
+            for result in results:
+                status = "PASSED" if result["passed"] else "FAILED"
+                message = "Form submitted successfully" if result["passed"] else result["error"]
+                f.write(f"{result['form_type']},{status},{message}\n")
+    elif suite == "modal":
+        filename = output or f"test_report_{browser}.json"
+        rows = [{
+            "form_type": result["form_type"],
+            "status": "success" if result["passed"] else "failure",
+            "duration": result["duration"],
+            "error": result["error"],
+            "browser": browser,
+            "timestamp": result["started"].isoformat()
+        } for result in results]
+        with open(filename, "w") as f:
+            json.dump(rows, f, indent=2)
+    else:
+        filename = output or f'form_testing_report_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
+        details = []
+        for result in results:
+            detail = {
+                "form_type": result["form_type"],
+                "timestamp": result["started"].isoformat(),
+                "tests": [{"id": check_id, "description": description, "status": "Passed"}
+                          for check_id, description in result["checks"]],
+                "status": "Passed" if result["passed"] else "Failed"
+            }
+            if result["error"]:
+                detail["error"] = result["error"]
+            details.append(detail)
+        passed = sum(1 for result in results if result["passed"])
+        report = {
+            "summary": {
+                "total_forms": len(results),
+                "passed_forms": passed,
+                "failed_forms": len(results) - passed,
+                "success_rate": f"{(passed/len(results)*100) if results else 0:.1f}%"
+            },
+            "details": details,
+            "timestamp": datetime.now().isoformat()
+        }
+        with open(filename, "w") as f:
+            json.dump(report, f, indent=2)
+    return filename
+
+
+async def run_suite(suite, browser="chromium", headless=True, concurrency=5, forms=None, output=None,
+                    stub_submissions=False, snapshot_dir=None, snapshot_mode="replay", spec=None):
+    configs = [to_playwright(plan(form)) for form in load_specs(*(spec or [SPEC]))
+               if not forms or form["name"] in forms]
+    runner = PlaywrightFormRunner(browser=browser, headless=headless, concurrency=concurrency,
+                                  stub_submissions=stub_submissions, snapshot_dir=snapshot_dir,
+                                  snapshot_mode=snapshot_mode)
+    await runner.start()
+    try:
+        results = await runner.run(configs)
+    finally:
+        await runner.close()
+    return results, write_report(suite, results, browser, output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run form specs on async Playwright")
+    parser.add_argument("--suite", choices=SUITES, default="modal", help="report format")
+    parser.add_argument("--browser", choices=["chromium", "firefox", "webkit"], default="chromium")
+    parser.add_argument("--concurrency", type=int, default=5, help="forms in flight at once")
+    parser.add_argument("--headed", action="store_true", help="Run in headed mode")
+    parser.add_argument("--forms", nargs="+", help="only these form names")
+    parser.add_argument("--output", help="report file (default: the suite's usual name)")
+    parser.add_argument("--stub-submissions", action="store_true",
+                        help="validate the submit payload and answer it with a canned success")
+    parser.add_argument("--snapshots", help="directory of per-form HAR snapshots")
+    parser.add_argument("--snapshot-mode", choices=["record", "replay"], default="replay")
+    parser.add_argument("--spec", nargs="+", help="form spec files or directories (default: form_specs/forms.yaml)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    started = time.perf_counter()
+    results, report = asyncio.run(run_suite(args.suite, args.browser, not args.headed,
+                                            args.concurrency, args.forms, args.output,
+                                            args.stub_submissions, args.snapshots, args.snapshot_mode,
+                                            args.spec))
+    passed = sum(1 for result in results if result["passed"])
+    print(f"\n{passed}/{len(results)} forms passed in {time.perf_counter() - started:.1f}s, report: {report}")
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+replay_archive.py - Record/replay of softwarefinder.com traffic for hermetic test runs
+An ArchiveProxy sits between the browser and the network as an HTTP(S) proxy:
+
+    record   forwards every request upstream and stores the response
+    replay   answers from the archive only (a miss is a fast 404), optionally
+             with simulated latency; no network needed
+
+HTTPS is intercepted with a throwaway self-signed certificate that the browsers
+are told to accept. It is generated with the openssl CLI, which stock Windows
+lacks (Git for Windows ships one in usr\bin); alternatively point
+SF_ARCHIVE_CERT / SF_ARCHIVE_KEY at an existing PEM certificate and key.
+Responses are stored in a content-addressed archive: zlib-compressed bodies
+under blobs/<sha256>, so the JS/CSS bundles every page shares are kept once,
+and index.json mapping
+"METHOD url" to status, headers and blob. Volatile query parameters (_rsc,
+cache busters) are ignored when matching.
+
+The suites pick it up from the environment, so pytest runs, the FormTester
+scripts and the parallel runner's workers all behave the same:
+
+    SF_ARCHIVE=archive SF_ARCHIVE_MODE=record pytest automatedTests.py
+    SF_ARCHIVE=archive SF_REPLAY_LATENCY_MS=0 pytest automatedTests.py -n 5
+
+    SF_ARCHIVE          archive directory (enables the proxy)
+    SF_ARCHIVE_MODE     record | replay (default replay)
+    SF_REPLAY_LATENCY_MS  delay added to every replayed response
+    SF_ARCHIVE_PROXY    host:port of an already running proxy to use instead of
+                        starting one in-process
+
+A standalone proxy shared by several processes:
+
+    python replay_archive.py serve archive --mode replay --port 8899 --latency-ms 40
+    python replay_archive.py stats archive
+"""
+import argparse
+import atexit
+import contextlib
+import hashlib
+import http.client
+import json
+import logging
+import os
+import shutil
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+logger = logging.getLogger(__name__)
+
+VOLATILE_PARAMS = {"_rsc", "_", "t", "ts", "cb", "cachebuster", "v", "ver", "timestamp"}
+HOP_BY_HOP = {"connection", "keep-alive", "proxy-authenticate", "proxy-authorization", "proxy-connection",
+              "te", "trailers", "transfer-encoding", "upgrade"}
+# Bodies are stored decoded, so their length and encoding headers are rewritten on replay
+DROPPED_RESPONSE_HEADERS = HOP_BY_HOP | {"content-length", "content-encoding"}
+CERT_DIR = os.path.join(tempfile.gettempdir(), "sf_replay_cert")
+STALE_LOCK_SECONDS = 30
+
+
+def normalize_url(url, loose=False):
+    """Key form of url: sorted query without volatile parameters; loose drops the whole query"""
+    parts = urlsplit(url)
+    netloc = parts.netloc.lower()
+    for default in (":443", ":80"):
+        if netloc.endswith(default):
+            netloc = netloc[:-len(default)]
+    query = "" if loose else urlencode(sorted((key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+                                              if key not in VOLATILE_PARAMS))
+    return urlunsplit((parts.scheme, netloc, parts.path or "/", query, ""))
+
+
+class ReplayArchive:
+    def __init__(self, path):
+        self.path = path
+        self.blob_dir = os.path.join(path, "blobs")
+        self.index_path = os.path.join(path, "index.json")
+        self.entries = {}
+        self._loose = {}
+        self._lock = threading.Lock()
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.index_path) as f:
+                self.entries = json.load(f).get("entries", {})
+        except (OSError, ValueError):
+            self.entries = {}
+        self._loose = {}
+        for key in self.entries:
+            self._loose.setdefault(self._loose_key(key), key)
+
+    @staticmethod
+    def _loose_key(key):
+        method, url = key.split(" ", 1)
+        return f"{method} {normalize_url(url, loose=True)}"
+
+    def _blob_path(self, digest):
+        return os.path.join(self.blob_dir, digest[:2], digest)
+
+    def put(self, method, url, status, headers, body):
+        digest = None
+        if body:
+            digest = hashlib.sha256(body).hexdigest()
+            path = self._blob_path(digest)
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(zlib.compress(body, 6))
+                os.replace(tmp_path, path)
+        key = f"{method} {normalize_url(url)}"
+        entry = {"status": status, "blob": digest, "size": len(body or b""),
+                 "headers": [[name, value] for name, value in headers if name.lower() not in DROPPED_RESPONSE_HEADERS]}
+        with self._lock:
+            self.entries[key] = entry
+            self._loose.setdefault(self._loose_key(key), key)
+            self.dirty = True
+
+    def get(self, method, url):
+        """(status, headers, body) for the request, or None"""
+        key = f"{method} {normalize_url(url)}"
+        entry = self.entries.get(key)
+        if entry is None:
+            loose = self._loose.get(f"{method} {normalize_url(url, loose=True)}")
+            entry = self.entries.get(loose) if loose else None
+        if entry is None:
+            return None
+        body = b""
+        if entry["blob"]:
+            with open(self._blob_path(entry["blob"]), "rb") as f:
+                body = zlib.decompress(f.read())
+        return entry["status"], entry["headers"], body
+
+    @contextlib.contextmanager
+    def _index_lock(self):
+        """Cross-process lock on index.json: an exclusively created lock file, broken if left stale"""
+        lock_path = self.index_path + ".lock"
+        while True:
+            try:
+                fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(lock_path) > STALE_LOCK_SECONDS:
+                        os.remove(lock_path)
+                        continue
+                except OSError:
+                    continue
+                time.sleep(0.05)
+        try:
+            yield
+        finally:
+            os.close(fd)
+            os.remove(lock_path)
+
+    def save(self):
+        """Merge into index.json (other processes may have recorded too) and replace it atomically"""
+        with self._lock:
+            if not self.dirty:
+                return
+            os.makedirs(self.path, exist_ok=True)
+            with self._index_lock():
+                self._merge_and_write()
+            self.dirty = False
+
+    def _merge_and_write(self):
+        try:
+            with open(self.index_path) as f:
+                merged = json.load(f).get("entries", {})
+        except (OSError, ValueError):
+            merged = {}
+        merged.update(self.entries)
+        tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"version": 1, "entries": merged}, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.index_path)
+
+    def stats(self):
+        blobs = {entry["blob"] for entry in self.entries.values() if entry["blob"]}
+        raw = sum(entry["size"] for entry in self.entries.values())
+        stored = sum(os.path.getsize(self._blob_path(digest)) for digest in blobs
+                     if os.path.exists(self._blob_path(digest)))
+        return {"responses": len(self.entries), "blobs": len(blobs), "raw_bytes": raw, "stored_bytes": stored}
+
+
+def ensure_certificate(directory=CERT_DIR):
+    """Self-signed certificate for intercepting HTTPS; the browsers run with certificate errors ignored"""
+    if os.environ.get("SF_ARCHIVE_CERT") and os.environ.get("SF_ARCHIVE_KEY"):
+        return os.environ["SF_ARCHIVE_CERT"], os.environ["SF_ARCHIVE_KEY"]
+    cert, key = os.path.join(directory, "cert.pem"), os.path.join(directory, "key.pem")
+    if not (os.path.exists(cert) and os.path.exists(key)):
+        if shutil.which("openssl") is None:
+            raise RuntimeError("The archive proxy needs the openssl CLI on PATH to create its certificate "
+                               "(on Windows: Git for Windows' usr\\bin), or SF_ARCHIVE_CERT and SF_ARCHIVE_KEY "
+                               "pointing at a PEM certificate and key")
+        os.makedirs(directory, exist_ok=True)
+        subprocess.run(["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "365",
+                        "-subj", "/CN=sf-replay", "-keyout", key, "-out", cert],
+                       check=True, capture_output=True)
+    return cert, key
+
+
+class _ProxyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    tunnel_host = None
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+    def do_CONNECT(self):
+        self.send_response(200, "Connection Established")
+        self.end_headers()
+        self.tunnel_host = self.path
+        # The rest of this connection is TLS; handle() keeps reading requests from it
+        self.connection = self.server.tls.wrap_socket(self.connection, server_side=True)
+        self.rfile = self.connection.makefile("rb", self.rbufsize)
+        self.wfile = self.connection.makefile("wb")
+        self.close_connection = False
+
+    def _url(self):
+        if self.path.startswith(("http://", "https://")):
+            return self.path
+        return f"https://{self.tunnel_host}{self.path}"
+
+    def _forward(self, url, body):
+        parts = urlsplit(url)
+        connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        kwargs = {"context": ssl.create_default_context()} if parts.scheme == "https" else {}
+        connection = connection_class(parts.hostname, parts.port, timeout=30, **kwargs)
+        headers = {name: value for name, value in self.headers.items() if name.lower() not in HOP_BY_HOP}
+        headers["Accept-Encoding"] = "identity"  # store plain bodies
+        try:
+            path = parts.path or "/"
+            connection.request(self.command, f"{path}?{parts.query}" if parts.query else path, body, headers)
+            response = connection.getresponse()
+            return response.status, response.getheaders(), response.read()
+        finally:
+            connection.close()
+
+    def _serve(self):
+        url = self._url()
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else None
+        server = self.server
+        if server.mode == "record":
+            try:
+                status, headers, data = self._forward(url, body)
+            except Exception as e:
+                logger.warning(f"Upstream error for {url}: {str(e)}")
+                status, headers, data = 502, [("Content-Type", "text/plain")], str(e).encode()
+            else:
+                server.archive.put(self.command, url, status, headers, data)
+        else:
+            found = server.archive.get(self.command, url)
+            if found is None:
+                server.misses += 1
+                logger.debug(f"Replay miss: {self.command} {url}")
+                status, headers, data = 404, [("Content-Type", "text/plain"), ("X-Replay-Miss", "1")], b""
+            else:
+                server.hits += 1
+                status, headers, data = found
+            if server.latency:
+                time.sleep(server.latency)
+        self.send_response(status)
+        for name, value in headers:
+            if name.lower() not in DROPPED_RESPONSE_HEADERS:
+                self.send_header(name, value)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        if self.command != "HEAD" and status not in (204, 304):
+            self.wfile.write(data)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_HEAD = do_OPTIONS = _serve
+
+
+class ArchiveProxy(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, archive_dir, mode="replay", host="127.0.0.1", port=0, latency_ms=0):
+        super().__init__((host, port), _ProxyHandler)
+        self.archive = ReplayArchive(archive_dir)
+        self.mode = mode
+        self.latency = latency_ms / 1000
+        self.hits = self.misses = 0
+        cert, key = ensure_certificate()
+        self.tls = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        self.tls.load_cert_chain(cert, key)
+        self._thread = None
+
+    @property
+    def address(self):
+        return f"{self.server_address[0]}:{self.server_address[1]}"
+
+    def start(self):
+        """Serve from a background thread"""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info(f"Archive proxy ({self.mode}) on {self.address} for {self.archive.path}")
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        self.archive.save()
+        if self.mode == "replay":
+            logger.info(f"Archive proxy: {self.hits} hits, {self.misses} misses")
+
+
+_proxy = None
+
+
+def proxy_address():
+    """host:port of the archive proxy for this process, starting it on first use; None when disabled"""
+    global _proxy
+    if os.environ.get("SF_ARCHIVE_PROXY"):
+        return os.environ["SF_ARCHIVE_PROXY"]
+    if not os.environ.get("SF_ARCHIVE"):
+        return None
+    if _proxy is None:
+        _proxy = ArchiveProxy(os.environ["SF_ARCHIVE"], mode=os.environ.get("SF_ARCHIVE_MODE", "replay"),
+                              latency_ms=float(os.environ.get("SF_REPLAY_LATENCY_MS", 0))).start()
+        atexit.register(_proxy.stop)
+    return _proxy.address
+
+
+def share_proxy():
+    """Start the proxy here and point child processes (started afterwards) at it"""
+    address = proxy_address()
+    if address:
+        os.environ["SF_ARCHIVE_PROXY"] = address
+    return address
+
+
+def apply_to_options(options):
+    """Route a Selenium ChromeOptions/FirefoxOptions through the archive proxy when one is configured"""
+    address = proxy_address()
+    if not address:
+        return None
+    host, port = address.rsplit(":", 1)
+    if hasattr(options, "set_preference"):
+        options.set_preference("network.proxy.type", 1)
+        for scheme in ("http", "ssl"):
+            options.set_preference(f"network.proxy.{scheme}", host)
+            options.set_preference(f"network.proxy.{scheme}_port", int(port))
+        options.accept_insecure_certs = True
+    else:
+        options.add_argument(f"--proxy-server=http://{address}")
+        options.add_argument("--ignore-certificate-errors")
+    return address
+
+
+def playwright_options():
+    """(launch kwargs, context kwargs) for Playwright when the archive proxy is configured"""
+    address = proxy_address()
+    if not address:
+        return {}, {}
+    return {"proxy": {"server": f"http://{address}"}}, {"ignore_https_errors": True}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record/replay archive proxy for the form suites")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve = commands.add_parser("serve", help="run the proxy until interrupted")
+    serve.add_argument("archive")
+    serve.add_argument("--mode", choices=["record", "replay"], default="replay")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8899)
+    serve.add_argument("--latency-ms", type=float, default=0, help="delay added to each replayed response")
+    stats = commands.add_parser("stats", help="archive size and deduplication")
+    stats.add_argument("archive")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if args.command == "stats":
+        print(json.dumps(ReplayArchive(args.archive).stats(), indent=2))
+        return
+    proxy = ArchiveProxy(args.archive, args.mode, args.host, args.port, args.latency_ms)
+    print(f"Proxy on {proxy.address}; export SF_ARCHIVE_PROXY={proxy.address}")
+    try:
+        proxy.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        proxy.server_close()
+        proxy.archive.save()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+selector_resolver.py - Batched element lookup for the form testers
+Resolves the selector candidates of every field of a form in a single
+execute_script call instead of a find_element + is_displayed round trip per
+candidate and a get_attribute per field.
+
+    matches = resolve_fields(driver, form, config["fields"])
+    matches["email"]  ->  {"element": WebElement, "selector": "[name='email']",
+                           "tag": "input", "type": "email",
+                           "attributes": {"name": "email", "type": "email", ...}}
+
+A field with no visible match maps to None.
+"""
+import logging
+
+logger = logging.getLogger(__name__)
+
+# For each field, the first visible element matched by its selectors, tried in
+# order; invalid selectors are skipped
+RESOLVE_JS = """
+const [root, candidates] = arguments;
+const scope = root || document;
+const visible = element => {
+    if (element.checkVisibility) {
+        return element.checkVisibility({
+            checkOpacity: true, checkVisibilityCSS: true,
+            opacityProperty: true, visibilityProperty: true
+        });
+    }
+    const style = getComputedStyle(element);
+    return element.getClientRects().length > 0 && style.visibility !== 'hidden' && style.opacity !== '0';
+};
+const matches = {};
+for (const [name, selectors] of Object.entries(candidates)) {
+    matches[name] = null;
+    for (const selector of selectors) {
+        let found;
+        try { found = scope.querySelectorAll(selector); } catch (e) { continue; }
+        const element = Array.from(found).find(visible);
+        if (!element) continue;
+        const attributes = {};
+        for (const attribute of element.attributes) attributes[attribute.name] = attribute.value;
+        matches[name] = {
+            element: element,
+            selector: selector,
+            tag: element.tagName.toLowerCase(),
+            type: element.type || element.tagName.toLowerCase(),
+            attributes: attributes
+        };
+        break;
+    }
+}
+return matches;
+"""
+
+
+def resolve_fields(driver, parent, fields):
+    """First visible match per field of a {name: {"selectors": [...]}} mapping, in one round trip"""
+    candidates = {name: list(config["selectors"]) for name, config in fields.items()}
+    matches = driver.execute_script(RESOLVE_JS, parent, candidates) or {}
+    for name, match in matches.items():
+        if match:
+            logger.info(f"Found {name} using selector: {match['selector']}")
+    return matches
+
+
+def resolve_selectors(driver, parent, selectors):
+    """First visible element matched by any of selectors, or None"""
+    match = resolve_fields(driver, parent, {"element": {"selectors": selectors}}).get("element")
+    return match["element"] if match else None
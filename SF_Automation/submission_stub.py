@@ -0,0 +1,274 @@
+"""
+submission_stub.py - Stubbed form submissions for the form suites
+Instead of posting a real lead and waiting on the backend, the submit request
+is intercepted in the browser, its payload is recorded for validation against
+the config's expected fields, and a canned success response comes back
+immediately. Everything up to and after the request (filling, validation
+messages, the client-side redirect to the thank-you page) still runs.
+
+A request counts as the submission when it is a non-GET fetch/XHR, or a native
+form post (a document navigation), whose body carries one of the values the
+test typed, so analytics beacons and other POSTs pass through untouched. A
+native post is answered with a small thank-you page instead of the JSON.
+
+    Selenium (Chrome):  stub = SeleniumSubmissionStub(driver)      # before driver.get
+                        stub.expect(filled)                        # before clicking submit
+                        problems = stub.problems(filled)           # after the success check
+    Playwright:         stub = PlaywrightSubmissionStub(filled)
+                        await stub.install(context)
+                        problems = stub.problems()
+
+Selenium's CDP access is command-only (no Fetch.requestPaused events without a
+BiDi connection), so there the interception is a fetch/XHR shim registered with
+Page.addScriptToEvaluateOnNewDocument that also catches the submit event and
+HTMLFormElement.submit(); Playwright uses a context route.
+"""
+import json
+import re
+from email.parser import Parser
+from email.policy import HTTP
+from urllib.parse import parse_qsl
+
+SUCCESS_RESPONSE = {"success": True, "status": "success", "message": "Submitted successfully"}
+THANK_YOU_HTML = "<!DOCTYPE html><html><body><h1>Thank you</h1><p>Submitted successfully</p></body></html>"
+# Payload keys the site uses for a config field name
+FIELD_ALIASES = {
+    "organization": ("company", "organisation", "company_name"),
+    "name": ("full_name", "fullname"),
+    "phone": ("phone_number", "telephone", "tel"),
+    "message": ("comments", "comment"),
+}
+STATIC_EXTENSIONS = (".js", ".css", ".png", ".jpg", ".jpeg", ".gif", ".svg", ".webp", ".avif",
+                     ".ico", ".woff", ".woff2", ".ttf", ".mp4", ".webm")
+
+SHIM_JS = """
+(() => {
+    if (window.__submissionStub) return;
+    window.__submissionStub = true;
+    const RESPONSE = %s;
+    const THANK_YOU = %s;
+    const CAPTURED = '__stubbedSubmissions';
+    const expected = () => {
+        try { return JSON.parse(sessionStorage.getItem('__stubExpect') || '[]'); } catch (e) { return []; }
+    };
+    const bodyText = body => {
+        if (body == null) return '';
+        if (typeof body === 'string') return body;
+        if (body instanceof URLSearchParams) return body.toString();
+        if (body instanceof FormData) {
+            const fields = {};
+            body.forEach((value, key) => { fields[key] = typeof value === 'string' ? value : '[file]'; });
+            return JSON.stringify(fields);
+        }
+        return '';
+    };
+    const isSubmission = (method, text) => {
+        if (!method || method.toUpperCase() === 'GET' || !text) return false;
+        let decoded = text;
+        try { decoded = decodeURIComponent(text.replace(/\\+/g, ' ')); } catch (e) {}
+        return expected().some(value => value && (text.includes(value) || decoded.includes(value)));
+    };
+    const record = (method, url, text, contentType) => {
+        const captured = JSON.parse(sessionStorage.getItem(CAPTURED) || '[]');
+        captured.push({method: method.toUpperCase(), url: String(url), body: text, contentType: contentType || ''});
+        sessionStorage.setItem(CAPTURED, JSON.stringify(captured));
+    };
+    if (window.fetch) {
+        const fetch = window.fetch;
+        window.fetch = function (input, init) {
+            init = init || {};
+            const method = init.method || (input instanceof Request ? input.method : 'GET');
+            const text = bodyText(init.body);
+            if (isSubmission(method, text)) {
+                record(method, input instanceof Request ? input.url : input, text,
+                       new Headers(init.headers || {}).get('content-type'));
+                return Promise.resolve(new Response(JSON.stringify(RESPONSE),
+                    {status: 200, headers: {'Content-Type': 'application/json'}}));
+            }
+            return fetch.apply(this, arguments);
+        };
+    }
+    const open = XMLHttpRequest.prototype.open;
+    const setRequestHeader = XMLHttpRequest.prototype.setRequestHeader;
+    const send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.open = function (method, url) {
+        this.__stub = {method: method, url: url, contentType: ''};
+        return open.apply(this, arguments);
+    };
+    XMLHttpRequest.prototype.setRequestHeader = function (name, value) {
+        if (this.__stub && name.toLowerCase() === 'content-type') this.__stub.contentType = value;
+        return setRequestHeader.apply(this, arguments);
+    };
+    XMLHttpRequest.prototype.send = function (body) {
+        const info = this.__stub;
+        const text = bodyText(body);
+        if (!info || !isSubmission(info.method, text)) return send.apply(this, arguments);
+        record(info.method, info.url, text, info.contentType);
+        const payload = JSON.stringify(RESPONSE);
+        const define = (name, value) => Object.defineProperty(this, name, {configurable: true, get: () => value});
+        define('readyState', 4);
+        define('status', 200);
+        define('statusText', 'OK');
+        define('responseURL', String(info.url));
+        define('responseText', payload);
+        define('response', this.responseType === 'json' ? RESPONSE : payload);
+        this.getResponseHeader = name => name.toLowerCase() === 'content-type' ? 'application/json' : null;
+        this.getAllResponseHeaders = () => 'content-type: application/json\\r\\n';
+        setTimeout(() => ['readystatechange', 'load', 'loadend'].forEach(type => this.dispatchEvent(new ProgressEvent(type))), 0);
+    };
+    // Native posts: the page the stubbed response would have loaded replaces the document
+    const stubNative = form => {
+        const method = form.getAttribute('method') || 'GET';
+        const text = new URLSearchParams(new FormData(form)).toString();
+        if (!isSubmission(method, text)) return false;
+        record(method, form.action, text, 'application/x-www-form-urlencoded');
+        document.documentElement.innerHTML = THANK_YOU;
+        return true;
+    };
+    const submit = HTMLFormElement.prototype.submit;
+    HTMLFormElement.prototype.submit = function () {
+        if (!stubNative(this)) return submit.apply(this, arguments);
+    };
+    // Bubble phase on window: runs after the page's own handlers, which cancel it for fetch/XHR submits
+    window.addEventListener('submit', event => {
+        if (!event.defaultPrevented && event.target instanceof HTMLFormElement && stubNative(event.target)) {
+            event.preventDefault();
+        }
+    });
+})();
+""" % (json.dumps(SUCCESS_RESPONSE), json.dumps(THANK_YOU_HTML))
+
+
+def expected_values(fields):
+    """{name: value} from a config's fields ({name: value} or {name: {"value": ...}})"""
+    return {name: spec["value"] if isinstance(spec, dict) else spec for name, spec in fields.items()}
+
+
+def parse_multipart(body, content_type):
+    """{name: value} of a multipart/form-data body (files as "[file]")"""
+    message = Parser(policy=HTTP).parsestr(f"Content-Type: {content_type}\r\n\r\n{body}")
+    if not message.is_multipart():
+        return {}
+    fields = {}
+    for part in message.iter_parts():
+        name = part.get_param("name", header="content-disposition")
+        if name:
+            fields[name] = "[file]" if part.get_filename() else part.get_payload(decode=False)
+    return fields
+
+
+def parse_payload(body, content_type=""):
+    """Flat {key: value} of a JSON, form-encoded or multipart body (Playwright's raw post data, or the
+    shim's JSON rendering of FormData); nested JSON keys by their leaf name"""
+    if not body:
+        return {}
+    if "multipart/form-data" in (content_type or "").lower():
+        return parse_multipart(body, content_type)
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return dict(parse_qsl(body, keep_blank_values=True))
+    flat = {}
+
+    def walk(value, key=None):
+        if isinstance(value, dict):
+            for child_key, child in value.items():
+                walk(child, child_key)
+        elif isinstance(value, list):
+            for child in value:
+                walk(child, key)
+        elif key is not None:
+            flat.setdefault(key, value)
+
+    walk(data)
+    return flat
+
+
+def _same(name, expected, actual):
+    if "phone" in name.lower():
+        # The site may reformat numbers; compare the digits typed
+        expected_digits = re.sub(r"\D", "", str(expected))
+        return re.sub(r"\D", "", str(actual)).endswith(expected_digits[-10:])
+    return str(expected).strip().casefold() == str(actual).strip().casefold()
+
+
+def validate_payload(payload, fields, optional=()):
+    """Problems with a parsed payload against the expected {name: value}; [] when it matches"""
+    lowered = {str(key).lower(): value for key, value in payload.items()}
+    problems = []
+    for name, expected in fields.items():
+        keys = (name.lower(),) + FIELD_ALIASES.get(name.lower(), ())
+        key = next((key for key in keys if key in lowered), None)
+        if key is None:
+            # Sent under a key we do not know about
+            if any(_same(name, expected, value) for value in lowered.values()):
+                continue
+            if name not in optional:
+                problems.append(f"'{name}' missing from the submitted payload")
+        elif not _same(name, expected, lowered[key]):
+            problems.append(f"'{name}': expected {expected!r}, submitted {lowered[key]!r}")
+    return problems
+
+
+def validate_submissions(submissions, fields, optional=()):
+    if not submissions:
+        return ["No form submission was captured"]
+    last = submissions[-1]
+    return validate_payload(parse_payload(last["body"], last.get("contentType", "")), fields, optional)
+
+
+class SeleniumSubmissionStub:
+    def __init__(self, driver):
+        if not hasattr(driver, "execute_cdp_cmd"):
+            raise ValueError("Submission stubbing needs a Chromium driver (CDP)")
+        self.driver = driver
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": SHIM_JS})
+
+    def expect(self, fields):
+        """Arm the stub for the values about to be submitted; clears earlier captures"""
+        values = [str(value) for value in expected_values(fields).values() if str(value).strip()]
+        self.driver.execute_script(SHIM_JS)
+        self.driver.execute_script(
+            "sessionStorage.setItem('__stubExpect', arguments[0]);"
+            "sessionStorage.removeItem('__stubbedSubmissions');", json.dumps(values))
+
+    def submissions(self):
+        raw = self.driver.execute_script("return sessionStorage.getItem('__stubbedSubmissions');")
+        return json.loads(raw) if raw else []
+
+    def problems(self, fields, optional=()):
+        return validate_submissions(self.submissions(), expected_values(fields), optional)
+
+
+class PlaywrightSubmissionStub:
+    def __init__(self, fields, optional=()):
+        self.fields = expected_values(fields)
+        self.optional = optional
+        self.values = [str(value) for value in self.fields.values() if str(value).strip()]
+        self.captured = []
+
+    def _is_submission(self, request):
+        if request.method == "GET" or request.resource_type not in ("fetch", "xhr", "document"):
+            return False
+        body = request.post_data or ""
+        return any(value in body or value in body.replace("+", " ") for value in self.values) or \
+            any(value in dict(parse_qsl(body)).values() for value in self.values)
+
+    async def _route(self, route):
+        request = route.request
+        if not self._is_submission(request):
+            await route.fallback()
+            return
+        self.captured.append({"method": request.method, "url": request.url, "body": request.post_data or "",
+                              "contentType": request.headers.get("content-type", "")})
+        if request.resource_type == "document":
+            await route.fulfill(status=200, content_type="text/html", body=THANK_YOU_HTML)
+        else:
+            await route.fulfill(status=200, content_type="application/json", body=json.dumps(SUCCESS_RESPONSE))
+
+    async def install(self, context):
+        """Route on a context (register after route_from_har so it is consulted first)"""
+        await context.route(lambda url: not url.split("?")[0].lower().endswith(STATIC_EXTENSIONS), self._route)
+
+    def problems(self):
+        return validate_submissions(self.captured, self.fields, self.optional)
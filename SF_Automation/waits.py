@@ -0,0 +1,182 @@
+"""
+waits.py - Event-driven waits shared by the Selenium testers
+Each wait resolves in the browser the moment its condition holds, instead of
+sleeping a fixed time and hoping the page is ready:
+
+    wait_for_page_settled   readyState complete, network quiet, DOM quiet
+    wait_for_network_quiet  no fetch/XHR in flight and no new resources for quiet_ms
+    wait_for_dom_quiet      no DOM mutations for quiet_ms (MutationObserver)
+    wait_for_animations     running CSS/Web animations on or around an element finished
+    scroll_into_view        instant scroll, returns once the element stops moving
+
+All waits are bounded by a timeout and return False instead of raising when it
+runs out, so callers can keep their own assertions. The exception is
+wait_for_page_settled: a document that never finishes loading raises
+TimeoutException, and only the quiet periods after it are best-effort.
+"""
+import time
+import weakref
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.support.ui import WebDriverWait
+
+# Counts in-flight fetch/XHR calls; installed before page scripts where CDP is
+# available, otherwise on the first network wait (idempotent)
+NETWORK_HOOK_JS = """
+(() => {
+    if (window.__inflight !== undefined) return;
+    window.__inflight = 0;
+    window.__netChange = performance.now();
+    try { performance.setResourceTimingBufferSize(2000); } catch (e) {}
+    const bump = delta => {
+        window.__inflight = Math.max(0, window.__inflight + delta);
+        window.__netChange = performance.now();
+    };
+    if (window.fetch) {
+        const fetch = window.fetch;
+        window.fetch = function () {
+            bump(1);
+            return fetch.apply(this, arguments).finally(() => bump(-1));
+        };
+    }
+    const send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        bump(1);
+        this.addEventListener('loadend', () => bump(-1), {once: true});
+        return send.apply(this, arguments);
+    };
+})();
+"""
+
+NETWORK_QUIET_JS = NETWORK_HOOK_JS + """
+const [quietMs, maxInflight, timeoutMs, done] = arguments;
+const start = performance.now();
+let resources = performance.getEntriesByType('resource').length;
+let lastChange = start;
+const tick = () => {
+    const now = performance.now();
+    const count = performance.getEntriesByType('resource').length;
+    if (count !== resources) { resources = count; lastChange = now; }
+    const changed = Math.max(lastChange, window.__netChange || 0);
+    if (window.__inflight <= maxInflight && now - changed >= quietMs) return done(true);
+    if (now - start >= timeoutMs) return done(false);
+    setTimeout(tick, 50);
+};
+tick();
+"""
+
+DOM_QUIET_JS = """
+const [quietMs, timeoutMs, done] = arguments;
+let timer;
+const finish = settled => { observer.disconnect(); clearTimeout(timer); clearTimeout(cap); done(settled); };
+const observer = new MutationObserver(() => {
+    clearTimeout(timer);
+    timer = setTimeout(() => finish(true), quietMs);
+});
+observer.observe(document, {subtree: true, childList: true, attributes: true, characterData: true});
+timer = setTimeout(() => finish(true), quietMs);
+const cap = setTimeout(() => finish(false), timeoutMs);
+"""
+
+# Waits two frames first so a transition started by the last click is running
+ANIMATIONS_JS = """
+const [element, timeoutMs, done] = arguments;
+const related = target => !element || !target || target.contains(element) || element.contains(target);
+requestAnimationFrame(() => requestAnimationFrame(() => {
+    const running = document.getAnimations().filter(animation =>
+        animation.playState === 'running'
+        && animation.effect
+        && isFinite(animation.effect.getComputedTiming().endTime)
+        && related(animation.effect.target));
+    if (!running.length) return done(true);
+    const cap = setTimeout(() => done(false), timeoutMs);
+    Promise.all(running.map(animation => animation.finished.catch(() => null)))
+        .then(() => { clearTimeout(cap); done(true); });
+}));
+"""
+
+SCROLL_JS = """
+const [element, timeoutMs, done] = arguments;
+element.scrollIntoView({block: 'center', inline: 'nearest', behavior: 'instant'});
+const start = performance.now();
+let last = null, stable = 0;
+const frame = () => {
+    const rect = element.getBoundingClientRect();
+    const position = rect.top + ',' + rect.left;
+    stable = position === last ? stable + 1 : 0;
+    last = position;
+    if (stable >= 2) return done(true);
+    if (performance.now() - start >= timeoutMs) return done(false);
+    requestAnimationFrame(frame);
+};
+requestAnimationFrame(frame);
+"""
+
+_tracked = weakref.WeakSet()
+
+
+def track_network(driver):
+    """Install the fetch/XHR counter in every document the driver loads from now on"""
+    if driver in _tracked:
+        return
+    if hasattr(driver, "execute_cdp_cmd"):
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": NETWORK_HOOK_JS})
+    _tracked.add(driver)
+
+
+def _run_async(driver, script, timeout, *args):
+    """Run an async wait script; retried on the new document if the page navigates meanwhile"""
+    deadline = time.monotonic() + timeout
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        try:
+            return bool(driver.execute_async_script(script, *args, int(remaining * 1000)))
+        except TimeoutException:
+            return False  # The driver's script timeout ran out first
+        except WebDriverException as e:
+            if "unload" not in str(e).lower():
+                raise
+
+
+def wait_for_document_ready(driver, timeout=30):
+    """Wait for document.readyState == 'complete'"""
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.1).until(
+            lambda d: d.execute_script("return document.readyState") == "complete"
+        )
+        return True
+    except TimeoutException:
+        return False
+
+
+def wait_for_network_quiet(driver, quiet_ms=500, timeout=10, max_inflight=0):
+    """Wait until no fetch/XHR is in flight and no resource has started for quiet_ms"""
+    track_network(driver)
+    return _run_async(driver, NETWORK_QUIET_JS, timeout, quiet_ms, max_inflight)
+
+
+def wait_for_dom_quiet(driver, quiet_ms=300, timeout=10):
+    """Wait until the DOM has not mutated for quiet_ms"""
+    return _run_async(driver, DOM_QUIET_JS, timeout, quiet_ms)
+
+
+def wait_for_animations(driver, element=None, timeout=5):
+    """Wait for finite animations/transitions on element, its ancestors or descendants (whole page if None)"""
+    return _run_async(driver, ANIMATIONS_JS, timeout, element)
+
+
+def wait_for_page_settled(driver, timeout=30, quiet_ms=500):
+    """Document loaded (TimeoutException if not), then network and DOM quiet, all within one timeout"""
+    deadline = time.monotonic() + timeout
+    remaining = lambda: max(0.0, deadline - time.monotonic())
+    if not wait_for_document_ready(driver, timeout):
+        raise TimeoutException(f"Page did not finish loading within {timeout}s")
+    return (wait_for_network_quiet(driver, quiet_ms, remaining())
+            and wait_for_dom_quiet(driver, min(quiet_ms, 300), remaining()))
+
+
+def scroll_into_view(driver, element, timeout=3):
+    """Scroll element to the middle of the viewport and wait until it stops moving"""
+    return _run_async(driver, SCROLL_JS, timeout, element)
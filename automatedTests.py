@@ -1,6 +1,12 @@
 '''runs using 
 pytest automatedTests.py -v --html=report.html --self-contained-html --reruns 2 --reruns-delay 5
 
+in parallel (pytest-xdist, one pre-warmed driver per worker, slowest tests first)
+pytest automatedTests.py -n 5 -v --html=report.html --self-contained-html --reruns 2 --reruns-delay 5
+
+with one chromedriver shared by the workers (started in another terminal)
+python SF_Automation/driver_cache.py serve --port 9515
+
 # can be used for notification service in case of an error
 chrome_options.add_experimental_option(
     "prefs", {
@@ -15,16 +21,21 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
 import csv
 from datetime import datetime
 import os
+import sys
 import time
 
-@pytest.fixture(scope="module")
-def driver():
+from driver_pool import DriverPool
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "SF_Automation"))
+from driver_cache import new_driver
+from replay_archive import apply_to_options
+from waits import wait_for_dom_quiet, wait_for_page_settled
+
+def make_driver():
     # Configure Chrome options
     chrome_options = Options()
     chrome_options.add_argument("--no-sandbox")
@@ -47,21 +58,43 @@ def driver():
             "profile.default_content_setting_values.geolocation": 2,
         }
     )
+    # Offline replay / recording when SF_ARCHIVE is set (see SF_Automation/replay_archive.py)
+    apply_to_options(chrome_options)
     
-    # Initialize WebDriver
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=chrome_options)
+    # Initialize WebDriver (driver binary cached by SF_Automation/driver_cache.py)
+    driver = new_driver("chrome", chrome_options)
     driver.implicitly_wait(5)  # Fallback implicit wait
-    yield driver
+    return driver
+
+@pytest.fixture(scope="session")
+def driver_pool():
+    # One warm browser per process; xdist workers each get their own
+    pool = DriverPool(make_driver, size=1)
+    pool.warm()
+    yield pool
     
     # Teardown
     try:
-        driver.quit()
+        pool.close()
     except Exception as e:
         print(f"Error during teardown: {str(e)}")
 
+@pytest.fixture
+def driver(driver_pool):
+    # Fresh cookies and storage for every test, same browser
+    with driver_pool.lease() as driver:
+        yield driver
+
+def artifact_name(filename):
+    # Under xdist every worker writes its own copy (test_results_gw0.csv, ...)
+    worker = os.environ.get("PYTEST_XDIST_WORKER")
+    if not worker:
+        return filename
+    stem, extension = os.path.splitext(filename)
+    return f"{stem}_{worker}{extension}"
+
 def save_results(test_case, status, error_message=""):
-    file_path = os.path.abspath("test_results.csv")
+    file_path = os.path.abspath(artifact_name("test_results.csv"))
 
         # Write header only if file doesn't exist or is empty.
     write_header = not os.path.exists(file_path) or os.path.getsize(file_path) == 0
@@ -93,14 +126,12 @@ def ensure_interactable(element, driver):
         
         return element
     except Exception as e:
-        driver.save_screenshot("element_interaction_error.png")
+        driver.save_screenshot(artifact_name("element_interaction_error.png"))
         raise
 
 def wait_for_page_load(driver, timeout=30):
-    WebDriverWait(driver, timeout).until(
-        lambda d: d.execute_script("return document.readyState") == "complete"
-    )
-    time.sleep(1)  # Allow for JavaScript initializations
+    # Loaded (TimeoutException otherwise), then network and DOM quiet: JavaScript initialization is done
+    wait_for_page_settled(driver, timeout)
 
 def safe_click(element, driver):
     """JavaScript click alternative"""
@@ -112,8 +143,44 @@ def safe_click(element, driver):
         # Perform a JS click as a fallback
         driver.execute_script("arguments[0].click();", element)
 
-def safe_send_keys(element, text, driver, clear_first=True):
-    """Robust text input with error handling"""
+# Sets the value through the prototype setter so React's value tracker sees the
+# change, then fires the events its onChange listens to
+SET_VALUE_JS = """
+const [element, value] = arguments;
+const proto = element instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+Object.getOwnPropertyDescriptor(proto, 'value').set.call(element, value);
+element.dispatchEvent(new Event('input', {bubbles: true}));
+element.dispatchEvent(new Event('change', {bubbles: true}));
+"""
+
+# Focus with the caret at the end, as a click into the field would leave it
+FOCUS_END_JS = """
+const element = arguments[0];
+element.focus();
+try { element.setSelectionRange(element.value.length, element.value.length); } catch (e) {}
+"""
+
+def fast_type(element, text, driver, clear_first=True):
+    """Enter text in one or two round trips instead of one per character"""
+    if clear_first and element.get_attribute("value"):
+        driver.execute_script(SET_VALUE_JS, element, "")
+    driver.execute_script(FOCUS_END_JS, element)
+    if hasattr(driver, "execute_cdp_cmd"):
+        # Real beforeinput/input events at the caret, like an IME commit
+        driver.execute_cdp_cmd("Input.insertText", {"text": text})
+    else:
+        current = "" if clear_first else (element.get_attribute("value") or "")
+        driver.execute_script(SET_VALUE_JS, element, current + text)
+
+def type_per_char(element, text, driver):
+    """Keystroke-by-keystroke typing for debounce-sensitive fields"""
+    for char in text:
+        element.click()
+        element.send_keys(char)
+        time.sleep(0.05)
+
+def safe_send_keys(element, text, driver, clear_first=True, per_char=False):
+    """Robust text input with error handling; per_char=True types one key at a time"""
     try:
         # Ensure element is ready
         WebDriverWait(driver, 10).until(
@@ -121,31 +188,30 @@ def safe_send_keys(element, text, driver, clear_first=True):
             and element.is_enabled()
             and element.get_attribute("readonly") is None
         )
-        
-        # Alternative clearing method
-        if clear_first:
-            current_value = element.get_attribute("value")
-            if current_value:
-                element.click()
-                element.send_keys(Keys.CONTROL + "a")
-                element.send_keys(Keys.DELETE)
-                WebDriverWait(driver, 3).until(
-                    lambda d: element.get_attribute("value") == ""
-                )
-        
-        # Type text with verification
-        for char in text:
-            element.click()
-            element.send_keys(char)
-            time.sleep(0.05)
+        expected = text if clear_first else (element.get_attribute("value") or "") + text
+        
+        if per_char:
+            # Alternative clearing method
+            if clear_first:
+                current_value = element.get_attribute("value")
+                if current_value:
+                    element.click()
+                    element.send_keys(Keys.CONTROL + "a")
+                    element.send_keys(Keys.DELETE)
+                    WebDriverWait(driver, 3).until(
+                        lambda d: element.get_attribute("value") == ""
+                    )
+            type_per_char(element, text, driver)
+        else:
+            fast_type(element, text, driver, clear_first)
             
         # Verify final text
         WebDriverWait(driver, 3).until(
-            lambda d: element.get_attribute("value") == text
+            lambda d: element.get_attribute("value") == expected
         )
         
     except Exception as e:
-        driver.execute_script(f"arguments[0].value = '{text}';", element)
+        driver.execute_script(SET_VALUE_JS, element, text)
         element.click()
         element.send_keys(" " + Keys.BACKSPACE)
         raise e
@@ -167,8 +233,8 @@ def test_search_accuracy(driver):
 
         )
 
-        driver.get_screenshot_as_file("headless_debug.png")
-        with open("headless_source.html", "w", encoding="utf-8") as f:
+        driver.get_screenshot_as_file(artifact_name("headless_debug.png"))
+        with open(artifact_name("headless_source.html"), "w", encoding="utf-8") as f:
             f.write(driver.page_source)
 
         search_box = ensure_interactable(search_box, driver)
@@ -206,7 +272,7 @@ def test_search_accuracy(driver):
         
         
     except Exception as e:
-        driver.save_screenshot("search_accuracy_error.png")
+        driver.save_screenshot(artifact_name("search_accuracy_error.png"))
         save_results("Search Accuracy", "Fail", str(e))
         raise
 
@@ -247,7 +313,7 @@ def test_special_characters_search(driver):
         # Type special characters
         search_box.click()
         safe_send_keys(search_box, "@#$%",driver, clear_first=False)
-        time.sleep(0.1)
+        wait_for_dom_quiet(driver, quiet_ms=300, timeout=5)
             
         # Verify no dropdown
         WebDriverWait(driver, 5).until(
@@ -321,4 +387,10 @@ def test_filter_by_rating(driver):
   
 
 if __name__ == "__main__":
-    pytest.main(["-v", "-s", "--html=report.html", "--self-contained-html", "--reruns=2", "--reruns-delay=5"])
\ No newline at end of file
+    args = ["-v", "-s", "--html=report.html", "--self-contained-html", "--reruns=2", "--reruns-delay=5"]
+    try:
+        import xdist  # noqa: F401
+        args += ["-n", "5"]
+    except ImportError:
+        pass
+    pytest.main(args)
\ No newline at end of file
@@ -0,0 +1,82 @@
+'''
+Slowest-first test ordering.
+
+Applies to the tests in automatedTests.py only; every other test keeps its
+place. Every run records how long each of them took (setup + call + teardown)
+in test_durations.json next to this file (gitignored). The next run starts the tests that were
+slowest last time first, and tests with no recorded time before everything
+else, so under pytest-xdist ("-n N") the long tests are not left to one worker
+at the end: wall-clock time approaches the duration of the slowest test.
+
+    pytest automatedTests.py -n 5                       # reorder from recorded timings
+    pytest automatedTests.py -n 5 --no-slowest-first    # collection order
+'''
+
+import json
+import os
+from collections import defaultdict
+
+DURATIONS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test_durations.json')
+ORDERED_MODULE = 'automatedTests.py'
+
+_config = None
+_run_durations = defaultdict(float)
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('slowest-first')
+    group.addoption('--no-slowest-first', action='store_true',
+                    help='keep collection order instead of running the slowest tests first')
+    group.addoption('--durations-file', default=DURATIONS_FILE,
+                    help='where test timings are read from and recorded to')
+
+
+def _load_durations(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def pytest_configure(config):
+    global _config
+    _config = config
+
+
+def _ordered(nodeid):
+    return nodeid.split('::', 1)[0].replace('\\', '/').split('/')[-1] == ORDERED_MODULE
+
+
+def pytest_collection_modifyitems(session, config, items):
+    if config.getoption('--no-slowest-first'):
+        return
+    slots = [index for index, item in enumerate(items) if _ordered(item.nodeid)]
+    if not slots:
+        return
+    durations = _load_durations(config.getoption('--durations-file'))
+    # Unknown tests first (they may well be slow), then by recorded time; xdist
+    # workers all read the same file, so their collections stay identical
+    ordered = sorted((items[index] for index in slots),
+                     key=lambda item: (item.nodeid in durations, -durations.get(item.nodeid, 0)))
+    for index, item in zip(slots, ordered):
+        items[index] = item
+
+
+def pytest_runtest_logreport(report):
+    # Under xdist the controller receives every worker's reports; record there only
+    if _config is not None and not hasattr(_config, 'workerinput') and _ordered(report.nodeid):
+        _run_durations[report.nodeid] += report.duration
+
+
+def pytest_sessionfinish(session):
+    config = session.config
+    if hasattr(config, 'workerinput') or not _run_durations:
+        return
+    path = config.getoption('--durations-file')
+    durations = _load_durations(path)
+    durations.update({nodeid: round(seconds, 3) for nodeid, seconds in _run_durations.items()})
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(durations, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
@@ -0,0 +1,300 @@
+'''
+Offline crawler benchmark.
+
+Serves a synthetic site (mock_site.py) from a local aiohttp server and runs each
+crawler against it in its own subprocess and temp directory, so the repo CSVs are
+never touched and CPU / peak RSS belong to that crawler alone (browser processes
+included).
+
+Recorded per crawler:
+    pages_crawled    distinct pages fetched (counted by the server)
+    page_requests    all page GETs, duplicates included
+    pages_per_s      pages_crawled / wall time
+    latency p50/p99  per-page fetch latency seen by the crawler (requests,
+                     aiohttp and Playwright page.goto are timed in the child)
+    cpu_s            user+sys CPU of the crawler process tree
+    peak_rss_mb      peak summed RSS of the crawler process tree
+
+Each invocation appends one run to the JSON output so runs can be compared over time.
+
+    python crawl_benchmark.py --pages 300 --latency-ms 30 --crawlers Ahref_Replica.WebCrawler,web_crawler.WebsiteCrawler
+'''
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from datetime import datetime
+from urllib.parse import urlsplit
+
+import psutil
+
+try:
+    import resource  # Unix only; elsewhere CPU comes from sampling the process tree with psutil
+except ImportError:
+    resource = None
+
+from crawl_metrics import Histogram
+from mock_site import MockSite, add_spec_arguments, spec_from_args, is_page_path
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# name -> (file, class, how to run it)
+CRAWLERS = {
+    'web_crawler.WebsiteCrawler': ('web_crawler.py', 'WebsiteCrawler', 'start_crawl'),
+    'from_playwright.WebsiteCrawler': ('from playwright.py', 'WebsiteCrawler', 'start_crawl'),
+    'AdvancedCrawler.AdvancedCrawler': ('AdvancedCrawler.py', 'AdvancedCrawler', 'async start_crawl'),
+    'AdvancedCrawler1.WebCrawler': ('AdvancedCrawler1.py', 'WebCrawler', 'async crawl'),
+    'MaxCrawl.UnlimitedCrawler': ('MaxCrawl.py', 'UnlimitedCrawler', 'async start_crawl'),
+    'Ahref_Replica.WebCrawler': ('Ahref_Replica.py', 'WebCrawler', 'async crawl'),
+}
+
+
+def _install_page_timers(latencies: Histogram):
+    """Time every page GET made through requests, aiohttp or Playwright"""
+    def is_page(url) -> bool:
+        return is_page_path(urlsplit(str(url)).path)
+
+    try:
+        import requests
+        original_request = requests.Session.request
+
+        def request(self, method, url, *args, **kwargs):
+            start = time.perf_counter()
+            response = original_request(self, method, url, *args, **kwargs)
+            if method.upper() == 'GET' and is_page(url):
+                latencies.record((time.perf_counter() - start) * 1_000_000)
+            return response
+        requests.Session.request = request
+    except ImportError:
+        pass
+
+    try:
+        import aiohttp
+        original_session_request = aiohttp.ClientSession._request
+        original_read = aiohttp.ClientResponse.read
+
+        async def _request(self, method, str_or_url, *args, **kwargs):
+            start = time.perf_counter()
+            response = await original_session_request(self, method, str_or_url, *args, **kwargs)
+            if method.upper() == 'GET' and is_page(str_or_url):
+                response._benchmark_start = start
+            return response
+
+        async def read(self):
+            body = await original_read(self)
+            start = getattr(self, '_benchmark_start', None)
+            if start is not None:
+                latencies.record((time.perf_counter() - start) * 1_000_000)
+                self._benchmark_start = None
+            return body
+        aiohttp.ClientSession._request = _request
+        aiohttp.ClientResponse.read = read
+    except ImportError:
+        pass
+
+    try:
+        from playwright.async_api import Page
+        original_goto = Page.goto
+
+        async def goto(self, url, *args, **kwargs):
+            start = time.perf_counter()
+            response = await original_goto(self, url, *args, **kwargs)
+            if is_page(url):
+                latencies.record((time.perf_counter() - start) * 1_000_000)
+            return response
+        Page.goto = goto
+    except ImportError:
+        pass
+
+
+def run_child(name: str, base_url: str, stats_file: str):
+    """Runs inside the crawler subprocess"""
+    latencies = Histogram()
+
+    def write_stats(*_):
+        with open(stats_file, 'w', encoding='utf-8') as f:
+            json.dump({
+                'latency_count': latencies.count,
+                'latency_p50_s': latencies.percentile(50) / 1e6,
+                'latency_p99_s': latencies.percentile(99) / 1e6,
+            }, f)
+
+    def on_term(*_):
+        write_stats()
+        os._exit(0)
+
+    signal.signal(signal.SIGTERM, on_term)
+    _install_page_timers(latencies)
+
+    file_name, class_name, how = CRAWLERS[name]
+    spec = importlib.util.spec_from_file_location(class_name.lower(), os.path.join(REPO_DIR, file_name))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    crawler = getattr(module, class_name)(base_url)
+
+    if how.startswith('async '):
+        asyncio.run(getattr(crawler, how.split()[1])())
+    else:
+        getattr(crawler, how)()
+    write_stats()
+
+
+def _tree(process: psutil.Process):
+    try:
+        return [process] + process.children(recursive=True)
+    except psutil.NoSuchProcess:
+        return []
+
+
+def run_crawler(name: str, site: MockSite, timeout: float) -> dict:
+    """Run one crawler in a subprocess against the mock site and collect its numbers"""
+    site.reset_stats()
+    workdir = tempfile.mkdtemp(prefix=f"bench_{name.split('.')[0]}_")
+    stats_file = os.path.join(workdir, 'child_stats.json')
+    env = dict(os.environ, PYTHONPATH=REPO_DIR + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    cmd = [sys.executable, os.path.abspath(__file__), '--child', name,
+           '--base-url', site.base_url, '--stats-file', stats_file]
+
+    usage_before = resource.getrusage(resource.RUSAGE_CHILDREN) if resource else None
+    started = time.perf_counter()
+    log_path = os.path.join(workdir, 'crawler.log')
+    log_file = open(log_path, 'w', encoding='utf-8')
+    child = subprocess.Popen(cmd, cwd=workdir, env=env, stdout=log_file, stderr=subprocess.STDOUT)
+    root = psutil.Process(child.pid)
+    peak_rss = 0
+    tree_cpu = {}
+    timed_out = False
+
+    while child.poll() is None:
+        rss = 0
+        for process in _tree(root):
+            try:
+                rss += process.memory_info().rss
+                cpu = process.cpu_times()
+                tree_cpu[process.pid] = cpu.user + cpu.system
+            except psutil.Error:
+                continue
+        peak_rss = max(peak_rss, rss)
+        if time.perf_counter() - started > timeout:
+            timed_out = True
+            for process in reversed(_tree(root)):
+                try:
+                    process.terminate()
+                except psutil.Error:
+                    pass
+            try:
+                child.wait(10)
+            except subprocess.TimeoutExpired:
+                child.kill()
+            break
+        time.sleep(0.1)
+
+    wall = time.perf_counter() - started
+    child.wait()
+    log_file.close()
+    rusage_cpu = 0.0
+    if resource:
+        usage_after = resource.getrusage(resource.RUSAGE_CHILDREN)
+        rusage_cpu = (usage_after.ru_utime - usage_before.ru_utime) + (usage_after.ru_stime - usage_before.ru_stime)
+
+    child_stats = {}
+    if os.path.exists(stats_file):
+        with open(stats_file, encoding='utf-8') as f:
+            child_stats = json.load(f)
+
+    pages = len(site.page_hits)
+    result = {
+        'exit_code': child.returncode,
+        'timed_out': timed_out,
+        'wall_s': round(wall, 2),
+        'pages_crawled': pages,
+        'page_requests': sum(site.page_hits.values()),
+        'total_requests': sum(site.requests.values()),
+        'pages_per_s': round(pages / wall, 2) if wall else 0,
+        'latency_p50_s': child_stats.get('latency_p50_s'),
+        'latency_p99_s': child_stats.get('latency_p99_s'),
+        'cpu_s': round(max(rusage_cpu, sum(tree_cpu.values())), 2),
+        'peak_rss_mb': round(peak_rss / 1024 / 1024, 1),
+    }
+    if child.returncode not in (0, None) and not timed_out:
+        with open(log_path, encoding='utf-8', errors='replace') as f:
+            lines = f.read().strip().splitlines()
+        result['error'] = lines[-1] if lines else 'crawler failed'
+        result['log'] = log_path
+    return result
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR,
+                              capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ''
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the crawlers against a local synthetic site')
+    add_spec_arguments(parser)
+    parser.add_argument('--crawlers', default=','.join(CRAWLERS),
+                        help=f"Comma separated subset of: {', '.join(CRAWLERS)}")
+    parser.add_argument('--timeout', type=float, default=600, help='Seconds per crawler')
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    parser.add_argument('--base-url', help=argparse.SUPPRESS)
+    parser.add_argument('--stats-file', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.base_url, args.stats_file)
+        return
+
+    names = [n.strip() for n in args.crawlers.split(',') if n.strip()]
+    unknown = [n for n in names if n not in CRAWLERS]
+    if unknown:
+        parser.error(f"Unknown crawlers: {', '.join(unknown)}")
+
+    spec = spec_from_args(args)
+    site = MockSite(spec)
+    base_url = site.start_background()
+    print(f"Mock site with {spec.pages} pages at {base_url}")
+
+    run = {
+        'timestamp': datetime.now().isoformat(),
+        'commit': _git_commit(),
+        'site': asdict(spec),
+        'results': {}
+    }
+    try:
+        for name in names:
+            print(f"Running {name}...")
+            result = run_crawler(name, site, args.timeout)
+            run['results'][name] = result
+            print(f"  {result['pages_crawled']} pages in {result['wall_s']}s "
+                  f"({result['pages_per_s']} pages/s), p50 {result['latency_p50_s'] or 0:.3f}s, "
+                  f"p99 {result['latency_p99_s'] or 0:.3f}s, CPU {result['cpu_s']}s, "
+                  f"peak RSS {result['peak_rss_mb']}MB"
+                  + (f" [error: {result['error']}]" if 'error' in result else '')
+                  + (' [timed out]' if result['timed_out'] else ''))
+    finally:
+        site.stop_background()
+
+    history = []
+    if os.path.exists(args.output):
+        with open(args.output, encoding='utf-8') as f:
+            history = json.load(f)
+    history.append(run)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(history, f, indent=2)
+    print(f"Results appended to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,218 @@
+'''
+Per-stage crawl metrics.
+
+Stages recorded by the crawlers:
+    dns, connect, ttfb     - aiohttp TraceConfig hooks (ttfb is request start -> headers)
+    download               - reading the response body
+    parse                  - building the BeautifulSoup tree
+    analysis               - SEO/CTA/heading/responsive extraction
+    image_check            - HEAD requests for images (network, kept out of analysis)
+    queue_wait             - time a URL sat in the frontier before being picked up
+    sink_write             - CSV batch writes
+
+Each stage goes into a fixed-size log-linear Histogram (HDR-style: constant
+memory, O(1) record, <2% relative error). Snapshots are exposed as JSON
+(write_snapshot / run_snapshots) or Prometheus text (prometheus_text / serve).
+'''
+
+import asyncio
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+
+STAGES = ['dns', 'connect', 'ttfb', 'download', 'parse', 'analysis',
+          'image_check', 'queue_wait', 'sink_write']
+PERCENTILES = [50, 90, 99, 99.9]
+
+
+class Histogram:
+    """Log-linear histogram of integer microsecond values"""
+
+    def __init__(self, sub_bucket_bits: int = 7, max_value_us: int = 3600 * 1_000_000):
+        # Values below 2**bits are counted exactly; above that every power-of-two
+        # range is split into 2**(bits-1) equal sub-buckets
+        self.sub_bucket_bits = sub_bucket_bits
+        self.linear_count = 1 << sub_bucket_bits
+        self.half_count = self.linear_count >> 1
+        exponents = max(0, max_value_us.bit_length() - sub_bucket_bits)
+        self.max_trackable = max_value_us
+        self.counts = [0] * (self.linear_count + exponents * self.half_count)
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+    def _index(self, value: int) -> int:
+        if value < self.linear_count:
+            return value
+        exponent = value.bit_length() - self.sub_bucket_bits
+        return self.linear_count + (exponent - 1) * self.half_count + (value >> exponent) - self.half_count
+
+    def _value_at(self, index: int) -> int:
+        """Upper bound of the bucket at index"""
+        if index < self.linear_count:
+            return index
+        exponent, sub = divmod(index - self.linear_count, self.half_count)
+        exponent += 1
+        return ((sub + self.half_count + 1) << exponent) - 1
+
+    def record(self, value_us: int):
+        value_us = min(max(int(value_us), 0), self.max_trackable)
+        self.counts[self._index(value_us)] += 1
+        self.count += 1
+        self.total += value_us
+        self.max = max(self.max, value_us)
+        self.min = value_us if self.min is None else min(self.min, value_us)
+
+    def percentile(self, pct: float) -> int:
+        if not self.count:
+            return 0
+        target = max(1, int(round(self.count * pct / 100)))
+        seen = 0
+        for index, bucket in enumerate(self.counts):
+            if bucket:
+                seen += bucket
+                if seen >= target:
+                    return min(self._value_at(index), self.max)
+        return self.max
+
+    def summary(self) -> Dict:
+        """Summary in seconds"""
+        return {
+            'count': self.count,
+            'sum': self.total / 1e6,
+            'mean': (self.total / self.count / 1e6) if self.count else 0,
+            'min': (self.min or 0) / 1e6,
+            'max': self.max / 1e6,
+            **{f'p{p:g}': self.percentile(p) / 1e6 for p in PERCENTILES}
+        }
+
+
+class CrawlMetrics:
+    def __init__(self, stages: List[str] = STAGES):
+        self.histograms: Dict[str, Histogram] = {name: Histogram() for name in stages}
+        self.counters: Dict[str, int] = {}
+        self.started = time.time()
+
+    def record(self, stage: str, seconds: float):
+        histogram = self.histograms.get(stage)
+        if histogram is None:
+            histogram = self.histograms[stage] = Histogram()
+        histogram.record(seconds * 1_000_000)
+
+    def increment(self, name: str, amount: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time the enclosed block into the named stage"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def trace_config(self):
+        """aiohttp TraceConfig recording dns, connect and ttfb"""
+        import aiohttp
+
+        async def on_request_start(session, ctx, params):
+            ctx.request_start = time.perf_counter()
+
+        async def on_dns_start(session, ctx, params):
+            ctx.dns_start = time.perf_counter()
+
+        async def on_dns_end(session, ctx, params):
+            self.record('dns', time.perf_counter() - ctx.dns_start)
+
+        async def on_connect_start(session, ctx, params):
+            ctx.connect_start = time.perf_counter()
+
+        async def on_connect_end(session, ctx, params):
+            self.record('connect', time.perf_counter() - ctx.connect_start)
+
+        async def on_request_end(session, ctx, params):
+            self.record('ttfb', time.perf_counter() - ctx.request_start)
+
+        async def on_request_exception(session, ctx, params):
+            self.increment('request_exceptions')
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_dns_resolvehost_start.append(on_dns_start)
+        trace_config.on_dns_resolvehost_end.append(on_dns_end)
+        trace_config.on_connection_create_start.append(on_connect_start)
+        trace_config.on_connection_create_end.append(on_connect_end)
+        trace_config.on_request_end.append(on_request_end)
+        trace_config.on_request_exception.append(on_request_exception)
+        return trace_config
+
+    def snapshot(self) -> Dict:
+        return {
+            'timestamp': datetime.now().isoformat(),
+            'uptime_s': round(time.time() - self.started, 1),
+            'counters': dict(self.counters),
+            'stages': {name: h.summary() for name, h in self.histograms.items() if h.count}
+        }
+
+    def write_snapshot(self, path: str):
+        """Atomically replace path with the current JSON snapshot"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.snapshot(), f, indent=2)
+        os.replace(tmp_path, path)
+
+    async def run_snapshots(self, path: str, interval: float = 10.0):
+        """Write a JSON snapshot every interval seconds until cancelled"""
+        try:
+            while True:
+                await asyncio.sleep(interval)
+                self.write_snapshot(path)
+        finally:
+            self.write_snapshot(path)
+
+    def prometheus_text(self) -> str:
+        lines = ['# HELP crawl_stage_seconds Time spent per crawl stage',
+                 '# TYPE crawl_stage_seconds summary']
+        for name, histogram in self.histograms.items():
+            for pct in PERCENTILES:
+                lines.append(f'crawl_stage_seconds{{stage="{name}",quantile="{pct / 100:g}"}} '
+                             f'{histogram.percentile(pct) / 1e6:.6f}')
+            lines.append(f'crawl_stage_seconds_sum{{stage="{name}"}} {histogram.total / 1e6:.6f}')
+            lines.append(f'crawl_stage_seconds_count{{stage="{name}"}} {histogram.count}')
+        for name, value in self.counters.items():
+            lines.append(f'# TYPE crawl_{name}_total counter')
+            lines.append(f'crawl_{name}_total {value}')
+        return '\n'.join(lines) + '\n'
+
+    async def serve(self, port: int, host: str = '0.0.0.0'):
+        """Start a /metrics endpoint; returns the aiohttp runner so callers can clean it up"""
+        from aiohttp import web
+
+        async def handle(request):
+            return web.Response(text=self.prometheus_text(), content_type='text/plain')
+
+        app = web.Application()
+        app.router.add_get('/metrics', handle)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        await web.TCPSite(runner, host, port).start()
+        logging.info(f"Serving Prometheus metrics on http://{host}:{port}/metrics")
+        return runner
+
+    def bottleneck(self) -> Optional[str]:
+        """Rough network/cpu/disk verdict from the stage totals"""
+        def total(*names):
+            return sum(self.histograms[n].total for n in names if n in self.histograms)
+        buckets = {
+            'network': total('dns', 'connect', 'ttfb', 'download', 'image_check'),
+            'cpu': total('parse', 'analysis'),
+            'disk': total('sink_write')
+        }
+        if not any(buckets.values()):
+            return None
+        return max(buckets, key=buckets.get)
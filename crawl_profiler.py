@@ -0,0 +1,112 @@
+'''
+Low-overhead sampling profiler for crawler runs (--profile on the entry points).
+
+A background thread samples the main thread's Python stack every few
+milliseconds via sys._current_frames(). When the sampled thread is running an
+asyncio event loop, the stack is prefixed with the coroutine of the task being
+executed ("task:WebCrawler.process_url"), so time is attributed per task type
+rather than to the event loop.
+
+Output is the collapsed-stack format ("frame;frame;frame count") used by
+py-spy --format raw, flamegraph.pl and speedscope.
+'''
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Optional
+
+MAX_DEPTH = 128
+
+
+def profile_path_for(results_file: str) -> str:
+    """crawl_report.csv -> crawl_report.profile.folded"""
+    return f"{os.path.splitext(results_file)[0]}.profile.folded"
+
+
+class SamplingProfiler:
+    def __init__(self, interval: float = 0.005, thread_id: Optional[int] = None):
+        self.interval = interval
+        self.thread_id = thread_id or threading.main_thread().ident
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._labels = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            name = getattr(code, 'co_qualname', code.co_name)
+            label = self._labels[code] = f"{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+        return label
+
+    def _current_task(self) -> Optional[str]:
+        """Coroutine name of the asyncio task running on the sampled thread"""
+        current_tasks = getattr(asyncio.tasks, '_current_tasks', None)
+        if not current_tasks:
+            return None
+        for loop, task in list(current_tasks.items()):
+            if getattr(loop, '_thread_id', None) == self.thread_id and task is not None:
+                coro = task.get_coro()
+                return getattr(coro, '__qualname__', None) or task.get_name()
+        return None
+
+    def _sample(self):
+        frame = sys._current_frames().get(self.thread_id)
+        if frame is None:
+            return
+        stack = []
+        while frame is not None and len(stack) < MAX_DEPTH:
+            stack.append(self._label(frame.f_code))
+            frame = frame.f_back
+        stack.reverse()
+        task = self._current_task()
+        if task:
+            stack.insert(0, f"task:{task}")
+        self.stacks[';'.join(stack)] += 1
+        self.samples += 1
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self._sample()
+            except Exception as e:  # Never take the crawl down because of the profiler
+                logging.debug(f"Profiler sample failed: {str(e)}")
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def write_collapsed(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+@contextmanager
+def profiling(output_path: str, enabled: bool = True, interval: float = 0.005):
+    """Profile the enclosed block and write a collapsed-stack file to output_path"""
+    if not enabled:
+        yield None
+        return
+    profiler = SamplingProfiler(interval=interval)
+    profiler.start()
+    started = time.time()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        profiler.write_collapsed(output_path)
+        logging.info(f"Profile: {profiler.samples:,} samples over {time.time() - started:.1f}s "
+                     f"written to {output_path} (render with flamegraph.pl or speedscope)")
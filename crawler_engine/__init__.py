@@ -0,0 +1,23 @@
+'''
+Shared crawl engine: fetcher layer, scheduler and analyzer plugins.
+
+    from crawler_engine import CrawlEngine, build_analyzers
+    engine = CrawlEngine('https://softwarefinder.com', build_analyzers(['seo', 'cta', 'headings']))
+    asyncio.run(engine.crawl())
+
+The engine fetches with the cheapest transport the enabled analyzers allow:
+plain HTTP for tree-only analyzers, Playwright only when one needs a live page.
+'''
+
+from .analyzers import (Analyzer, ANALYZERS, AltTagAnalyzer, BrokenImageAnalyzer, CtaAnalyzer,
+                        HeadingAnalyzer, JsErrorAnalyzer, LinkAnalyzer, MetaTagAnalyzer,
+                        ResponsivenessAnalyzer, SeoAnalyzer, analyzers_for_columns, build_analyzers,
+                        required_level)
+from .engine import CrawlEngine
+from .fetchers import AiohttpFetcher, Fetcher, FETCHERS, PlaywrightFetcher, RequestsFetcher, fetcher_for
+from .page import Needs, PageData
+from .render_profile import LoadWatcher, PROFILES, RenderProfile, profile_for
+from .resource_cache import ResourceStatusCache
+from .scheduler import Scheduler
+from .single_flight import SingleFlight
+from .sinks import CsvSink
@@ -0,0 +1,65 @@
+import argparse
+import asyncio
+import logging
+
+from crawl_profiler import profiling, profile_path_for
+
+from .analyzers import ANALYZERS, BrokenImageAnalyzer, analyzers_for_columns, build_analyzers
+from .engine import CrawlEngine
+from .fetchers import FETCHERS
+from .resource_cache import ResourceStatusCache
+
+DEFAULT_ANALYZERS = 'seo,alt_tags,images,meta,cta,headings'
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m crawler_engine', description='Crawl a site with the shared engine')
+    parser.add_argument('base_url')
+    parser.add_argument('--analyzers', default=DEFAULT_ANALYZERS,
+                        help=f"Comma separated subset of: {', '.join(ANALYZERS)}")
+    parser.add_argument('--columns', help='Comma separated CSV columns to fill; runs only the analyzers '
+                                          'behind them (overrides --analyzers)')
+    parser.add_argument('--http', choices=[name for name in FETCHERS if name != 'playwright'], default='aiohttp',
+                        help='Transport when no analyzer needs a live page')
+    parser.add_argument('--concurrency', type=int, default=20)
+    parser.add_argument('--max-pages', type=int)
+    parser.add_argument('--output', default='crawl_report_engine.csv')
+    parser.add_argument('--ignore-robots', action='store_true')
+    parser.add_argument('--image-cache', help='JSON file keeping image check results between runs')
+    parser.add_argument('--metrics-json', help='Write per-stage timing snapshots to this JSON file')
+    parser.add_argument('--profile', action='store_true',
+                        help='Sample the crawl and write a collapsed-stack flamegraph file next to the CSV')
+    args = parser.parse_args()
+
+    try:
+        if args.columns:
+            analyzers = analyzers_for_columns([name.strip() for name in args.columns.split(',') if name.strip()])
+        else:
+            analyzers = build_analyzers([name.strip() for name in args.analyzers.split(',') if name.strip()])
+    except ValueError as e:
+        parser.error(str(e))
+    if args.image_cache:
+        for analyzer in analyzers:
+            if isinstance(analyzer, BrokenImageAnalyzer):
+                analyzer.cache = ResourceStatusCache(path=args.image_cache)
+
+    try:
+        engine = CrawlEngine(args.base_url, analyzers, http_backend=args.http, concurrency=args.concurrency,
+                             max_pages=args.max_pages, output_file=args.output,
+                             respect_robots=not args.ignore_robots)
+    except ValueError as e:
+        parser.error(str(e))
+    with profiling(profile_path_for(args.output), enabled=args.profile):
+        asyncio.run(engine.crawl())
+    if args.metrics_json:
+        engine.metrics.write_snapshot(args.metrics_json)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,243 @@
+'''
+Analyzer plugin API and the built-in analyzers.
+
+An analyzer declares:
+    name      key used on the command line (--analyzers seo,images)
+    needs     Needs.RAW / TREE / LIVE - the engine picks the cheapest fetcher
+              that covers every enabled analyzer
+    columns   CSV columns it fills
+    stage     CrawlMetrics stage its time is recorded under
+    render    resource kinds a LIVE analyzer needs the browser to load
+              (stylesheet, image, font, media); everything nobody needs is
+              stubbed by the render profile
+    live_scripts
+              True if trackers and third-party scripts must run unstubbed
+              (their console errors are what the analyzer reports)
+
+and implements `async analyze(page, fetcher) -> dict` returning values for its
+columns, plus optionally `async close()` for end-of-crawl cleanup. Column names follow the crawl_report2.csv schema used by the dashboard.
+
+Register a new analyzer by subclassing Analyzer and adding it to ANALYZERS.
+'''
+
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Type
+from urllib.parse import urljoin, urlparse
+
+from .page import Needs, PageData
+from .resource_cache import ResourceStatusCache
+
+
+class Analyzer(ABC):
+    name = ''
+    needs = Needs.TREE
+    columns: List[str] = []
+    stage = 'analysis'
+    render: frozenset = frozenset()
+    live_scripts = False
+
+    @abstractmethod
+    async def analyze(self, page: PageData, fetcher) -> Dict[str, object]:
+        ...
+
+    async def close(self):
+        pass
+
+
+class SeoAnalyzer(Analyzer):
+    name = 'seo'
+    columns = ['Seo issues']
+
+    async def analyze(self, page, fetcher):
+        soup = page.soup
+        issues = []
+        if not soup.find('title'):
+            issues.append("Missing title tag")
+        meta_desc = soup.find('meta', attrs={'name': 'description'})
+        if not meta_desc or not meta_desc.get('content', '').strip():
+            issues.append("Missing/invalid meta description")
+        h1_count = len(soup.find_all('h1'))
+        if h1_count == 0:
+            issues.append("Missing H1")
+        elif h1_count > 1:
+            issues.append("Multiple H1 tags")
+        return {'Seo issues': '; '.join(issues) if issues else 'null'}
+
+
+class MetaTagAnalyzer(Analyzer):
+    name = 'meta'
+    columns = ['meta tags']
+
+    async def analyze(self, page, fetcher):
+        meta_tags = {meta.get('name', meta.get('property', 'unknown')): meta.get('content', '')
+                     for meta in page.soup.find_all('meta')}
+        return {'meta tags': str(meta_tags)[:500]}
+
+
+class HeadingAnalyzer(Analyzer):
+    name = 'headings'
+    columns = ['heading tags']
+
+    async def analyze(self, page, fetcher):
+        counts = {f'h{i}': 0 for i in range(1, 7)}
+        for heading in page.soup.find_all(list(counts)):
+            counts[heading.name] += 1
+        return {'heading tags': str(counts)}
+
+
+class AltTagAnalyzer(Analyzer):
+    name = 'alt_tags'
+    columns = ['alt tags']
+
+    async def analyze(self, page, fetcher):
+        missing = sum(1 for img in page.soup.find_all('img') if not img.get('alt'))
+        return {'alt tags': f"Missing alt: {missing} images" if missing else 'null'}
+
+
+class BrokenImageAnalyzer(Analyzer):
+    """HEAD-checks the page's images; by far the most expensive analyzer per page"""
+    name = 'images'
+    columns = ['Broken images']
+    stage = 'image_check'
+
+    def __init__(self, max_images: int = 0, expected_format: str = 'avif', concurrency: int = 10,
+                 cache: Optional[ResourceStatusCache] = None):
+        self.max_images = max_images  # 0 = all
+        self.expected_format = expected_format
+        self.concurrency = concurrency
+        self.cache = cache or ResourceStatusCache()
+
+    async def _check(self, url: str, fetcher, semaphore: asyncio.Semaphore):
+        async with semaphore:
+            try:
+                status, content_type = await self.cache.get(url, fetcher.head)
+            except Exception as e:
+                return f"Error: {str(e)}"
+        if status >= 400:
+            return f"Broken: {status}"
+        if self.expected_format and self.expected_format not in content_type:
+            return f"Invalid format: {content_type}"
+        return None
+
+    async def analyze(self, page, fetcher):
+        images = list(dict.fromkeys(urljoin(page.url, img['src'])
+                                    for img in page.soup.find_all('img', src=True)))
+        if self.max_images:
+            images = images[:self.max_images]
+        semaphore = asyncio.Semaphore(self.concurrency)
+        problems = [p for p in await asyncio.gather(*(self._check(u, fetcher, semaphore) for u in images)) if p]
+        return {'Broken images': '; '.join(problems) if problems else 'null'}
+
+    async def close(self):
+        self.cache.save()
+        logging.info(f"Image status cache: {self.cache.stats()}")
+
+
+class LinkAnalyzer(Analyzer):
+    name = 'links'
+    columns = ['Internal links', 'External links']
+
+    async def analyze(self, page, fetcher):
+        host = urlparse(page.url).netloc
+        internal = external = 0
+        for a in page.soup.find_all('a', href=True):
+            href = a['href']
+            if href.startswith(('#', 'mailto:', 'tel:', 'javascript:')):
+                continue
+            if urlparse(urljoin(page.url, href)).netloc == host:
+                internal += 1
+            else:
+                external += 1
+        return {'Internal links': internal, 'External links': external}
+
+
+class CtaAnalyzer(Analyzer):
+    name = 'cta'
+    columns = ['CTA Internal links']
+
+    async def analyze(self, page, fetcher):
+        cta_links = [urljoin(page.url, a['href']) for a in page.soup.find_all('a', href=True)
+                     if any(cls in ('cta', 'button') for cls in a.get('class', []))]
+        return {'CTA Internal links': '; '.join(cta_links) if cta_links else 'null'}
+
+
+class ResponsivenessAnalyzer(Analyzer):
+    name = 'responsiveness'
+    needs = Needs.LIVE
+    columns = ['responsiveness issues', 'device type']
+    render = frozenset({'stylesheet', 'image'})
+
+    DEVICES = [
+        {"name": "Mobile", "viewport": {"width": 375, "height": 667}},
+        {"name": "Tablet", "viewport": {"width": 768, "height": 1024}},
+        {"name": "Desktop", "viewport": {"width": 1366, "height": 768}}
+    ]
+    SCRIPT = '''() => {
+        const width = window.innerWidth;
+        const issues = new Set();
+        for (const el of document.body.getElementsByTagName('*')) {
+            if (el.getBoundingClientRect().right > width || el.offsetWidth > width) {
+                issues.add(`${el.tagName} overflow detected`);
+            }
+        }
+        return Array.from(issues);
+    }'''
+
+    def __init__(self, devices: List[dict] = None):
+        self.devices = devices or self.DEVICES
+
+    async def analyze(self, page, fetcher):
+        issues = {}
+        # Viewports are per page, so devices run one after another
+        for device in self.devices:
+            await page.page.set_viewport_size(device["viewport"])
+            found = await page.page.evaluate(self.SCRIPT)
+            if found:
+                issues[device["name"]] = found
+        return {
+            'responsiveness issues': str(issues) if issues else 'null',
+            'device type': ', '.join(issues) if issues else 'null'
+        }
+
+
+class JsErrorAnalyzer(Analyzer):
+    name = 'js_errors'
+    needs = Needs.LIVE
+    columns = ['Js error', 'warnings']
+    live_scripts = True
+
+    async def analyze(self, page, fetcher):
+        return {
+            'Js error': '; '.join(page.js_errors)[:500] if page.js_errors else 'null',
+            'warnings': f"Mixed content: {len(page.insecure_requests)} items" if page.insecure_requests else 'null'
+        }
+
+
+ANALYZERS: Dict[str, Type[Analyzer]] = {cls.name: cls for cls in [
+    SeoAnalyzer, MetaTagAnalyzer, HeadingAnalyzer, AltTagAnalyzer, BrokenImageAnalyzer,
+    LinkAnalyzer, CtaAnalyzer, ResponsivenessAnalyzer, JsErrorAnalyzer
+]}
+
+
+def build_analyzers(names: List[str]) -> List[Analyzer]:
+    unknown = [name for name in names if name not in ANALYZERS]
+    if unknown:
+        raise ValueError(f"Unknown analyzers: {', '.join(unknown)} (available: {', '.join(ANALYZERS)})")
+    return [ANALYZERS[name]() for name in names]
+
+
+def analyzers_for_columns(columns: List[str]) -> List[Analyzer]:
+    """Only the analyzers that fill at least one requested column; the rest never run"""
+    wanted = set(columns)
+    known = {column for cls in ANALYZERS.values() for column in cls.columns}
+    unknown = wanted - known - {'Url', 'status code', 'notices', 'date', 'time'}
+    if unknown:
+        raise ValueError(f"Unknown columns: {', '.join(sorted(unknown))} (available: {', '.join(sorted(known))})")
+    return [cls() for cls in ANALYZERS.values() if wanted.intersection(cls.columns)]
+
+
+def required_level(analyzers: List[Analyzer]) -> Needs:
+    """Cheapest fetch covering every analyzer; link discovery always needs the tree"""
+    return max([Needs.TREE] + [analyzer.needs for analyzer in analyzers])
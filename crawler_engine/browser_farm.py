@@ -0,0 +1,222 @@
+'''
+Farm of K headless Chromium instances for rendered crawls.
+
+A single browser/context serving every concurrent page becomes both the
+throughput ceiling and a single point of failure. BrowserFarm instead runs K
+browsers, each with its own Playwright driver process, so rendering spreads
+across cores:
+
+    - pages go to the healthy browser with the fewest open pages
+    - a background health check probes every browser and restarts the ones that
+      disconnected or stopped responding
+    - when a browser dies mid-page, farm.page() raises BrowserCrashed so the
+      caller can requeue the URL (should_retry() caps the attempts per URL)
+
+    farm = BrowserFarm(size=4, pages_per_browser=5, on_context=profile.apply)
+    await farm.start()
+    try:
+        async with farm.page(url) as page:
+            await page.goto(url)
+    except BrowserCrashed:
+        if farm.should_retry(url):
+            queue.append(url)
+'''
+
+import asyncio
+import logging
+import os
+from collections import Counter
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, Dict, List, Optional
+
+
+class BrowserCrashed(Exception):
+    """The browser rendering a page died; the URL should be requeued"""
+
+
+class _Slot:
+    def __init__(self, index: int):
+        self.index = index
+        self.playwright = None
+        self.browser = None
+        self.context = None
+        self.generation = 0
+        self.healthy = False
+        self.active = 0
+        self.served = 0
+        self.restarts = 0
+        self.lock = asyncio.Lock()
+
+
+def default_size() -> int:
+    """One browser per two cores, at least one"""
+    return max(1, (os.cpu_count() or 2) // 2)
+
+
+class BrowserFarm:
+    def __init__(self, size: Optional[int] = None, pages_per_browser: int = 5,
+                 launch_options: Optional[Dict] = None, context_options: Optional[Dict] = None,
+                 on_context: Optional[Callable[[object], Awaitable]] = None,
+                 health_interval: float = 15.0, probe_timeout: float = 10.0, max_retries: int = 2):
+        self.size = size or default_size()
+        self.pages_per_browser = pages_per_browser
+        self.launch_options = launch_options or {'headless': True}
+        self.context_options = context_options or {}
+        self.on_context = on_context
+        self.health_interval = health_interval
+        self.probe_timeout = probe_timeout
+        self.max_retries = max_retries
+        self.slots: List[_Slot] = [_Slot(i) for i in range(self.size)]
+        self.attempts: Counter = Counter()
+        self.crashes = 0
+        self._capacity: Optional[asyncio.Semaphore] = None
+        self._health_task: Optional[asyncio.Task] = None
+        self._restart_tasks = set()
+        self._closing = False
+
+    async def start(self):
+        self._capacity = asyncio.Semaphore(self.size * self.pages_per_browser)
+        await asyncio.gather(*(self._launch(slot) for slot in self.slots))
+        self._health_task = asyncio.create_task(self._health_loop())
+        logging.info(f"Browser farm started: {self.size} browsers x {self.pages_per_browser} pages")
+
+    async def _shutdown_slot(self, slot: _Slot):
+        for closer in (slot.context and slot.context.close, slot.browser and slot.browser.close,
+                       slot.playwright and slot.playwright.stop):
+            if closer:
+                try:
+                    await closer()
+                except Exception:
+                    pass
+        slot.context = slot.browser = slot.playwright = None
+
+    async def _launch(self, slot: _Slot):
+        from playwright.async_api import async_playwright
+
+        async with slot.lock:
+            slot.healthy = False
+            await self._shutdown_slot(slot)
+            slot.playwright = await async_playwright().start()
+            slot.browser = await slot.playwright.chromium.launch(**self.launch_options)
+            slot.context = await slot.browser.new_context(**self.context_options)
+            if self.on_context:
+                await self.on_context(slot.context)
+            slot.generation += 1
+            generation = slot.generation
+            slot.browser.on('disconnected', lambda _: self._on_disconnect(slot, generation))
+            slot.healthy = True
+
+    def _on_disconnect(self, slot: _Slot, generation: int):
+        if self._closing or generation != slot.generation or not slot.healthy:
+            return
+        logging.warning(f"Browser {slot.index} disconnected")
+        self._schedule_restart(slot)
+
+    def _schedule_restart(self, slot: _Slot):
+        slot.healthy = False
+        task = asyncio.create_task(self._restart(slot))
+        self._restart_tasks.add(task)
+        task.add_done_callback(self._restart_tasks.discard)
+
+    async def _restart(self, slot: _Slot):
+        self.crashes += 1
+        slot.restarts += 1
+        try:
+            await self._launch(slot)
+            logging.info(f"Browser {slot.index} restarted ({slot.restarts} restarts)")
+        except Exception as e:
+            logging.error(f"Browser {slot.index} failed to restart: {str(e)}")
+            await asyncio.sleep(5)
+            if not self._closing:
+                self._schedule_restart(slot)
+
+    async def _probe(self, slot: _Slot) -> bool:
+        if not slot.browser or not slot.browser.is_connected():
+            return False
+        try:
+            page = await asyncio.wait_for(slot.context.new_page(), self.probe_timeout)
+            await asyncio.wait_for(page.evaluate('1'), self.probe_timeout)
+            await page.close()
+            return True
+        except Exception:
+            return False
+
+    async def _health_loop(self):
+        while not self._closing:
+            await asyncio.sleep(self.health_interval)
+            for slot in self.slots:
+                if slot.healthy and not await self._probe(slot):
+                    logging.warning(f"Browser {slot.index} failed its health check, restarting")
+                    self._schedule_restart(slot)
+
+    def _pick(self) -> Optional[_Slot]:
+        healthy = [slot for slot in self.slots if slot.healthy]
+        if not healthy:
+            return None
+        return min(healthy, key=lambda slot: (slot.active, slot.served))
+
+    @asynccontextmanager
+    async def page(self, url: str = ''):
+        """A fresh page on the least loaded healthy browser; closed on exit"""
+        async with self._capacity:
+            slot = self._pick()
+            while slot is None:
+                if self._closing:
+                    raise BrowserCrashed(url)
+                await asyncio.sleep(0.1)
+                slot = self._pick()
+            generation = slot.generation
+            slot.active += 1
+            page = None
+
+            def crashed() -> bool:
+                return generation != slot.generation or not slot.browser or not slot.browser.is_connected()
+
+            try:
+                try:
+                    page = await slot.context.new_page()
+                except Exception as e:
+                    if crashed():
+                        raise BrowserCrashed(url) from e
+                    raise
+                yield page
+            except BrowserCrashed:
+                raise
+            except Exception as e:
+                if crashed():
+                    raise BrowserCrashed(url) from e
+                raise
+            finally:
+                slot.active -= 1
+                slot.served += 1
+                if page is not None and not crashed():
+                    try:
+                        await page.close()
+                    except Exception:
+                        pass
+            # The caller may have swallowed the error a dying browser caused
+            if crashed():
+                raise BrowserCrashed(url)
+
+    def should_retry(self, url: str) -> bool:
+        """Count a crash for url; False once it has used up max_retries"""
+        self.attempts[url] += 1
+        return self.attempts[url] <= self.max_retries
+
+    def stats(self) -> Dict:
+        return {
+            'browsers': self.size,
+            'crashes': self.crashes,
+            'served': [slot.served for slot in self.slots],
+            'restarts': [slot.restarts for slot in self.slots],
+        }
+
+    async def close(self):
+        self._closing = True
+        if self._health_task:
+            self._health_task.cancel()
+            await asyncio.gather(self._health_task, return_exceptions=True)
+        for task in list(self._restart_tasks):
+            task.cancel()
+        await asyncio.gather(*self._restart_tasks, return_exceptions=True)
+        await asyncio.gather(*(self._shutdown_slot(slot) for slot in self.slots))
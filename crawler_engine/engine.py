@@ -0,0 +1,142 @@
+'''
+CrawlEngine ties the pieces together: a Scheduler feeding a pool of workers,
+the cheapest Fetcher covering the enabled analyzers, and a CsvSink.
+'''
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from crawl_metrics import CrawlMetrics
+from robots import RobotsCache
+
+from .analyzers import Analyzer, required_level
+from .fetchers import Fetcher, fetcher_for
+from .page import Needs, PageData
+from .render_profile import RenderProfile
+from .scheduler import Scheduler
+from .sinks import CsvSink
+
+BASE_COLUMNS = ['Url', 'status code', 'notices']
+TIME_COLUMNS = ['date', 'time']
+
+
+class CrawlEngine:
+    def __init__(self, base_url: str, analyzers: List[Analyzer], fetcher: Optional[Fetcher] = None,
+                 http_backend: str = 'aiohttp', concurrency: int = 20, max_pages: Optional[int] = None,
+                 output_file: str = 'crawl_report_engine.csv', respect_robots: bool = True,
+                 metrics: Optional[CrawlMetrics] = None):
+        self.analyzers = analyzers
+        self.level = required_level(analyzers)
+        self.metrics = metrics or CrawlMetrics()
+        fetcher_options = {'trace_configs': [self.metrics.trace_config()]}
+        if self.level >= Needs.LIVE:
+            # Only load the resource kinds some enabled analyzer needs
+            fetcher_options['render_profile'] = RenderProfile(
+                'auto', allow=frozenset().union(*(a.render for a in analyzers)),
+                stub_trackers=not any(a.live_scripts for a in analyzers))
+        self.fetcher = fetcher or fetcher_for(self.level, http_backend, **fetcher_options)
+        if self.fetcher.level < self.level:
+            raise ValueError(f"{self.fetcher.name} fetcher cannot serve analyzers needing {self.level.name}")
+        self.robots = RobotsCache() if respect_robots else None
+        self.scheduler = Scheduler(base_url, max_pages=max_pages, robots=self.robots)
+        self.base_url = self.scheduler.base_url
+        self.concurrency = concurrency
+        self.columns = BASE_COLUMNS + [c for a in analyzers for c in a.columns] + TIME_COLUMNS
+        self.sink = CsvSink(output_file, self.columns, metrics=self.metrics)
+        self.pages = 0
+
+    def _new_row(self, url: str) -> Dict[str, object]:
+        now = datetime.now()
+        row = {column: 'null' for column in self.columns}
+        row.update({'Url': url, 'status code': 0,
+                    'date': now.strftime('%Y-%m-%d'), 'time': now.strftime('%H:%M:%S')})
+        return row
+
+    def _discover(self, page: PageData):
+        soup = page.soup
+        canonical = self.scheduler.canonicalizer.canonical_from_soup(soup, page.url)
+        if canonical and canonical != page.url:
+            # Crawl the canonical page itself; add() ignores it if already seen
+            self.scheduler.add(canonical)
+        base = page.final_url or page.url
+        self.scheduler.add_all((a['href'] for a in soup.find_all('a', href=True)), base)
+
+    async def process_url(self, url: str) -> Dict[str, object]:
+        row = self._new_row(url)
+        notices = []
+        page = None
+        fetch_failed = False
+        try:
+            if self.robots:
+                # Cheap while the cached rules are fresh; refetches them once expired
+                await self.fetcher.load_robots(self.robots, url)
+                await self.robots.wait(url)
+            with self.metrics.stage('download'):
+                page = await self.fetcher.fetch(url)
+            row['status code'] = page.status
+            if page.error:
+                notices.append(page.error)
+                fetch_failed = True
+            if page.ok and page.is_html:
+                with self.metrics.stage('parse'):
+                    page.soup
+                self._discover(page)
+                for analyzer in self.analyzers:
+                    try:
+                        with self.metrics.stage(analyzer.stage):
+                            row.update(await analyzer.analyze(page, self.fetcher))
+                    except Exception as e:
+                        notices.append(f"{analyzer.name}: {str(e)}")
+        except Exception as e:
+            notices.append(str(e))
+            fetch_failed = fetch_failed or page is None
+        finally:
+            if page is not None:
+                await self.fetcher.release(page)
+        if notices:
+            row['notices'] = '; '.join(notices)[:200]
+        if fetch_failed:
+            # Analyzer notices are findings about a fetched page, not failures
+            self.metrics.increment('failures')
+        self.metrics.increment('pages')
+        return row
+
+    async def _worker(self):
+        while True:
+            url, waited = await self.scheduler.get()
+            try:
+                self.metrics.record('queue_wait', waited)
+                self.sink.write(await self.process_url(url))
+                self.pages += 1
+                if self.pages % 50 == 0:
+                    logging.info(f"Crawled {self.pages} pages, {len(self.scheduler)} queued")
+            except Exception as e:
+                logging.error(f"Worker failed on {url}: {str(e)}")
+            finally:
+                self.scheduler.task_done()
+
+    async def crawl(self):
+        started = time.time()
+        logging.info(f"Crawling {self.base_url} with {self.fetcher.name} "
+                     f"({self.level.name}) for: {', '.join(a.name for a in self.analyzers) or 'links only'}")
+        await self.fetcher.start()
+        workers = []
+        try:
+            if self.robots:
+                await self.fetcher.load_robots(self.robots, self.base_url)
+            self.scheduler.add(self.base_url)
+            workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+            await self.scheduler.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            self.sink.close()
+            for analyzer in self.analyzers:
+                await analyzer.close()
+            await self.fetcher.close()
+        logging.info(f"Crawl completed: {self.pages} pages in {time.time() - started:.1f}s, "
+                     f"results in {self.sink.path}, bottleneck: {self.metrics.bottleneck()}")
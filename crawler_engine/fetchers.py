@@ -0,0 +1,230 @@
+'''
+Fetcher layer. One class per transport, cheapest first:
+
+    RequestsFetcher    requests in a thread pool (RAW/TREE)
+    AiohttpFetcher     aiohttp (RAW/TREE)
+    PlaywrightFetcher  headless Chromium (LIVE); HEAD checks and robots.txt
+                       still go over aiohttp
+
+All fetchers share the same async interface so the engine and analyzers never
+care which one is in use.
+'''
+
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from typing import Optional, Tuple
+from urllib.parse import urlparse
+
+import aiohttp
+
+from .page import Needs, PageData
+from .render_profile import LoadWatcher, RenderProfile, PROFILES
+
+USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+              '(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36')
+
+
+class Fetcher(ABC):
+    level = Needs.TREE
+    name = ''
+
+    def __init__(self, timeout: float = 30, user_agent: str = USER_AGENT, max_connections: int = 100,
+                 trace_configs: Optional[list] = None):
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self.max_connections = max_connections
+        self.trace_configs = trace_configs or []
+
+    async def start(self):
+        pass
+
+    async def close(self):
+        pass
+
+    @abstractmethod
+    async def fetch(self, url: str) -> PageData:
+        ...
+
+    @abstractmethod
+    async def head(self, url: str) -> Tuple[int, str]:
+        """(status, content type) of url"""
+
+    @abstractmethod
+    async def load_robots(self, robots, url: str):
+        ...
+
+    async def release(self, page: PageData):
+        page.release()
+
+
+class AiohttpFetcher(Fetcher):
+    name = 'aiohttp'
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.session: Optional[aiohttp.ClientSession] = None
+
+    async def start(self):
+        connector = aiohttp.TCPConnector(limit=self.max_connections, ttl_dns_cache=300)
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            headers={'User-Agent': self.user_agent},
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            trace_configs=self.trace_configs
+        )
+
+    async def close(self):
+        if self.session:
+            await self.session.close()
+            self.session = None
+
+    async def fetch(self, url: str) -> PageData:
+        started = time.perf_counter()
+        try:
+            async with self.session.get(url, allow_redirects=True) as response:
+                html = await response.text(errors='replace')
+                return PageData(url=url, status=response.status, html=html,
+                                headers=dict(response.headers), final_url=str(response.url),
+                                fetch_seconds=time.perf_counter() - started)
+        except Exception as e:
+            return PageData(url=url, error=f"{type(e).__name__}: {str(e)}",
+                            fetch_seconds=time.perf_counter() - started)
+
+    async def head(self, url: str) -> Tuple[int, str]:
+        async with self.session.head(url, allow_redirects=True) as response:
+            return response.status, response.headers.get('Content-Type', '')
+
+    async def load_robots(self, robots, url: str):
+        return await robots.fetch(self.session, url)
+
+
+class RequestsFetcher(Fetcher):
+    name = 'requests'
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.session = None
+
+    async def start(self):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = self.user_agent
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=self.max_connections)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    async def close(self):
+        if self.session:
+            self.session.close()
+            self.session = None
+
+    def _fetch_sync(self, url: str) -> PageData:
+        started = time.perf_counter()
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+            return PageData(url=url, status=response.status_code, html=response.text,
+                            headers=dict(response.headers), final_url=response.url,
+                            fetch_seconds=time.perf_counter() - started)
+        except Exception as e:
+            return PageData(url=url, error=f"{type(e).__name__}: {str(e)}",
+                            fetch_seconds=time.perf_counter() - started)
+
+    def _head_sync(self, url: str) -> Tuple[int, str]:
+        response = self.session.head(url, timeout=self.timeout, allow_redirects=True)
+        return response.status_code, response.headers.get('Content-Type', '')
+
+    async def fetch(self, url: str) -> PageData:
+        return await asyncio.to_thread(self._fetch_sync, url)
+
+    async def head(self, url: str) -> Tuple[int, str]:
+        return await asyncio.to_thread(self._head_sync, url)
+
+    async def load_robots(self, robots, url: str):
+        cached = robots.rules_for(url)
+        if cached is not None:
+            return cached
+        return await asyncio.to_thread(robots.fetch_sync, self.session, url)
+
+
+class PlaywrightFetcher(AiohttpFetcher):
+    level = Needs.LIVE
+    name = 'playwright'
+
+    def __init__(self, settle_timeout: float = 10, headless: bool = True,
+                 render_profile: Optional[RenderProfile] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.settle_timeout = settle_timeout
+        self.headless = headless
+        self.render_profile = render_profile or PROFILES['full']()
+        self.playwright = None
+        self.browser = None
+        self.context = None
+
+    async def start(self):
+        from playwright.async_api import async_playwright
+
+        await super().start()
+        self.playwright = await async_playwright().start()
+        self.browser = await self.playwright.chromium.launch(headless=self.headless)
+        self.context = await self.browser.new_context(ignore_https_errors=True, user_agent=self.user_agent)
+        await self.render_profile.apply(self.context)
+
+    async def close(self):
+        if self.context:
+            await self.context.close()
+        if self.browser:
+            await self.browser.close()
+        if self.playwright:
+            await self.playwright.stop()
+        self.context = self.browser = self.playwright = None
+        await super().close()
+
+    async def fetch(self, url: str) -> PageData:
+        started = time.perf_counter()
+        page = await self.context.new_page()
+        watcher = LoadWatcher(page)
+        data = PageData(url=url, page=page)
+        secure = urlparse(url).scheme == 'https'
+        page.on('console', lambda msg: data.js_errors.append(msg.text) if msg.type == 'error' else None)
+        page.on('pageerror', lambda err: data.js_errors.append(str(err)))
+        page.on('request', lambda request: data.insecure_requests.append(request.url)
+                if secure and request.url.startswith('http:') else None)
+        try:
+            response = await page.goto(url, wait_until='domcontentloaded', timeout=self.timeout * 1000)
+            data.status = response.status if response else 0
+            data.headers = await response.all_headers() if response else {}
+            data.final_url = page.url
+            if not await watcher.settled(timeout=self.settle_timeout):
+                logging.debug(f"{url} did not settle within {self.settle_timeout}s")
+            data.html = await page.content()
+        except Exception as e:
+            data.error = f"{type(e).__name__}: {str(e)}"
+        data.fetch_seconds = time.perf_counter() - started
+        return data
+
+    async def release(self, page: PageData):
+        if page.page is not None:
+            try:
+                await page.page.close()
+            except Exception:
+                pass
+            page.page = None
+        page.release()
+
+
+FETCHERS = {
+    'requests': RequestsFetcher,
+    'aiohttp': AiohttpFetcher,
+    'playwright': PlaywrightFetcher,
+}
+
+
+def fetcher_for(level: Needs, http_backend: str = 'aiohttp', **kwargs) -> Fetcher:
+    """Cheapest fetcher that satisfies level; http_backend picks between requests and aiohttp"""
+    if level >= Needs.LIVE:
+        return PlaywrightFetcher(**kwargs)
+    return FETCHERS[http_backend](**kwargs)
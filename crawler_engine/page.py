@@ -0,0 +1,55 @@
+'''
+What a fetch produces and what analyzers consume.
+'''
+
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Dict, List, Optional
+
+from bs4 import BeautifulSoup
+
+
+class Needs(IntEnum):
+    """What an analyzer needs from the fetch, cheapest first"""
+    RAW = 0   # status, headers and HTML text
+    TREE = 1  # parsed BeautifulSoup tree of that HTML
+    LIVE = 2  # rendered Playwright page (JS, layout, console)
+
+
+@dataclass
+class PageData:
+    url: str
+    status: int = 0
+    html: str = ''
+    headers: Dict[str, str] = field(default_factory=dict)
+    final_url: Optional[str] = None
+    error: Optional[str] = None
+    fetch_seconds: float = 0.0
+    page: object = None  # Playwright page, only for LIVE fetches
+    js_errors: List[str] = field(default_factory=list)
+    insecure_requests: List[str] = field(default_factory=list)
+    parser: str = 'html.parser'
+    _soup: Optional[BeautifulSoup] = field(default=None, repr=False)
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and 0 < self.status < 400
+
+    @property
+    def is_html(self) -> bool:
+        content_type = self.headers.get('Content-Type', self.headers.get('content-type', 'text/html'))
+        return 'html' in content_type
+
+    @property
+    def soup(self) -> BeautifulSoup:
+        """Parsed tree, built on first access and shared by every analyzer"""
+        if self._soup is None:
+            self._soup = BeautifulSoup(self.html, self.parser)
+        return self._soup
+
+    def release(self):
+        """Drop the tree and text; bs4 trees are reference cycles, so break them explicitly"""
+        if self._soup is not None:
+            self._soup.decompose()
+            self._soup = None
+        self.html = ''
@@ -0,0 +1,104 @@
+'''
+Page performance capture for rendered crawls, from the page load the crawler
+already does (no extra navigation).
+
+install() adds an init script that starts PerformanceObservers for LCP,
+layout shifts and long tasks before any page script runs; collect() reads them
+together with Navigation Timing and Resource Timing into typed columns:
+
+    TTFB (ms)            responseStart of the navigation
+    DOM Ready (ms)       domContentLoadedEventEnd
+    Load Event (ms)      loadEventEnd (0 if the load event has not fired yet)
+    FCP (ms)             first-contentful-paint
+    LCP (ms)             last largest-contentful-paint candidate
+    CLS                  session-windowed cumulative layout shift
+    Long Tasks           number of tasks over 50 ms
+    TBT (ms)             sum of (duration - 50 ms) of long tasks after FCP
+    Resource Count       resources fetched by the page
+    Transfer Size (KB)   bytes over the wire (navigation + resources)
+
+Collect before resizing the viewport or navigating the page elsewhere, since
+both disturb layout-shift and resource numbers.
+'''
+
+from typing import Dict
+
+PERF_COLUMNS = [
+    'TTFB (ms)', 'DOM Ready (ms)', 'Load Event (ms)', 'FCP (ms)', 'LCP (ms)', 'CLS',
+    'Long Tasks', 'TBT (ms)', 'Resource Count', 'Transfer Size (KB)'
+]
+
+INIT_SCRIPT = '''(() => {
+    if (window.__perf) return;
+    const perf = window.__perf = {lcp: 0, cls: 0, longTasks: []};
+    let sessionValue = 0, sessionStart = 0, sessionLast = 0;
+    const observe = (type, callback) => {
+        try {
+            new PerformanceObserver(list => list.getEntries().forEach(callback))
+                .observe({type, buffered: true});
+        } catch (e) {}
+    };
+    observe('largest-contentful-paint', entry => { perf.lcp = entry.renderTime || entry.loadTime || entry.startTime; });
+    observe('layout-shift', entry => {
+        if (entry.hadRecentInput) return;
+        // Session windows: shifts less than 1s apart, at most 5s long
+        if (sessionValue && (entry.startTime - sessionLast > 1000 || entry.startTime - sessionStart > 5000)) {
+            sessionValue = 0;
+        }
+        if (!sessionValue) sessionStart = entry.startTime;
+        sessionValue += entry.value;
+        sessionLast = entry.startTime;
+        perf.cls = Math.max(perf.cls, sessionValue);
+    });
+    observe('longtask', entry => { perf.longTasks.push([entry.startTime, entry.duration]); });
+})()'''
+
+COLLECT_JS = '''() => {
+    const perf = window.__perf || {lcp: 0, cls: 0, longTasks: []};
+    const nav = performance.getEntriesByType('navigation')[0] || {};
+    const fcpEntry = performance.getEntriesByName('first-contentful-paint')[0];
+    const fcp = fcpEntry ? fcpEntry.startTime : 0;
+    const resources = performance.getEntriesByType('resource');
+    let tbt = 0;
+    for (const [start, duration] of perf.longTasks) {
+        if (start >= fcp) tbt += Math.max(0, duration - 50);
+    }
+    return {
+        ttfb: nav.responseStart || 0,
+        domReady: nav.domContentLoadedEventEnd || 0,
+        load: nav.loadEventEnd || 0,
+        fcp: fcp,
+        lcp: perf.lcp,
+        cls: perf.cls,
+        longTasks: perf.longTasks.length,
+        tbt: tbt,
+        resources: resources.length,
+        transfer: resources.reduce((sum, r) => sum + (r.transferSize || 0), nav.transferSize || 0)
+    };
+}'''
+
+
+async def install(context):
+    """Start the observers in every page of a Playwright context (call before creating pages)"""
+    await context.add_init_script(INIT_SCRIPT)
+
+
+def empty_row() -> Dict[str, object]:
+    return {column: None for column in PERF_COLUMNS}
+
+
+async def collect(page) -> Dict[str, object]:
+    """Performance columns for the page's current document"""
+    raw = await page.evaluate(COLLECT_JS)
+    return {
+        'TTFB (ms)': round(raw['ttfb']),
+        'DOM Ready (ms)': round(raw['domReady']),
+        'Load Event (ms)': round(raw['load']),
+        'FCP (ms)': round(raw['fcp']),
+        'LCP (ms)': round(raw['lcp']),
+        'CLS': round(raw['cls'], 4),
+        'Long Tasks': int(raw['longTasks']),
+        'TBT (ms)': round(raw['tbt']),
+        'Resource Count': int(raw['resources']),
+        'Transfer Size (KB)': round(raw['transfer'] / 1024, 1),
+    }
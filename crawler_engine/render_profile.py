@@ -0,0 +1,164 @@
+'''
+Playwright rendering profiles and a load-complete signal that beats networkidle.
+
+Rendered page time is dominated by fonts, video and third-party tags that no
+reported column depends on. A RenderProfile installs a page.route handler that
+stubs those requests instead of letting them hit the network:
+
+    trackers     analytics / ad / tag-manager hosts - stubbed unless the profile
+                 is 'full' or the JS error / warnings columns are reported (their
+                 scripts' errors belong in those columns, and empty stubs would
+                 raise ReferenceErrors of their own)
+    stylesheet, image, font, media
+                 first-party subresources - stubbed unless an enabled check
+                 needs them (layout checks need stylesheets and images)
+
+Requests are fulfilled with an empty 200 (a 1x1 GIF for images) rather than
+aborted, so blocked resources never surface as "Failed to load resource"
+console errors in the JS error column. Navigations are never touched.
+
+LoadWatcher replaces wait_for_load_state('networkidle'): it counts the page's
+in-flight requests (blocked ones finish instantly, long-polling connections are
+tolerated up to max_inflight) and then waits for the DOM to stop mutating,
+bounded by a timeout.
+'''
+
+import asyncio
+import base64
+import time
+from typing import Dict, Iterable, Optional
+from urllib.parse import urlsplit
+
+TRACKER_DOMAINS = (
+    'google-analytics.com', 'googletagmanager.com', 'doubleclick.net', 'googlesyndication.com',
+    'googleadservices.com', 'adservice.google.com', 'facebook.net', 'connect.facebook.com',
+    'hotjar.com', 'segment.com', 'segment.io', 'mixpanel.com', 'clarity.ms', 'bing.com',
+    'linkedin.com', 'licdn.com', 'twitter.com', 'ads-twitter.com', 'hubspot.com', 'hs-scripts.com',
+    'hs-analytics.net', 'intercom.io', 'drift.com', 'zdassets.com', 'optimizely.com',
+    'newrelic.com', 'nr-data.net', 'criteo.com', 'taboola.com', 'outbrain.com', 'adroll.com',
+    'quantserve.com', 'scorecardresearch.com', 'amazon-adsystem.com', 'tiktok.com', 'pinimg.com',
+)
+RESOURCE_KINDS = ('stylesheet', 'image', 'font', 'media')
+TRANSPARENT_GIF = base64.b64decode('R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7')
+STUB_CONTENT_TYPES = {
+    'script': 'application/javascript',
+    'stylesheet': 'text/css',
+    'image': 'image/gif',
+    'font': 'font/woff2',
+    'media': 'video/mp4',
+}
+DOM_QUIET_JS = '''([quietMs, timeoutMs]) => new Promise(resolve => {
+    let timer;
+    const finish = settled => { observer.disconnect(); clearTimeout(timer); clearTimeout(cap); resolve(settled); };
+    const observer = new MutationObserver(() => {
+        clearTimeout(timer);
+        timer = setTimeout(() => finish(true), quietMs);
+    });
+    observer.observe(document, {subtree: true, childList: true, attributes: true, characterData: true});
+    timer = setTimeout(() => finish(true), quietMs);
+    const cap = setTimeout(() => finish(false), timeoutMs);
+})'''
+
+
+def _is_tracker(host: str) -> bool:
+    return any(host == domain or host.endswith('.' + domain) for domain in TRACKER_DOMAINS)
+
+
+class RenderProfile:
+    def __init__(self, name: str, allow: Iterable[str] = RESOURCE_KINDS, stub_trackers: bool = True):
+        self.name = name
+        self.allow = frozenset(allow)
+        self.stub_trackers = stub_trackers
+        self.stubbed: Dict[str, int] = {}
+
+    def __repr__(self):
+        return f"RenderProfile({self.name!r}, allow={sorted(self.allow)}, stub_trackers={self.stub_trackers})"
+
+    @property
+    def blocks_anything(self) -> bool:
+        return self.stub_trackers or self.allow != frozenset(RESOURCE_KINDS)
+
+    def _stub_reason(self, request) -> Optional[str]:
+        if request.is_navigation_request():
+            return None
+        if self.stub_trackers and _is_tracker(urlsplit(request.url).hostname or ''):
+            return 'tracker'
+        kind = request.resource_type
+        if kind in RESOURCE_KINDS and kind not in self.allow:
+            return kind
+        return None
+
+    async def _route(self, route):
+        request = route.request
+        reason = self._stub_reason(request)
+        if reason is None:
+            await route.continue_()
+            return
+        self.stubbed[reason] = self.stubbed.get(reason, 0) + 1
+        kind = request.resource_type
+        await route.fulfill(status=200, content_type=STUB_CONTENT_TYPES.get(kind, 'text/plain'),
+                            body=TRANSPARENT_GIF if kind == 'image' else b'')
+
+    async def apply(self, target):
+        """Install on a Playwright BrowserContext (all its pages) or a single Page"""
+        if self.blocks_anything:
+            await target.route('**/*', self._route)
+
+
+def profile_for(layout: bool = False, scripts: bool = False) -> RenderProfile:
+    """Cheapest profile for the enabled checks: layout checks keep stylesheets and images,
+    JS error / warnings checks keep trackers and third-party scripts live"""
+    profile = PROFILES['layout' if layout else 'content']()
+    if scripts:
+        profile = RenderProfile(f"{profile.name}+scripts", allow=profile.allow, stub_trackers=False)
+    return profile
+
+
+PROFILES = {
+    'full': lambda: RenderProfile('full', allow=RESOURCE_KINDS, stub_trackers=False),
+    'layout': lambda: RenderProfile('layout', allow=('stylesheet', 'image')),
+    'content': lambda: RenderProfile('content', allow=()),
+}
+
+
+class LoadWatcher:
+    """Create right after new_page(), before goto(), then await settled()"""
+
+    def __init__(self, page, max_inflight: int = 2):
+        self.page = page
+        self.max_inflight = max_inflight
+        self.inflight = 0
+        self.last_change = time.monotonic()
+        page.on('request', self._on_start)
+        page.on('requestfinished', self._on_end)
+        page.on('requestfailed', self._on_end)
+
+    def _on_start(self, request):
+        if request.resource_type not in ('websocket', 'eventsource'):
+            self.inflight += 1
+            self.last_change = time.monotonic()
+
+    def _on_end(self, request):
+        if request.resource_type not in ('websocket', 'eventsource'):
+            self.inflight = max(0, self.inflight - 1)
+            self.last_change = time.monotonic()
+
+    async def settled(self, quiet_ms: int = 500, timeout: float = 10.0) -> bool:
+        """True once the network and DOM have been quiet for quiet_ms; False on timeout"""
+        deadline = time.monotonic() + timeout
+        quiet = quiet_ms / 1000
+        while True:
+            now = time.monotonic()
+            if now >= deadline:
+                return False
+            if self.inflight <= self.max_inflight and now - self.last_change >= quiet:
+                break
+            await asyncio.sleep(0.05)
+        remaining_ms = int((deadline - time.monotonic()) * 1000)
+        if remaining_ms <= 0:
+            return False
+        try:
+            return await self.page.evaluate(DOM_QUIET_JS, [quiet_ms, remaining_ms])
+        except Exception:
+            # Navigated away or closed while waiting
+            return False
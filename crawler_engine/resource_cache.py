@@ -0,0 +1,129 @@
+'''
+Crawl-wide cache of resource status lookups (image HEAD checks).
+
+Logos, icons and vendor images repeat across thousands of pages; this cache
+turns every repeat into a dictionary hit:
+
+    - concurrent lookups of the same URL share one in-flight request
+    - entries expire after ttl seconds and the least recently used ones are
+      evicted beyond max_entries
+    - optionally persisted to a JSON file so the next daily run starts warm
+
+Values must be JSON-serializable and not None. Loader exceptions are not
+cached; every waiter of that lookup gets the exception. If the loading task is
+cancelled instead, its waiters retry (the first one takes over the load).
+'''
+
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional
+
+DEFAULT_TTL = 36 * 3600  # long enough to carry over to the next daily run
+
+
+class ResourceStatusCache:
+    def __init__(self, ttl: float = DEFAULT_TTL, max_entries: int = 100_000, path: Optional[str] = None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.path = path
+        self._entries: OrderedDict = OrderedDict()  # key -> (value, expires_at)
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        if path and os.path.exists(path):
+            self.load(path)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _store(self, key: str, value, expires_at: float):
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def peek(self, key: str):
+        """Cached value for key or None, without loading"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[1] <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    async def get(self, key: str, loader: Callable[[str], Awaitable]):
+        """Cached value for key, loading it with loader(key) at most once at a time"""
+        while True:
+            value = self.peek(key)
+            if value is not None:
+                self.hits += 1
+                return value
+            future = self._inflight.get(key)
+            if future is None:
+                break
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise  # This waiter was cancelled, not the load
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await loader(key)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # Waiters re-raise it; don't log it as never retrieved
+            raise
+        finally:
+            del self._inflight[key]
+        self._store(key, value, time.time() + self.ttl)
+        future.set_result(value)
+        return value
+
+    def load(self, path: str):
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring unreadable resource cache {path}: {str(e)}")
+            return
+        now = time.time()
+        for key, (value, expires_at) in data.items():
+            if expires_at > now:
+                self._store(key, value, expires_at)
+        logging.info(f"Loaded {len(self._entries)} cached resource statuses from {path}")
+
+    def save(self, path: Optional[str] = None):
+        """Atomically write the unexpired entries as JSON"""
+        path = path or self.path
+        if not path:
+            return
+        now = time.time()
+        data = {key: [value, expires_at] for key, (value, expires_at) in self._entries.items() if expires_at > now}
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'coalesced': self.coalesced,
+            'hit_rate': round((self.hits + self.coalesced) / lookups, 3) if lookups else 0.0
+        }
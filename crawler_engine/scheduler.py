@@ -0,0 +1,75 @@
+'''
+Crawl frontier: canonical, same-site, trap-free, robots-allowed URLs, each
+scheduled once.
+'''
+
+import asyncio
+import time
+from typing import Iterable, Optional, Tuple
+
+from memory_governor import CompactUrlSet
+from robots import RobotsCache
+from url_canonicalizer import UrlCanonicalizer, TrapDetector
+
+
+class Scheduler:
+    def __init__(self, base_url: str, max_pages: Optional[int] = None, robots: Optional[RobotsCache] = None,
+                 canonicalizer: Optional[UrlCanonicalizer] = None, trap_detector: Optional[TrapDetector] = None):
+        self.canonicalizer = canonicalizer or UrlCanonicalizer()
+        self.trap_detector = trap_detector or TrapDetector()
+        self.robots = robots
+        self.base_url = self.canonicalizer.canonicalize(base_url)
+        self.max_pages = max_pages
+        self.seen = CompactUrlSet()
+        self.scheduled = 0
+        self._queue: Optional[asyncio.Queue] = None
+
+    @property
+    def queue(self) -> asyncio.Queue:
+        # Created lazily so it binds to the running event loop
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        return self._queue
+
+    def _accept(self, url: str) -> bool:
+        return (url.startswith(('http://', 'https://'))
+                and self.canonicalizer.same_site(url, self.base_url)
+                and url not in self.seen
+                and not self.trap_detector.is_trap(url)
+                and (self.robots is None or self.robots.allowed(url)))
+
+    def add(self, url: str, base: Optional[str] = None) -> bool:
+        """Canonicalize url and schedule it unless already seen or filtered out"""
+        if self.max_pages and self.scheduled >= self.max_pages:
+            return False
+        try:
+            url = self.canonicalizer.canonicalize(url, base)
+        except ValueError:
+            return False
+        if not self._accept(url):
+            return False
+        self.seen.add(url)
+        self.scheduled += 1
+        self.queue.put_nowait((url, time.perf_counter()))
+        return True
+
+    def add_all(self, urls: Iterable[str], base: Optional[str] = None) -> int:
+        return sum(self.add(url, base) for url in urls)
+
+    def mark_seen(self, url: str):
+        """Record an alias (rel=canonical target, redirect) so it is not crawled again"""
+        self.seen.add(url)
+
+    async def get(self) -> Tuple[str, float]:
+        """Next (url, seconds spent queued)"""
+        url, enqueued_at = await self.queue.get()
+        return url, time.perf_counter() - enqueued_at
+
+    def task_done(self):
+        self.queue.task_done()
+
+    async def join(self):
+        await self.queue.join()
+
+    def __len__(self) -> int:
+        return self.queue.qsize()
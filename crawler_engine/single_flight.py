@@ -0,0 +1,84 @@
+'''
+Single-flight request de-duplication.
+
+SingleFlight.do(key, fn) runs fn() once per key at a time: callers arriving
+while it is in flight await the same result instead of issuing their own
+request. Completed results are also kept for a short window (recent_ttl,
+at most max_recent entries) so a request issued right after an identical one
+finished is served from memory; remember() seeds that window with a result
+obtained some other way (e.g. a rendered page). If the task running fn() is
+cancelled, the callers waiting on it retry rather than being cancelled too.
+
+`saved` counts the network calls avoided.
+'''
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    def __init__(self, recent_ttl: float = 300, max_recent: int = 500):
+        self.recent_ttl = recent_ttl
+        self.max_recent = max_recent
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._recent: OrderedDict = OrderedDict()  # key -> (value, expires_at)
+        self.calls = 0
+        self.saved = 0
+
+    def remember(self, key: Hashable, value):
+        if self.recent_ttl <= 0 or self.max_recent <= 0:
+            return
+        self._recent[key] = (value, time.monotonic() + self.recent_ttl)
+        self._recent.move_to_end(key)
+        while len(self._recent) > self.max_recent:
+            self._recent.popitem(last=False)
+
+    def _recent_value(self, key: Hashable):
+        entry = self._recent.get(key)
+        if entry is None:
+            return False, None
+        if entry[1] <= time.monotonic():
+            del self._recent[key]
+            return False, None
+        return True, entry[0]
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable]):
+        while True:
+            found, value = self._recent_value(key)
+            if found:
+                self.saved += 1
+                return value
+            future = self._inflight.get(key)
+            if future is None:
+                break
+            try:
+                value = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise  # This caller was cancelled, not the request
+                continue
+            self.saved += 1
+            return value
+
+        self.calls += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # Waiters re-raise it; don't log it as never retrieved
+            raise
+        finally:
+            del self._inflight[key]
+        future.set_result(value)
+        self.remember(key, value)
+        return value
+
+    def stats(self) -> Dict[str, int]:
+        return {'calls': self.calls, 'saved': self.saved, 'recent': len(self._recent)}
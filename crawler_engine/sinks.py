@@ -0,0 +1,60 @@
+'''
+Result sinks. CsvSink buffers rows and appends them in batches.
+
+Appending to an existing report keeps that file's header: rows are written
+against it (columns this run doesn't produce are 'null'), and a run producing
+columns the header lacks is refused rather than shifting values under the
+wrong headings.
+'''
+
+import csv
+import logging
+import os
+from contextlib import nullcontext
+from typing import Dict, List
+
+
+class CsvSink:
+    def __init__(self, path: str, columns: List[str], batch_size: int = 20, metrics=None):
+        self.path = path
+        self.columns = columns
+        self.batch_size = batch_size
+        self.metrics = metrics
+        self.rows: List[Dict] = []
+        self.written = 0
+        header = self._existing_header(path)
+        if header is None:
+            with open(path, 'w', newline='', encoding='utf-8') as f:
+                csv.writer(f).writerow(columns)
+            logging.info(f"Created new crawl report CSV file {path}")
+        else:
+            missing = [c for c in columns if c not in header]
+            if missing:
+                raise ValueError(f"{path} has no {', '.join(missing)} column(s); "
+                                 f"write this column set to another output file")
+            self.columns = header
+
+    @staticmethod
+    def _existing_header(path: str):
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return None
+        with open(path, newline='', encoding='utf-8') as f:
+            return next(csv.reader(f), None)
+
+    def write(self, row: Dict):
+        self.rows.append(row)
+        if len(self.rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.rows:
+            return
+        with self.metrics.stage('sink_write') if self.metrics else nullcontext():
+            with open(self.path, 'a', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=self.columns, extrasaction='ignore', restval='null')
+                writer.writerows(self.rows)
+        self.written += len(self.rows)
+        self.rows = []
+
+    def close(self):
+        self.flush()
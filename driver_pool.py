@@ -0,0 +1,156 @@
+'''
+Pool of pre-warmed Selenium drivers for the UI test suites.
+
+Starting Chrome (and chromedriver) costs a few seconds per browser, so drivers
+are launched once, concurrently, and leased out test by test. Between leases a
+driver is reset instead of restarted:
+
+    - extra windows/tabs are closed
+    - cookies are cleared browser-wide (CDP Network.clearBrowserCookies)
+    - localStorage, sessionStorage, IndexedDB, cache storage and service
+      workers of the origins the test visited are cleared
+    - the window goes back to about:blank
+
+The HTTP cache survives the reset on purpose: it is what keeps the next test's
+page loads warm. A driver that fails to reset is quit and replaced.
+
+    pool = DriverPool(make_driver, size=1)
+    pool.warm()
+    with pool.lease() as driver:
+        driver.get(url)
+    pool.close()
+
+Under pytest-xdist every worker process holds its own pool, so "-n 5" gives
+five warm browsers running tests side by side.
+'''
+
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, List, Set
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import WebDriverException
+
+CLEAR_STORAGE_JS = '''
+try { window.localStorage && window.localStorage.clear(); } catch (e) {}
+try { window.sessionStorage && window.sessionStorage.clear(); } catch (e) {}
+'''
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url or '')
+    if parts.scheme not in ('http', 'https'):
+        return ''
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+class DriverPool:
+    def __init__(self, factory: Callable[[], object], size: int = 1, lease_timeout: float = 300):
+        self.factory = factory
+        self.size = size
+        self.lease_timeout = lease_timeout
+        self._idle: queue.Queue = queue.Queue()
+        self._all: List[object] = []
+        self._lock = threading.Lock()
+        self.leases = 0
+        self.replaced = 0
+
+    def _launch(self):
+        driver = self.factory()
+        driver.get('about:blank')
+        with self._lock:
+            self._all.append(driver)
+        return driver
+
+    def warm(self):
+        """Launch every driver of the pool concurrently"""
+        missing = self.size - len(self._all)
+        if missing <= 0:
+            return
+        with ThreadPoolExecutor(max_workers=missing) as executor:
+            for driver in executor.map(lambda _: self._launch(), range(missing)):
+                self._idle.put(driver)
+        logging.info(f"Driver pool warmed with {self.size} drivers")
+
+    def _visited_origins(self, driver) -> Set[str]:
+        origins = {_origin(driver.current_url)}
+        try:
+            # Frames and redirects the test went through on the current page
+            entries = driver.execute_script(
+                "return performance.getEntriesByType('navigation').concat("
+                "performance.getEntriesByType('resource')).map(e => e.name)") or []
+            origins.update(_origin(name) for name in entries)
+        except WebDriverException:
+            pass
+        origins.discard('')
+        return origins
+
+    def reset(self, driver):
+        """Give driver a clean cookie/storage state without restarting the browser"""
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        origins = self._visited_origins(driver)
+        try:
+            driver.execute_script(CLEAR_STORAGE_JS)
+        except WebDriverException:
+            pass
+        if hasattr(driver, 'execute_cdp_cmd'):
+            driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+            for origin in origins:
+                driver.execute_cdp_cmd('Storage.clearDataForOrigin', {
+                    'origin': origin,
+                    'storageTypes': 'local_storage,indexeddb,websql,cache_storage,service_workers',
+                })
+        else:
+            # Firefox: WebDriver can only drop the current domain's cookies
+            driver.delete_all_cookies()
+        driver.get('about:blank')
+
+    def _discard(self, driver):
+        with self._lock:
+            if driver in self._all:
+                self._all.remove(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    @contextmanager
+    def lease(self):
+        """A clean driver for the duration of the block"""
+        if not self._all:
+            self.warm()
+        driver = self._idle.get(timeout=self.lease_timeout)
+        self.leases += 1
+        try:
+            yield driver
+        finally:
+            try:
+                self.reset(driver)
+            except Exception as e:
+                logging.warning(f"Driver reset failed, replacing it: {str(e)}")
+                self._discard(driver)
+                self.replaced += 1
+                try:
+                    driver = self._launch()
+                except Exception as e:
+                    # lease() warms a new driver once the pool is empty
+                    logging.error(f"Could not replace driver: {str(e)}")
+                    driver = None
+            if driver is not None:
+                self._idle.put(driver)
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait()
+            except queue.Empty:
+                break
+        for driver in list(self._all):
+            self._discard(driver)
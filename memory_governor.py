@@ -0,0 +1,155 @@
+'''
+Memory-bounded crawl support.
+
+MemoryGovernor samples the process RSS against a budget and, under pressure:
+1. shrinks the number of URLs processed concurrently (halved per check, restored
+   step by step once RSS falls back below the resume threshold)
+2. spills the tail of the frontier to a file on disk and refills from it later
+3. asks the crawler to flush its buffered results
+
+CompactUrlSet replaces the visited/seen sets of URL strings with 64-bit hashes,
+which keeps multi-million URL crawls at a few dozen MB.
+'''
+
+import gc
+import hashlib
+import logging
+import os
+import tempfile
+from typing import Iterable, List, Optional
+
+import psutil
+
+OK = 'ok'
+PRESSURE = 'pressure'
+CRITICAL = 'critical'
+
+
+class CompactUrlSet:
+    """Set-like container storing 64-bit URL hashes instead of the strings"""
+
+    def __init__(self, urls: Iterable[str] = ()):
+        self._hashes = set()
+        for url in urls:
+            self.add(url)
+
+    @staticmethod
+    def _hash(url: str) -> int:
+        return int.from_bytes(hashlib.blake2b(url.encode('utf-8'), digest_size=8).digest(), 'little')
+
+    def add(self, url: str):
+        self._hashes.add(self._hash(url))
+
+    def update(self, urls: Iterable[str]):
+        for url in urls:
+            self.add(url)
+
+    def __contains__(self, url: str) -> bool:
+        return self._hash(url) in self._hashes
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+
+class MemoryGovernor:
+    def __init__(self, budget_mb: Optional[float] = None, spill_dir: Optional[str] = None,
+                 min_batch: int = 5, soft_ratio: float = 0.8, resume_ratio: float = 0.6,
+                 max_queue_in_memory: int = 5000):
+        self.budget_mb = budget_mb
+        self.min_batch = min_batch
+        self.soft_ratio = soft_ratio
+        self.resume_ratio = resume_ratio
+        self.max_queue_in_memory = max_queue_in_memory
+        self.process = psutil.Process()
+        self.batch_limit: Optional[int] = None
+        self.state = OK
+        self.spilled = 0
+        self.spill_events = 0
+        self._spill_dir = spill_dir or tempfile.gettempdir()
+        self._spill_path: Optional[str] = None
+        self._read_offset = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.budget_mb)
+
+    def rss_mb(self) -> float:
+        return self.process.memory_info().rss / 1024 / 1024
+
+    def check(self, batch_size: int) -> str:
+        """Sample RSS and adjust the concurrency limit; returns ok/pressure/critical"""
+        if not self.enabled:
+            return OK
+        rss = self.rss_mb()
+        limit = self.batch_limit or batch_size
+
+        if rss >= self.budget_mb:
+            self.state = CRITICAL
+            self.batch_limit = max(self.min_batch, limit // 2)
+            gc.collect()
+        elif rss >= self.budget_mb * self.soft_ratio:
+            self.state = PRESSURE
+            self.batch_limit = max(self.min_batch, int(limit * 0.75))
+        else:
+            self.state = OK
+            if self.batch_limit and rss < self.budget_mb * self.resume_ratio:
+                self.batch_limit = min(batch_size, self.batch_limit + max(1, batch_size // 10))
+                if self.batch_limit >= batch_size:
+                    self.batch_limit = None
+
+        if self.state != OK:
+            logging.warning(f"Memory {self.state}: RSS {rss:.0f}MB of {self.budget_mb:.0f}MB budget, "
+                            f"concurrency limited to {self.batch_limit}")
+        return self.state
+
+    def limit_batch(self, batch_size: int) -> int:
+        """Batch size to use right now"""
+        return min(batch_size, self.batch_limit) if self.batch_limit else batch_size
+
+    def should_spill(self, queue: List[str]) -> bool:
+        """Spill when under pressure or when the in-memory frontier is too long"""
+        if not self.enabled:
+            return False
+        return len(queue) > self.max_queue_in_memory or (self.state != OK and len(queue) > self.min_batch)
+
+    def spill(self, queue: List[str], keep: int) -> List[str]:
+        """Write everything after the first `keep` URLs to disk, return the kept head"""
+        tail = queue[keep:]
+        if not tail:
+            return queue
+        if self._spill_path is None:
+            fd, self._spill_path = tempfile.mkstemp(prefix='crawl_frontier_', suffix='.txt', dir=self._spill_dir)
+            os.close(fd)
+        with open(self._spill_path, 'a', encoding='utf-8') as f:
+            f.write('\n'.join(tail))
+            f.write('\n')
+        self.spilled += len(tail)
+        self.spill_events += 1
+        logging.info(f"Spilled {len(tail):,} queued URLs to {self._spill_path} ({self.spilled:,} on disk)")
+        return queue[:keep]
+
+    def refill(self, count: int) -> List[str]:
+        """Read back up to `count` spilled URLs in FIFO order"""
+        if not self.spilled:
+            return []
+        urls = []
+        with open(self._spill_path, 'r', encoding='utf-8') as f:
+            f.seek(self._read_offset)
+            while len(urls) < count:
+                line = f.readline()
+                if not line:
+                    break
+                urls.append(line.rstrip('\n'))
+            self._read_offset = f.tell()
+        self.spilled -= len(urls)
+        if not self.spilled:
+            self.close()
+        return urls
+
+    def close(self):
+        """Remove the spill file"""
+        if self._spill_path and os.path.exists(self._spill_path):
+            os.remove(self._spill_path)
+        self._spill_path = None
+        self._read_offset = 0
+        self.spilled = 0
@@ -0,0 +1,254 @@
+'''
+Synthetic site generator and local aiohttp server for offline crawler runs.
+
+Pages are generated deterministically from (seed, page index), so nothing is
+kept in memory and two runs with the same SiteSpec serve byte-identical sites.
+
+    /                              home page (page 0)
+    /category-<c>/item-<n>         pages 1..N-1
+    /missing/...                   broken links (404)
+    /static/img-<k>.avif           shared image pool (logos/icons repeat across pages);
+    /static/img-<k>.png            every fourth one is a legacy PNG
+    /static/missing-<k>.png        broken images (404)
+
+Every page links to the next one, so the whole site is reachable from /.
+
+    python mock_site.py --pages 500 --latency-ms 40 --port 8080
+'''
+
+import argparse
+import asyncio
+import math
+import random
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass, asdict
+from typing import Optional, Tuple
+
+from aiohttp import web
+
+PAGE_PATH = re.compile(r'^/category-\d+/item-\d+$')
+FILLER = ("Compare pricing, features and reviews of the leading software vendors. "
+          "Our analysts shortlist products by deployment, integrations and support quality. ")
+PNG_BYTES = bytes.fromhex('89504e470d0a1a0a0000000d4948445200000001000000010806000000'
+                          '1f15c4890000000d49444154789c6360000000020001e221bc330000000049454e44ae426082')
+AVIF_BYTES = bytes.fromhex('00000020667479706176696600000000617669666d6966316d6961664d413142000000f26d657461'
+                           '000000000000002868646c720000000000000000706963740000000000000000000000006c696261'
+                           '766966000000000e7069746d0000000000010000001e696c6f6300000000440000010001000000010000011a'
+                           '0000001d0000002869696e660000000000010000001a696e6665020000000001000061763031436f6c6f72'
+                           '000000006a697072700000004b6970636f0000001469737065000000000000000200000002000000107069'
+                           '786900000000030808080000000c61763143810d0c0000000013636f6c726e636c7800020002000180'
+                           '0000001769706d61000000000000000100010401028304000000256d64617412000a081800368810100c'
+                           '20320f1ff03fffffc59f87007cf84acae360')
+IMAGES = {'.avif': (AVIF_BYTES, 'image/avif'), '.png': (PNG_BYTES, 'image/png')}
+
+
+def is_page_path(path: str) -> bool:
+    """True for HTML page paths served by MockSite"""
+    return path in ('', '/') or bool(PAGE_PATH.match(path))
+
+
+@dataclass
+class SiteSpec:
+    pages: int = 300
+    page_kb: int = 40
+    fanout: int = 15
+    broken_ratio: float = 0.05
+    images_per_page: int = 8
+    image_pool: int = 40
+    latency_ms: float = 30.0
+    jitter_ms: float = 20.0
+    latency_dist: str = 'lognormal'  # fixed | uniform | lognormal | exponential
+    seed: int = 1
+
+
+class MockSite:
+    def __init__(self, spec: SiteSpec):
+        self.spec = spec
+        self.categories = max(1, spec.pages // 50)
+        self.requests: Counter = Counter()
+        self.page_hits: Counter = Counter()
+        self._latency_rng = random.Random(spec.seed)
+        self._runner: Optional[web.AppRunner] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self.base_url: Optional[str] = None
+
+    def page_path(self, index: int) -> str:
+        if index == 0:
+            return '/'
+        return f"/category-{index % self.categories}/item-{index}"
+
+    def _latency(self) -> float:
+        """Seconds of simulated server latency for one request"""
+        spec, rng = self.spec, self._latency_rng
+        if spec.latency_ms <= 0:
+            return 0.0
+        if spec.latency_dist == 'fixed':
+            value = spec.latency_ms
+        elif spec.latency_dist == 'uniform':
+            value = rng.uniform(spec.latency_ms - spec.jitter_ms, spec.latency_ms + spec.jitter_ms)
+        elif spec.latency_dist == 'exponential':
+            value = rng.expovariate(1 / spec.latency_ms)
+        else:
+            # Lognormal with the requested mean and standard deviation
+            sigma2 = math.log(1 + (spec.jitter_ms / spec.latency_ms) ** 2)
+            value = rng.lognormvariate(math.log(spec.latency_ms) - sigma2 / 2, math.sqrt(sigma2))
+        return max(0.0, value) / 1000
+
+    def render_page(self, index: int) -> str:
+        spec = self.spec
+        rng = random.Random(spec.seed * 1_000_003 + index)
+
+        links = [self.page_path((index + 1) % spec.pages)]
+        for k in range(spec.fanout - 1):
+            if rng.random() < spec.broken_ratio:
+                links.append(f"/missing/item-{index}-{k}")
+            else:
+                links.append(self.page_path(rng.randrange(spec.pages)))
+        images = []
+        for k in range(spec.images_per_page):
+            if rng.random() < spec.broken_ratio:
+                images.append(f"/static/missing-{index}-{k}.png")
+            else:
+                image = rng.randrange(spec.image_pool)
+                images.append(f"/static/img-{image}.{'png' if image % 4 == 3 else 'avif'}")
+
+        parts = [
+            '<!DOCTYPE html><html lang="en"><head><meta charset="utf-8">',
+            f'<title>Software item {index}</title>',
+            f'<meta name="description" content="Reviews and pricing for software item {index}">',
+            '<meta name="keywords" content="software, reviews, pricing">' if index % 7 else '',
+            '<meta name="viewport" content="width=device-width, initial-scale=1">',
+            f'<link rel="canonical" href="{self.page_path(index)}">',
+            '<style>.grid{display:grid}@media (max-width: 768px){.grid{display:block}}</style>',
+            '</head><body><header class="md-header"><nav>',
+            ''.join(f'<a href="{href}">Link {n}</a>' for n, href in enumerate(links)),
+            '</nav></header><main class="grid">',
+            f'<h1>Software item {index}</h1>',
+            '<a class="cta button" href="/">Get started</a>',
+        ]
+        for n, src in enumerate(images):
+            alt = f' alt="image {n}"' if (index + n) % 4 else ''
+            parts.append(f'<img src="{src}"{alt}>')
+
+        size = sum(len(p) for p in parts)
+        section = 0
+        while size < spec.page_kb * 1024:
+            block = f'<h2>Section {section}</h2><p>{FILLER * 8}</p>'
+            if section % 3 == 0:
+                block += f'<h3>Details {section}</h3><div style="overflow:hidden"><p>{FILLER * 2}</p></div>'
+            parts.append(block)
+            size += len(block)
+            section += 1
+        parts.append('</main></body></html>')
+        return ''.join(parts)
+
+    def _page_index(self, path: str) -> Optional[int]:
+        if path in ('', '/'):
+            return 0
+        if PAGE_PATH.match(path):
+            index = int(path.rsplit('-', 1)[1])
+            if index < self.spec.pages and path == self.page_path(index):
+                return index
+        return None
+
+    def render(self, path: str) -> Tuple[int, bytes, str]:
+        """(status, body, content type) for path"""
+        if path == '/robots.txt':
+            return 200, b'User-agent: *\nAllow: /\n', 'text/plain'
+        if path.startswith('/static/img-') and path[path.rfind('.'):] in IMAGES:
+            body, content_type = IMAGES[path[path.rfind('.'):]]
+            return 200, body, content_type
+        index = self._page_index(path)
+        if index is not None:
+            return 200, self.render_page(index).encode('utf-8'), 'text/html; charset=utf-8'
+        return 404, b'<html><body><h1>Not found</h1></body></html>', 'text/html; charset=utf-8'
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        await asyncio.sleep(self._latency())
+        status, body, content_type = self.render(request.path)
+        self.requests[request.method] += 1
+        if request.method == 'GET' and is_page_path(request.path):
+            self.page_hits[request.path] += 1
+        return web.Response(status=status, body=body, headers={'Content-Type': content_type})
+
+    def make_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_route('*', '/{tail:.*}', self._handle)
+        return app
+
+    def reset_stats(self):
+        self.requests.clear()
+        self.page_hits.clear()
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> str:
+        self._runner = web.AppRunner(self.make_app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_port = self._runner.addresses[0][1]
+        self.base_url = f"http://{host}:{bound_port}/"
+        return self.base_url
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def start_background(self, host: str = '127.0.0.1', port: int = 0) -> str:
+        """Serve from a daemon thread with its own event loop; returns the base URL"""
+        self._loop = asyncio.new_event_loop()
+        started = threading.Event()
+
+        def run():
+            asyncio.set_event_loop(self._loop)
+            self._loop.run_until_complete(self.start(host, port))
+            started.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name='mock-site', daemon=True)
+        self._thread.start()
+        started.wait()
+        return self.base_url
+
+    def stop_background(self):
+        if self._loop:
+            asyncio.run_coroutine_threadsafe(self.stop(), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop = None
+
+
+def add_spec_arguments(parser: argparse.ArgumentParser):
+    defaults = SiteSpec()
+    parser.add_argument('--pages', type=int, default=defaults.pages)
+    parser.add_argument('--page-kb', type=int, default=defaults.page_kb, help='HTML weight per page')
+    parser.add_argument('--fanout', type=int, default=defaults.fanout, help='Links per page')
+    parser.add_argument('--broken-ratio', type=float, default=defaults.broken_ratio,
+                        help='Share of links and images that 404')
+    parser.add_argument('--images-per-page', type=int, default=defaults.images_per_page)
+    parser.add_argument('--latency-ms', type=float, default=defaults.latency_ms)
+    parser.add_argument('--jitter-ms', type=float, default=defaults.jitter_ms)
+    parser.add_argument('--latency-dist', default=defaults.latency_dist,
+                        choices=['fixed', 'uniform', 'lognormal', 'exponential'])
+    parser.add_argument('--seed', type=int, default=defaults.seed)
+
+
+def spec_from_args(args) -> SiteSpec:
+    return SiteSpec(pages=args.pages, page_kb=args.page_kb, fanout=args.fanout,
+                    broken_ratio=args.broken_ratio, images_per_page=args.images_per_page,
+                    latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                    latency_dist=args.latency_dist, seed=args.seed)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Serve a synthetic site for offline crawler runs')
+    add_spec_arguments(parser)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    args = parser.parse_args()
+    spec = spec_from_args(args)
+    print(f"Serving {asdict(spec)} on http://{args.host}:{args.port}/")
+    web.run_app(MockSite(spec).make_app(), host=args.host, port=args.port, print=None)
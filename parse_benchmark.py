@@ -0,0 +1,202 @@
+'''
+Microbenchmark for the HTML parse/extract hot path.
+
+Runs every extraction routine over a corpus of captured pages (by default the
+headless_source.html capture in the repo root; pass more files or directories
+of *.html to grow it) and reports per-function time and allocations:
+
+    parse[html.parser] / parse[lxml]               BeautifulSoup construction
+    AdvancedCrawler.analyze_seo, MaxCrawl.analyze_seo
+    AdvancedCrawler1._analyze_seo
+    Ahref_Replica._analyze_seo / _analyze_cta / _analyze_responsiveness
+    web_crawler.check_links / check_responsiveness
+
+Time is the median of --repeats runs per page; allocations are the tracemalloc
+peak of one extra run. Save a run with --output and compare later runs against
+it with --baseline; the exit code is 1 when any function got slower than
+--tolerance allows.
+
+    python parse_benchmark.py --output parse_baseline.json
+    python parse_benchmark.py captures/ --baseline parse_baseline.json --tolerance 0.2
+'''
+
+import argparse
+import glob
+import importlib.util
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Callable, Dict, List
+
+from bs4 import BeautifulSoup
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CORPUS = [os.path.join(REPO_DIR, 'headless_source.html')]
+PAGE_URL = 'https://softwarefinder.com/'
+
+
+class Page:
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, encoding='utf-8', errors='replace') as f:
+            self.html = f.read()
+        self.url = PAGE_URL
+        self.soup = BeautifulSoup(self.html, 'html.parser')
+        self.soup_lxml = BeautifulSoup(self.html, 'lxml')
+
+
+@contextmanager
+def _chdir(path: str):
+    """Crawler constructors create their CSV in the cwd; keep that out of the repo"""
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def _load(file_name: str):
+    spec = importlib.util.spec_from_file_location(os.path.splitext(file_name)[0],
+                                                  os.path.join(REPO_DIR, file_name))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _run_sync(coro):
+    """Drive a coroutine that never actually awaits (the async analyze_seo helpers)"""
+    try:
+        coro.send(None)
+    except StopIteration as stop:
+        return stop.value
+    raise RuntimeError('coroutine suspended; it needs an event loop')
+
+
+def load_targets(workdir: str) -> Dict[str, Callable[[Page], object]]:
+    """name -> fn(page); modules that cannot be imported are reported and skipped"""
+    targets = {
+        'parse[html.parser]': lambda page: BeautifulSoup(page.html, 'html.parser'),
+        'parse[lxml]': lambda page: BeautifulSoup(page.html, 'lxml'),
+    }
+
+    def add(file_name: str, build: Callable[[object], Dict[str, Callable]]):
+        try:
+            with _chdir(workdir):
+                targets.update(build(_load(file_name)))
+        except Exception as e:
+            print(f"Skipping {file_name}: {type(e).__name__}: {str(e)}", file=sys.stderr)
+
+    add('AdvancedCrawler.py', lambda m: {
+        'AdvancedCrawler.analyze_seo': lambda page, c=m.AdvancedCrawler(PAGE_URL): _run_sync(c.analyze_seo(page.soup))
+    })
+    add('MaxCrawl.py', lambda m: {
+        'MaxCrawl.analyze_seo': lambda page, c=m.UnlimitedCrawler(PAGE_URL): _run_sync(c.analyze_seo(page.soup))
+    })
+    add('AdvancedCrawler1.py', lambda m: {
+        'AdvancedCrawler1._analyze_seo': lambda page, c=m.WebCrawler(PAGE_URL): c._analyze_seo(page.soup)
+    })
+
+    def ahref(m):
+        crawler = m.WebCrawler(PAGE_URL)
+        return {
+            'Ahref_Replica._analyze_seo': lambda page: crawler._analyze_seo(page.soup, {}),
+            'Ahref_Replica._analyze_cta': lambda page: crawler._analyze_cta(page.soup, {}),
+            'Ahref_Replica._analyze_responsiveness': lambda page: crawler._analyze_responsiveness(page.soup, {}),
+        }
+    add('Ahref_Replica.py', ahref)
+
+    def web_crawler(m):
+        crawler = m.WebsiteCrawler(PAGE_URL)
+        return {
+            'web_crawler.check_links': lambda page: crawler.check_links(page.soup_lxml, page.url),
+            'web_crawler.check_responsiveness': lambda page: crawler.check_responsiveness(page.soup_lxml),
+        }
+    add('web_crawler.py', web_crawler)
+    return targets
+
+
+def measure(fn: Callable[[Page], object], pages: List[Page], repeats: int) -> Dict:
+    times = []
+    peak_alloc = 0
+    for page in pages:
+        fn(page)  # warm-up
+        for _ in range(repeats):
+            start = time.perf_counter()
+            fn(page)
+            times.append(time.perf_counter() - start)
+
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+        fn(page)
+        peak_alloc = max(peak_alloc, tracemalloc.get_traced_memory()[1] - baseline)
+        tracemalloc.stop()
+
+    return {
+        'median_ms': round(statistics.median(times) * 1000, 3),
+        'min_ms': round(min(times) * 1000, 3),
+        'max_ms': round(max(times) * 1000, 3),
+        'peak_alloc_kb': round(peak_alloc / 1024, 1),
+    }
+
+
+def collect_pages(paths: List[str]) -> List[Page]:
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, '*.html'))))
+        else:
+            files.append(path)
+    return [Page(path) for path in files]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the HTML extraction routines on captured pages')
+    parser.add_argument('corpus', nargs='*', default=DEFAULT_CORPUS, help='HTML files or directories')
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--only', default='', help='Comma separated substrings of function names to run')
+    parser.add_argument('--output', help='Write results JSON here')
+    parser.add_argument('--baseline', help='Results JSON of an earlier run to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed slowdown vs baseline (0.25 = 25%%)')
+    args = parser.parse_args()
+
+    pages = collect_pages(args.corpus)
+    print(f"Corpus: {len(pages)} page(s), {sum(len(p.html) for p in pages) / 1024 / 1024:.1f} MB of HTML")
+
+    workdir = tempfile.mkdtemp(prefix='parse_bench_')
+    targets = load_targets(workdir)
+    filters = [f.strip() for f in args.only.split(',') if f.strip()]
+
+    results = {}
+    print(f"{'function':<42}{'median ms':>12}{'min ms':>10}{'peak alloc KB':>16}")
+    for name, fn in targets.items():
+        if filters and not any(f in name for f in filters):
+            continue
+        results[name] = measure(fn, pages, args.repeats)
+        r = results[name]
+        print(f"{name:<42}{r['median_ms']:>12.3f}{r['min_ms']:>10.3f}{r['peak_alloc_kb']:>16.1f}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'corpus': [p.path for p in pages], 'results': results}, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+        regressions = []
+        for name, r in results.items():
+            if name in baseline and r['median_ms'] > baseline[name]['median_ms'] * (1 + args.tolerance):
+                regressions.append(f"{name}: {baseline[name]['median_ms']:.3f} ms -> {r['median_ms']:.3f} ms")
+        if regressions:
+            print('\nRegressions:\n  ' + '\n  '.join(regressions))
+            sys.exit(1)
+        print('\nNo regressions against baseline')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,206 @@
+'''
+Shared URL canonicalization and crawler-trap detection.
+
+Every crawler used to roll its own `_normalize_url` (or none at all), so the same
+page was fetched under several spellings:
+    https://SoftwareFinder.com:443/crm/?utm_source=x  ->  https://softwarefinder.com/crm
+Pages that declare <link rel="canonical"> are mapped onto that URL as well, and
+TrapDetector rejects calendar/pagination style URL spaces that never end.
+'''
+
+import re
+from datetime import datetime
+from typing import Iterable, Optional
+from urllib.parse import urljoin, urlsplit, urlunsplit, parse_qsl, urlencode
+
+from memory_governor import CompactUrlSet
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+# Query parameters that never change page content
+TRACKING_PARAMS = frozenset({
+    'gclid', 'dclid', 'gbraid', 'wbraid', 'fbclid', 'msclkid', 'yclid', 'igshid',
+    'mc_cid', 'mc_eid', '_ga', '_gl', '_hsenc', '_hsmi', 'hsctatracking',
+    'ref', 'ref_src', 'trk', 'spm', 'jsessionid', 'phpsessid'
+})
+TRACKING_PREFIXES = ('utm_', 'pk_', 'mtm_', 'hsa_')
+
+INDEX_FILES = frozenset({'index.html', 'index.htm', 'index.php', 'default.aspx', 'default.asp'})
+
+_MULTI_SLASH = re.compile(r'/{2,}')
+_PERCENT_ESCAPE = re.compile(r'%([0-9a-fA-F]{2})')
+_SESSION_PATH_PARAM = re.compile(r';(jsessionid|phpsessid|sid)=[^/?#]*', re.IGNORECASE)
+_UNRESERVED = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-._~')
+
+
+def _normalize_escape(match: re.Match) -> str:
+    """Decode escaped unreserved characters, uppercase everything else"""
+    char = chr(int(match.group(1), 16))
+    return char if char in _UNRESERVED else f"%{match.group(1).upper()}"
+
+
+def _remove_dot_segments(path: str) -> str:
+    """RFC 3986 dot-segment removal"""
+    if '.' not in path:
+        return path
+    output = []
+    for segment in path.split('/'):
+        if segment == '..':
+            if len(output) > 1:
+                output.pop()
+        elif segment != '.':
+            output.append(segment)
+    if path.endswith(('/.', '/..')):
+        output.append('')
+    return '/'.join(output) or '/'
+
+
+class UrlCanonicalizer:
+    def __init__(self, keep_query: bool = True, strip_trailing_slash: bool = True,
+                 strip_index: bool = True, extra_tracking_params: Iterable[str] = ()):
+        self.keep_query = keep_query
+        self.strip_trailing_slash = strip_trailing_slash
+        self.strip_index = strip_index
+        self.tracking_params = TRACKING_PARAMS | {p.lower() for p in extra_tracking_params}
+
+    def _is_tracking_param(self, name: str) -> bool:
+        name = name.lower()
+        return name in self.tracking_params or name.startswith(TRACKING_PREFIXES)
+
+    def canonicalize(self, url: str, base: Optional[str] = None) -> str:
+        """Return the canonical spelling of url (resolved against base if given)"""
+        if base:
+            url = urljoin(base, url)
+        parts = urlsplit(url.strip())
+        scheme = parts.scheme.lower()
+
+        # Host: lowercase, drop trailing dot and default port
+        host = (parts.hostname or '').rstrip('.')
+        netloc = host
+        try:
+            port = parts.port
+        except ValueError:
+            port = None
+        if port and port != DEFAULT_PORTS.get(scheme):
+            netloc = f"{host}:{port}"
+        if parts.username:
+            auth = parts.username + (f":{parts.password}" if parts.password else '')
+            netloc = f"{auth}@{netloc}"
+
+        # Path: session params, escapes, dot segments, duplicate slashes
+        path = _SESSION_PATH_PARAM.sub('', parts.path)
+        path = _PERCENT_ESCAPE.sub(_normalize_escape, path)
+        path = _remove_dot_segments(_MULTI_SLASH.sub('/', path)) or '/'
+        if self.strip_index:
+            head, _, tail = path.rpartition('/')
+            if tail.lower() in INDEX_FILES:
+                path = head + '/'
+        if self.strip_trailing_slash and len(path) > 1:
+            path = path.rstrip('/') or '/'
+
+        # Query: drop tracking params, sort the rest so ordering never matters
+        query = ''
+        if self.keep_query and parts.query:
+            params = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                      if not self._is_tracking_param(k)]
+            query = urlencode(sorted(params))
+
+        return urlunsplit((scheme, netloc, path, query, ''))
+
+    def canonical_from_soup(self, soup, page_url: str) -> Optional[str]:
+        """Canonical URL declared by <link rel="canonical">, if any"""
+        for link in soup.find_all('link', href=True):
+            rel = link.get('rel') or []
+            if isinstance(rel, str):
+                rel = rel.split()
+            if 'canonical' in (r.lower() for r in rel):
+                href = link['href'].strip()
+                if href:
+                    return self.canonicalize(href, base=page_url)
+        return None
+
+    def same_site(self, url: str, base_url: str) -> bool:
+        """True when url lives on the host of base_url (ignoring a www. prefix)"""
+        host = (urlsplit(url).hostname or '').removeprefix('www.')
+        return host == (urlsplit(base_url).hostname or '').removeprefix('www.')
+
+
+class TrapDetector:
+    '''
+    Flags URLs that come from unbounded URL spaces:
+    - repetitive path segments (/a/b/a/b/a/b, /tag/tag/tag)
+    - calendars paging far into the past or future (/events/2087/01), only
+      with calendar_window_years set: real archives (/blog/2019/...) fall
+      outside any fixed window too
+    - deep pagination (/page/500, ?page=500)
+    - absurdly deep or long URLs
+    '''
+    _YEAR = re.compile(r'^(19|20|21)\d{2}$')
+    _DATE = re.compile(r'^(19|20|21)\d{2}-\d{1,2}(-\d{1,2})?$')
+    _PAGE_SEGMENT = re.compile(r'^(page|p|pg)$', re.IGNORECASE)
+    _PAGE_PARAM = re.compile(r'(?:^|&)(?:page|p|pg)=(\d+)', re.IGNORECASE)
+
+    def __init__(self, max_segment_repeats: int = 2, max_cycle_repeats: int = 2,
+                 max_path_depth: int = 12, max_url_length: int = 2048,
+                 max_page_number: int = 50, calendar_window_years: Optional[int] = None):
+        self.max_segment_repeats = max_segment_repeats
+        self.max_cycle_repeats = max_cycle_repeats
+        self.max_path_depth = max_path_depth
+        self.max_url_length = max_url_length
+        self.max_page_number = max_page_number
+        self.calendar_window_years = calendar_window_years
+        self.current_year = datetime.now().year
+        self._trapped_urls = CompactUrlSet()  # 8-byte hashes: trap URL spaces are unbounded
+
+    @property
+    def trapped(self) -> int:
+        """Distinct URLs flagged as traps"""
+        return len(self._trapped_urls)
+
+    def trap_reason(self, url: str) -> Optional[str]:
+        """Why url looks like a crawler trap, or None if it looks fine"""
+        if len(url) > self.max_url_length:
+            return 'url too long'
+        parts = urlsplit(url)
+        segments = [s.lower() for s in parts.path.split('/') if s]
+        if len(segments) > self.max_path_depth:
+            return 'path too deep'
+
+        counts = {}
+        for segment in segments:
+            counts[segment] = counts.get(segment, 0) + 1
+            if counts[segment] > self.max_segment_repeats:
+                return f"repeated segment '{segment}'"
+
+        # Repeating cycles such as /a/b/a/b/a/b
+        for size in range(2, len(segments) // (self.max_cycle_repeats + 1) + 1):
+            tail = segments[-size:]
+            repeats = 1
+            end = len(segments) - size
+            while end >= size and segments[end - size:end] == tail:
+                repeats += 1
+                end -= size
+            if repeats > self.max_cycle_repeats:
+                return f"repeating path cycle '/{'/'.join(tail)}'"
+
+        for index, segment in enumerate(segments):
+            if self.calendar_window_years is not None and (self._YEAR.match(segment) or self._DATE.match(segment)):
+                year = int(segment[:4])
+                if abs(year - self.current_year) > self.calendar_window_years:
+                    return f"calendar year {year} outside window"
+            elif self._PAGE_SEGMENT.match(segment) and index + 1 < len(segments):
+                following = segments[index + 1]
+                if following.isdigit() and int(following) > self.max_page_number:
+                    return f"pagination depth {following}"
+
+        for match in self._PAGE_PARAM.finditer(parts.query):
+            if int(match.group(1)) > self.max_page_number:
+                return f"pagination depth {match.group(1)}"
+        return None
+
+    def is_trap(self, url: str) -> bool:
+        """True (and counted) when url looks like a crawler trap"""
+        if self.trap_reason(url) is None:
+            return False
+        self._trapped_urls.add(url)
+        return True
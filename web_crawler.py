@@ -1,13 +1,20 @@
 import csv
 import requests
 from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urlparse
 from datetime import datetime
 import os
+import argparse
+from url_canonicalizer import UrlCanonicalizer, TrapDetector
+from robots import RobotsCache
+from crawl_profiler import profiling, profile_path_for
 
 class WebsiteCrawler:
     def __init__(self, base_url):
-        self.base_url = base_url
+        self.canonicalizer = UrlCanonicalizer()
+        self.trap_detector = TrapDetector()
+        self.robots = RobotsCache()
+        self.base_url = self.canonicalizer.canonicalize(base_url)
         self.visited_urls = set()
         self.queue = []
         self.results = []
@@ -62,15 +69,19 @@ class WebsiteCrawler:
             href = link['href'].split('#')[0].strip()
             if not href or href.startswith('javascript:'):
                 continue
-            full_url = urljoin(base_url, href)
+            full_url = self.canonicalizer.canonicalize(href, base=base_url)
             parsed = urlparse(full_url)
-            if parsed.netloc == urlparse(self.base_url).netloc:
+            if (parsed.netloc == urlparse(self.base_url).netloc
+                    and not self.trap_detector.is_trap(full_url)
+                    and self.robots.allowed(full_url)):
                 links.append(full_url)
         return list(set(links))
 
     def process_url(self, url):
         try:
             current_time = datetime.now().strftime('%m/%d/%Y %H:%M')
+            self.robots.fetch_sync(self.session, url)  # Refetched once the rules expire
+            self.robots.wait_sync(url)
             response = self.session.get(url, timeout=10)
             self.crawl_count += 1
             print(f"Crawled: {self.crawl_count} | Current: {url[:60]}...")
@@ -155,6 +166,7 @@ class WebsiteCrawler:
             print(f"CSV Save Error: {str(e)}")
 
     def start_crawl(self, max_urls=5000):
+        self.robots.fetch_sync(self.session, self.base_url)
         self.queue.append(self.base_url)
         self.visited_urls.add(self.base_url)
         
@@ -164,8 +176,17 @@ class WebsiteCrawler:
         
         if self.results:
             self.save_results()
-        print(f"Crawling complete! Total: {self.crawl_count} pages")
+        print(f"Crawling complete! Total: {self.crawl_count} pages "
+              f"({self.robots.blocked} links blocked by robots.txt)")
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--profile', action='store_true',
+                        help='Sample the crawl and write a collapsed-stack flamegraph file next to the CSV')
+    args = parser.parse_args()
+
     crawler = WebsiteCrawler('https://softwarefinder.com')
-    crawler.start_crawl(max_urls=5000)
\ No newline at end of file
+    with profiling(profile_path_for(crawler.csv_file), enabled=args.profile):
+        crawler.start_crawl(max_urls=5000)
+    if args.profile:
+        print(f"Profile written to {profile_path_for(crawler.csv_file)}")
\ No newline at end of file
@@ -0,0 +1,301 @@
+'''
+Nightly Core Web Vitals lab run.
+
+Loads a sample of URLs once per device profile (the Mobile / Tablet / Desktop
+viewports the rendered crawlers use), under CPU and network throttling applied
+through CDP, and records LCP, CLS, TBT and TTFB with the PerformanceObservers
+from crawler_engine.perf_capture. Every load gets a fresh browser context, so
+each measurement is a cold load.
+
+Samples are grouped into page templates (/products/*, /categories/*, ...)
+and summarized as p50/p75/p90 per template and device. Each run is appended to
+the JSON history; --fail-on-regression compares p75 against the previous run.
+
+    python web_vitals_lab.py --from-csv crawl_report2.csv --sample 60 --concurrency 6
+    python web_vitals_lab.py --urls urls.txt --devices Mobile --throttling slow-4g --runs 3
+'''
+
+import argparse
+import asyncio
+import csv
+import json
+import math
+import os
+import random
+import re
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+from crawler_engine import perf_capture
+from crawler_engine.render_profile import LoadWatcher
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+METRICS = ['LCP (ms)', 'CLS', 'TBT (ms)', 'TTFB (ms)']
+PERCENTILES = [50, 75, 90]
+
+# Lighthouse-style presets; throughput in kbit/s, latency is added RTT in ms
+THROTTLING = {
+    'none': {'cpu': 1, 'latency': 0, 'down_kbps': 0, 'up_kbps': 0},
+    'desktop': {'cpu': 1, 'latency': 40, 'down_kbps': 10240, 'up_kbps': 10240},
+    'fast-4g': {'cpu': 2, 'latency': 85, 'down_kbps': 9000, 'up_kbps': 9000},
+    'slow-4g': {'cpu': 4, 'latency': 150, 'down_kbps': 1638, 'up_kbps': 675},
+}
+
+DEVICES = {
+    'Mobile': {'viewport': {'width': 375, 'height': 667}, 'is_mobile': True, 'has_touch': True,
+               'device_scale_factor': 2, 'throttling': 'slow-4g'},
+    'Tablet': {'viewport': {'width': 768, 'height': 1024}, 'is_mobile': True, 'has_touch': True,
+               'device_scale_factor': 2, 'throttling': 'fast-4g'},
+    'Desktop': {'viewport': {'width': 1366, 'height': 768}, 'is_mobile': False, 'has_touch': False,
+                'device_scale_factor': 1, 'throttling': 'desktop'},
+}
+
+
+def template_for(url: str, depth: int = 1) -> str:
+    """Group URLs by their first path segments: /products/acme-crm -> /products/*"""
+    segments = [s for s in urlsplit(url).path.split('/') if s]
+    if not segments:
+        return '/'
+    kept = [re.sub(r'\d+', '{n}', s) for s in segments[:depth]]
+    return '/' + '/'.join(kept) + ('/*' if len(segments) > depth else '')
+
+
+def load_urls(urls_file: Optional[str], from_csv: Optional[str]) -> List[str]:
+    urls = []
+    if urls_file:
+        with open(urls_file, encoding='utf-8') as f:
+            urls.extend(line.strip() for line in f if line.strip() and not line.startswith('#'))
+    if from_csv:
+        with open(from_csv, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                url = row.get('Url') or row.get('URL')
+                status = str(row.get('status code') or row.get('Status Code') or '200')
+                if url and status.startswith(('2', '3')):
+                    urls.append(url)
+    return list(dict.fromkeys(urls))
+
+
+def sample_urls(urls: List[str], size: int, depth: int, seed: int) -> List[str]:
+    """Stratified sample: templates take turns so small templates are still measured"""
+    if not size or size >= len(urls):
+        return urls
+    rng = random.Random(seed)
+    by_template = defaultdict(list)
+    for url in urls:
+        by_template[template_for(url, depth)].append(url)
+    for group in by_template.values():
+        rng.shuffle(group)
+    sample = []
+    while len(sample) < size:
+        for group in by_template.values():
+            if group and len(sample) < size:
+                sample.append(group.pop())
+    return sample
+
+
+async def _throttle(context, page, preset: Dict):
+    cdp = await context.new_cdp_session(page)
+    if preset['cpu'] > 1:
+        await cdp.send('Emulation.setCPUThrottlingRate', {'rate': preset['cpu']})
+    if preset['latency'] or preset['down_kbps']:
+        await cdp.send('Network.enable')
+        await cdp.send('Network.emulateNetworkConditions', {
+            'offline': False,
+            'latency': preset['latency'],
+            'downloadThroughput': preset['down_kbps'] * 1024 / 8 if preset['down_kbps'] else -1,
+            'uploadThroughput': preset['up_kbps'] * 1024 / 8 if preset['up_kbps'] else -1,
+        })
+
+
+async def measure(browser, url: str, device: str, throttling: Optional[str], timeout: float) -> Dict:
+    profile = DEVICES[device]
+    preset_name = throttling or profile['throttling']
+    context = await browser.new_context(
+        viewport=profile['viewport'], is_mobile=profile['is_mobile'], has_touch=profile['has_touch'],
+        device_scale_factor=profile['device_scale_factor'], ignore_https_errors=True
+    )
+    sample = {'url': url, 'device': device, 'throttling': preset_name, 'error': None}
+    try:
+        await perf_capture.install(context)
+        page = await context.new_page()
+        await _throttle(context, page, THROTTLING[preset_name])
+        watcher = LoadWatcher(page)
+        response = await page.goto(url, wait_until='load', timeout=timeout * 1000)
+        sample['status'] = response.status if response else 0
+        await watcher.settled(timeout=timeout / 2)
+        values = await perf_capture.collect(page)
+        sample.update({metric: values[metric] for metric in METRICS})
+    except Exception as e:
+        sample['error'] = f"{type(e).__name__}: {str(e)}"[:200]
+    finally:
+        await context.close()
+    return sample
+
+
+async def run_lab(urls: List[str], devices: List[str], throttling: Optional[str], runs: int,
+                  concurrency: int, timeout: float) -> List[Dict]:
+    from playwright.async_api import async_playwright
+
+    semaphore = asyncio.Semaphore(concurrency)
+    samples = []
+
+    async def one(browser, url, device, run):
+        async with semaphore:
+            sample = await measure(browser, url, device, throttling, timeout)
+            sample['run'] = run
+            samples.append(sample)
+            print(f"  [{len(samples)}/{total}] {device:<8} {url} "
+                  + (f"error: {sample['error']}" if sample['error'] else
+                     f"LCP {sample['LCP (ms)']}ms CLS {sample['CLS']} TBT {sample['TBT (ms)']}ms TTFB {sample['TTFB (ms)']}ms"))
+
+    total = len(urls) * len(devices) * runs
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        try:
+            await asyncio.gather(*(one(browser, url, device, run)
+                                   for run in range(runs) for device in devices for url in urls))
+        finally:
+            await browser.close()
+    return samples
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def aggregate(samples: List[Dict], depth: int) -> Dict:
+    """{template: {device: {metric: {p50, p75, p90}, 'samples': n}}}; repeated runs use the median per URL"""
+    per_url = defaultdict(lambda: defaultdict(list))
+    for sample in samples:
+        if sample['error']:
+            continue
+        for metric in METRICS:
+            per_url[(sample['url'], sample['device'])][metric].append(sample[metric])
+
+    grouped = defaultdict(lambda: defaultdict(lambda: defaultdict(list)))
+    for (url, device), metrics in per_url.items():
+        for metric, values in metrics.items():
+            grouped[template_for(url, depth)][device][metric].append(statistics.median(values))
+
+    summary = {}
+    for template, devices in sorted(grouped.items()):
+        summary[template] = {}
+        for device, metrics in devices.items():
+            summary[template][device] = {
+                'samples': len(next(iter(metrics.values()))),
+                **{metric: {f'p{p}': round(_percentile(values, p), 4) for p in PERCENTILES}
+                   for metric, values in metrics.items()}
+            }
+    return summary
+
+
+def regressions(current: Dict, previous: Dict, tolerance: float) -> List[str]:
+    """p75 values that got worse than previous * (1 + tolerance)"""
+    found = []
+    for template, devices in current.items():
+        for device, metrics in devices.items():
+            before = previous.get(template, {}).get(device)
+            if not before:
+                continue
+            for metric in METRICS:
+                if metric not in metrics or metric not in before:
+                    continue
+                old, new = before[metric]['p75'], metrics[metric]['p75']
+                # Small absolute floors keep near-zero CLS/TBT noise from flagging
+                floor = 0.01 if metric == 'CLS' else 50
+                if new > old * (1 + tolerance) and new - old > floor:
+                    found.append(f"{template} {device} {metric} p75: {old} -> {new}")
+    return found
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR,
+                              capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ''
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Core Web Vitals lab measurements per device and page template')
+    parser.add_argument('--urls', help='File with one URL per line')
+    parser.add_argument('--from-csv', help='Crawl report CSV to take URLs from (Url/URL column)')
+    parser.add_argument('--sample', type=int, default=50, help='URLs to measure, stratified by template (0 = all)')
+    parser.add_argument('--devices', default=','.join(DEVICES), help=f"Comma separated subset of: {', '.join(DEVICES)}")
+    parser.add_argument('--throttling', choices=list(THROTTLING),
+                        help='Override the per-device preset (Mobile slow-4g, Tablet fast-4g, Desktop desktop)')
+    parser.add_argument('--runs', type=int, default=1, help='Loads per URL and device; the median is kept')
+    parser.add_argument('--concurrency', type=int, default=4,
+                        help='Pages measured at once; keep low under CPU throttling to limit interference')
+    parser.add_argument('--timeout', type=float, default=60)
+    parser.add_argument('--template-depth', type=int, default=1, help='Path segments that identify a template')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', default='web_vitals_history.json')
+    parser.add_argument('--samples-csv', help='Also write every individual measurement here')
+    parser.add_argument('--tolerance', type=float, default=0.15, help='Allowed p75 increase vs the previous run')
+    parser.add_argument('--fail-on-regression', action='store_true')
+    args = parser.parse_args()
+
+    devices = [d.strip() for d in args.devices.split(',') if d.strip()]
+    unknown = [d for d in devices if d not in DEVICES]
+    if unknown:
+        parser.error(f"Unknown devices: {', '.join(unknown)}")
+    urls = load_urls(args.urls, args.from_csv)
+    if not urls:
+        parser.error('No URLs: pass --urls and/or --from-csv')
+    urls = sample_urls(urls, args.sample, args.template_depth, args.seed)
+    print(f"Measuring {len(urls)} URLs x {len(devices)} devices x {args.runs} runs")
+
+    started = time.time()
+    samples = asyncio.run(run_lab(urls, devices, args.throttling, args.runs, args.concurrency, args.timeout))
+    summary = aggregate(samples, args.template_depth)
+
+    for template, by_device in summary.items():
+        for device, metrics in by_device.items():
+            cells = ', '.join(f"{m} p75 {metrics[m]['p75']}" for m in METRICS if m in metrics)
+            print(f"{template:<30} {device:<8} n={metrics['samples']:<4} {cells}")
+
+    if args.samples_csv:
+        columns = ['url', 'device', 'throttling', 'run', 'status'] + METRICS + ['error']
+        with open(args.samples_csv, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=columns, extrasaction='ignore')
+            writer.writeheader()
+            writer.writerows(samples)
+
+    history = []
+    if os.path.exists(args.output):
+        with open(args.output, encoding='utf-8') as f:
+            history = json.load(f)
+    run = {
+        'timestamp': datetime.now().isoformat(),
+        'commit': _git_commit(),
+        'duration_s': round(time.time() - started, 1),
+        'urls': len(urls),
+        'devices': devices,
+        'throttling': args.throttling or {d: DEVICES[d]['throttling'] for d in devices},
+        'errors': sum(1 for s in samples if s['error']),
+        'summary': summary,
+    }
+    found = regressions(summary, history[-1]['summary'], args.tolerance) if history else []
+    run['regressions'] = found
+    history.append(run)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(history, f, indent=2)
+    print(f"Run appended to {args.output}")
+
+    if found:
+        print('\nRegressions vs previous run:\n  ' + '\n  '.join(found))
+        if args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()